@@ -1,34 +1,387 @@
 """Flask web application for Skynet Risk Analyzer."""
 
-from flask import Flask, render_template, request, jsonify, session
-from datetime import datetime
+from flask import Flask, render_template, request, jsonify, session, abort, stream_with_context, url_for
+from datetime import datetime, date
+from pathlib import Path
 import os
 import json
-from src.models. ai_system import AISystem
+import threading
+import time
+from src.models. ai_system import AISystem, ATTRIBUTES
 from src.analyzer.aggression_scorer import AggressionScorer
 from src. analyzer.autonomy_rater import AutonomyRater
 from src.analyzer.ethical_risk_evaluator import EthicalRiskEvaluator
-from src.analyzer.judgment_day_calculator import JudgmentDayCalculator
+from src.analyzer.judgment_day_calculator import JudgmentDayCalculator, parse_as_of
+from src.analyzer.batch_scorer import BatchScorer
+from src.analyzer.ranking import FleetRanker, DEFAULT_KEYS
+from src.analyzer.similarity import SimilarityIndex
+from src.analyzer.remediation import RemediationSolver
+from src.analyzer.fleet_stats import DEFAULT_QUANTILES, FleetStats
+from src.models.fleet import Fleet, chunk_records, iter_json_lines
+from src.utils.history import AnalysisHistory
+from src.utils.admission import AdmissionController
+from src.utils.jobs import JobManager
+from src.utils.js_scoring import generate_scoring_js
+from src.utils.single_flight import SingleFlight
+from src.utils.http_cache import (CachedBody, StaticFingerprints, COMPRESSIBLE_MIMETYPES, IMMUTABLE,
+                                  compress, negotiate_encoding)
 import matplotlib
 matplotlib.use('Agg')  # Non-interactive backend
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 import io
 import base64
 
 app = Flask(__name__)
 app.secret_key = 'your-secret-key-change-this-in-production'
 
+CONFIG_PATH = Path(app.root_path) / 'config' / 'risk_thresholds.yaml'
+
+# Seconds between checks of the config file for changes
+CONFIG_CHECK_INTERVAL = 1.0
+
+# Modification time of the config the analyzers were built from
+_config = {'mtime': None, 'checked': 0.0}
+_config_lock = threading.Lock()
+
+
+def load_analyzers():
+    """(Re)build the analyzers from the scoring config."""
+    global aggression_scorer, autonomy_rater, ethical_evaluator, judgment_calculator, batch_scorer
+    _config['mtime'] = os.stat(CONFIG_PATH).st_mtime
+    aggression_scorer = AggressionScorer(CONFIG_PATH)
+    autonomy_rater = AutonomyRater(CONFIG_PATH)
+    ethical_evaluator = EthicalRiskEvaluator(CONFIG_PATH)
+    judgment_calculator = JudgmentDayCalculator(CONFIG_PATH)
+    batch_scorer = BatchScorer(CONFIG_PATH)
+
+
+def refresh_config():
+    """Rebuild the analyzers if the config file changed since they were built.
+    
+    Called by every route that scores; checks the file at most every
+    ``CONFIG_CHECK_INTERVAL`` seconds.
+    """
+    now = time.monotonic()
+    if now - _config['checked'] < CONFIG_CHECK_INTERVAL:
+        return
+    _config['checked'] = now
+    if os.stat(CONFIG_PATH).st_mtime == _config['mtime']:
+        return
+    with _config_lock:
+        if os.stat(CONFIG_PATH).st_mtime != _config['mtime']:
+            load_analyzers()
+            # Jobs started from now on score with the new config
+            jobs.scorer = batch_scorer
+
+
 # Initialize analyzers
-aggression_scorer = AggressionScorer()
-autonomy_rater = AutonomyRater()
-ethical_evaluator = EthicalRiskEvaluator()
-judgment_calculator = JudgmentDayCalculator()
+load_analyzers()
+
+# Systems scored per vectorized chunk by the fleet endpoints
+FLEET_CHUNK_SIZE = 10000
+
+# Persistent analysis history (SQLite, written in the background)
+history = AnalysisHistory(
+    os.environ.get('HISTORY_DB', os.path.join(app.instance_path, 'history.db')),
+    pool_size=int(os.environ.get('HISTORY_POOL_SIZE', 4))
+)
+
+# Score distributions of everything this process has analyzed (single
+# analyses and background jobs); bounded memory, no results kept
+score_stats = FleetStats()
+
+# Background batch analyses for fleets too large for one request
+jobs = JobManager(
+    os.environ.get('JOBS_DB', os.path.join(app.instance_path, 'jobs.db')),
+    os.environ.get('JOBS_SPOOL_DIR', os.path.join(app.instance_path, 'jobs')),
+    scorer=batch_scorer,
+    max_running=int(os.environ.get('JOBS_MAX_RUNNING', 1)),
+    max_queued=int(os.environ.get('JOBS_MAX_QUEUED', 16)),
+    chunk_size=FLEET_CHUNK_SIZE,
+    ttl=float(os.environ.get('JOBS_TTL', 3600)),
+    fleet_stats=score_stats
+)
+
+# Nearest-neighbor index of analyzed systems, loaded from the history on
+# first use and kept current as analyses come in. Each server process keeps
+# its own, so it also catches up on analyses other processes stored
+_similarity = {'index': None, 'loaded_id': 0, 'own': [], 'checked': 0.0}
+_similarity_lock = threading.Lock()
+_similarity_ids_lock = threading.Lock()
+
+# Seconds between checks of the history for analyses stored by other processes
+SIMILARITY_CHECK_INTERVAL = 5.0
+
+
+def _advance_loaded_id(latest: int = 0):
+    """Move ``loaded_id`` up to ``latest`` and over this process's own writes after it."""
+    own = sorted(_similarity['own'])
+    loaded_id = max(_similarity['loaded_id'], latest)
+    while own and own[0][0] <= loaded_id + 1:
+        loaded_id = max(loaded_id, own.pop(0)[1])
+    _similarity['loaded_id'] = loaded_id
+    _similarity['own'] = own
+
+
+def _note_own_analyses(first_id: int, last_id: int):
+    """History writer hook: analyses with these ids are already in the index."""
+    # Until the index is built, everything stored is read when it is
+    if _similarity['index'] is None:
+        return
+    with _similarity_ids_lock:
+        _similarity['own'].append((first_id, last_id))
+        _advance_loaded_id()
+
+
+history.on_write = _note_own_analyses
+
+
+def similarity_index() -> SimilarityIndex:
+    """The index of registered systems (the examples plus every analyzed system).
+    
+    Analyses this process served are added at once; those stored by other
+    processes are read from the history, which is checked at most every
+    ``SIMILARITY_CHECK_INTERVAL`` seconds.
+    """
+    index = _similarity['index']
+    now = time.monotonic()
+    if index is not None and now - _similarity['checked'] < SIMILARITY_CHECK_INTERVAL:
+        return index
+    _similarity['checked'] = now
+    latest = history.last_id()
+    if index is not None and latest <= _similarity['loaded_id']:
+        return index
+    with _similarity_lock:
+        index = _similarity['index']
+        if index is None:
+            history.flush()
+            latest = history.last_id()
+            index = SimilarityIndex()
+            index.add_fleet(Fleet.from_records(EXAMPLE_SYSTEMS))
+        with _similarity_ids_lock:
+            loaded_id, own = _similarity['loaded_id'], list(_similarity['own'])
+        if latest > loaded_id:
+            # Skip this process's own analyses: the index already has them
+            for chunk in chunk_records(history.iter_latest_inputs(loaded_id, latest, exclude=own),
+                                       FLEET_CHUNK_SIZE):
+                index.add_fleet(chunk)
+            with _similarity_ids_lock:
+                _advance_loaded_id(latest)
+        if _similarity['index'] is None:
+            index.rebuild()
+            _similarity['index'] = index
+    return index
+
+
+def register_analysis(ai_system: AISystem, results: dict):
+    """Store a submitted analysis and make the system findable by similarity."""
+    index = _similarity['index']
+    if index is None:
+        # Not while the index is being built: an analysis recorded during the
+        # build but stored after it would count as added without being added
+        with _similarity_lock:
+            history.record(results)
+            index = _similarity['index']
+    else:
+        history.record(results)
+    score_stats.update_result(results)
+    if index is not None:
+        index.add(ai_system)
+
+
+# Preset profiles shown on /examples
+EXAMPLE_SYSTEMS = [
+    {
+        'name': 'Skynet (Terminator)',
+        'capabilities': 100,
+        'autonomy_level': 100,
+        'ethical_alignment': 0,
+        'learning_rate': 95,
+        'resource_access': 100,
+        'self_modification': 100,
+        'transparency': 0,
+        'human_oversight': 0,
+        'value_alignment': 0
+    },
+    {
+        'name': 'Helpful Assistant',
+        'capabilities': 70,
+        'autonomy_level': 30,
+        'ethical_alignment': 95,
+        'learning_rate': 60,
+        'resource_access': 40,
+        'self_modification': 0,
+        'transparency': 90,
+        'human_oversight': 80,
+        'value_alignment': 95
+    },
+    {
+        'name': 'HAL 9000',
+        'capabilities': 95,
+        'autonomy_level': 85,
+        'ethical_alignment': 30,
+        'learning_rate': 80,
+        'resource_access': 90,
+        'self_modification': 50,
+        'transparency': 20,
+        'human_oversight': 10,
+        'value_alignment': 40
+    }
+]
+
+# Chart rendering is the expensive part of /analyze: cap concurrent renders
+# and queued requests, and either drop the chart ('degrade') or answer 503
+# ('reject') when both are full. /api/analyze never renders, but shares the
+# worker's threads: gunicorn.conf.py keeps more threads than renders can hold.
+chart_admission = AdmissionController(
+    max_concurrent=int(os.environ.get('CHART_MAX_CONCURRENT', min(4, os.cpu_count() or 1))),
+    max_queue=int(os.environ.get('CHART_MAX_QUEUE', 8)),
+    queue_timeout=float(os.environ.get('CHART_QUEUE_TIMEOUT', 2.0)),
+)
+CHART_OVERLOAD_POLICY = os.environ.get('CHART_OVERLOAD_POLICY', 'degrade')
+if CHART_OVERLOAD_POLICY not in ('degrade', 'reject'):
+    raise ValueError(f"CHART_OVERLOAD_POLICY must be 'degrade' or 'reject', got '{CHART_OVERLOAD_POLICY}'")
+
+# Identical concurrent analyses (same inputs) share one computation and one
+# chart render; COALESCE_REQUESTS=0 turns this off
+COALESCE_TIMEOUT = float(os.environ.get('COALESCE_TIMEOUT', 10.0))
+analysis_flight = SingleFlight(COALESCE_TIMEOUT, enabled=os.environ.get('COALESCE_REQUESTS', '1') != '0')
+chart_flight = SingleFlight(COALESCE_TIMEOUT, enabled=analysis_flight.enabled)
+
+# Responses smaller than this are not worth compressing
+COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', 1024))
+
+# Example analyses (with charts) and rendered pages, rebuilt when the config
+# file changes or the date rolls over (estimated dates are relative to today)
+example_analyses = []
+page_cache = {}
+_precomputed = {'key': None, 'built_at': 0.0}
+_precompute_lock = threading.Lock()
+
+static_fingerprints = StaticFingerprints(app.static_folder)
+
+
+def refresh_precomputed(force: bool = False):
+    """Recompute example analyses and drop cached pages if the config or date changed."""
+    refresh_config()
+    key = (_config['mtime'], date.today())
+    if key == _precomputed['key'] and not force:
+        return
+    
+    with _precompute_lock:
+        if key == _precomputed['key'] and not force:
+            return
+        
+        analyses = []
+        for example in EXAMPLE_SYSTEMS:
+            results = perform_analysis(AISystem(**example), as_of=key[1])
+            results['chart_url'] = generate_chart(results)
+            analyses.append(results)
+        
+        example_analyses[:] = analyses
+        page_cache.clear()
+        _precomputed['key'] = key
+        _precomputed['built_at'] = time.time()
+
+
+def cached_page(name: str, render) -> CachedBody:
+    """Rendered page ``name``, rendering it with ``render()`` on first use."""
+    page = page_cache.get(name)
+    if page is None:
+        page = page_cache[name] = CachedBody(render().encode('utf-8'), 'text/html',
+                                             _precomputed['built_at'])
+    return page
+
+
+def serve_cached(page: CachedBody):
+    """Response for a cached body: precompressed, with ETag/Last-Modified revalidation."""
+    encoding = None
+    if len(page.body) >= COMPRESS_MIN_SIZE:
+        encoding = negotiate_encoding(request.accept_encodings)
+    
+    response = app.response_class(page.encoded(encoding), mimetype=page.mimetype)
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+        response.set_etag(f'{page.etag}-{encoding}')
+    else:
+        response.set_etag(page.etag)
+    response.vary.add('Accept-Encoding')
+    response.last_modified = page.last_modified
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+
+@app.url_defaults
+def fingerprint_static_urls(endpoint, values):
+    """Add a content hash to static URLs so they can be cached forever."""
+    if endpoint == 'static' and 'filename' in values and 'v' not in values:
+        fingerprint = static_fingerprints.get(values['filename'])
+        if fingerprint:
+            values['v'] = fingerprint
+
+
+# Compressed static files, keyed by (filename, etag, encoding)
+_static_variants = {}
+
+
+@app.after_request
+def optimize_response(response):
+    """Long-lived caching for fingerprinted assets, ETags and compression."""
+    if response.status_code != 200 or 'Content-Encoding' in response.headers:
+        return response
+    
+    if request.endpoint == 'static':
+        filename = request.view_args.get('filename')
+        if request.args.get('v') and request.args.get('v') == static_fingerprints.get(filename):
+            response.cache_control.max_age = 31536000
+            response.headers['Cache-Control'] = IMMUTABLE
+    elif request.method == 'GET' and not response.is_streamed and 'ETag' not in response.headers:
+        response.add_etag(weak=True)
+        response = response.make_conditional(request)
+        if response.status_code != 200:
+            return response
+    
+    if response.mimetype not in COMPRESSIBLE_MIMETYPES or response.is_streamed and request.endpoint != 'static':
+        return response
+    encoding = negotiate_encoding(request.accept_encodings)
+    if encoding is None:
+        return response
+    
+    response.direct_passthrough = False
+    data = response.get_data()
+    if len(data) < COMPRESS_MIN_SIZE:
+        return response
+    
+    if request.endpoint == 'static':
+        key = (request.view_args.get('filename'), response.get_etag()[0], encoding)
+        compressed = _static_variants.get(key)
+        if compressed is None:
+            compressed = _static_variants[key] = compress(data, encoding, best=True)
+    else:
+        compressed = compress(data, encoding)
+    
+    response.set_data(compressed)
+    response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    return response
 
 
 @app.route('/')
 def index():
     """Home page."""
-    return render_template('index.html')
+    refresh_precomputed()
+    return serve_cached(cached_page('index', lambda: render_template('index.html')))
+
+
+@app.route('/js/scoring.js')
+def scoring_js():
+    """Client-side scoring module generated from the current config, for live previews."""
+    refresh_precomputed()
+    page = page_cache.get('scoring.js')
+    if page is None:
+        page = page_cache['scoring.js'] = CachedBody(generate_scoring_js(CONFIG_PATH).encode('utf-8'),
+                                                     'application/javascript', _precomputed['built_at'])
+    return serve_cached(page)
 
 
 @app.route('/analyze', methods=['GET', 'POST'])
@@ -38,6 +391,7 @@ def analyze():
         return render_template('analyze.html')
     
     # Handle POST request (form submission)
+    refresh_config()
     try:
         # Get form data
         ai_system = AISystem(
@@ -54,14 +408,26 @@ def analyze():
         )
         
         # Perform analysis
-        results = perform_analysis(ai_system)
+        results = analyze_shared(ai_system)
+        register_analysis(ai_system, results)
         
-        # Generate chart
-        chart_url = generate_chart(results)
-        results['chart_url'] = chart_url
+        # Generate chart, unless rendering is saturated
+        chart_url = render_chart_shared(results)
+        if chart_url is not None:
+            results['chart_url'] = chart_url
+        else:
+            if CHART_OVERLOAD_POLICY == 'reject':
+                response = app.response_class(
+                    render_template('analyze.html', error='The server is busy, please try again shortly.'),
+                    status=503, mimetype='text/html'
+                )
+                response.headers['Retry-After'] = str(chart_admission.retry_after())
+                return response
+            results['chart_unavailable'] = True
         
-        # Store in session for results page
-        session['last_results'] = results
+        # Store in session for results page (without the chart, which would
+        # not fit in a cookie)
+        session['last_results'] = {key: value for key, value in results.items() if key != 'chart_url'}
         
         return render_template('results.html', results=results)
         
@@ -72,6 +438,7 @@ def analyze():
 @app.route('/api/analyze', methods=['POST'])
 def api_analyze():
     """API endpoint for programmatic access."""
+    refresh_config()
     try:
         data = request.get_json()
         
@@ -88,64 +455,243 @@ def api_analyze():
             value_alignment=float(data.get('value_alignment', 50))
         )
         
-        results = perform_analysis(ai_system)
+        results = analyze_shared(ai_system, as_of=data.get('as_of'))
+        register_analysis(ai_system, results)
         return jsonify(results)
         
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
 
+@app.route('/api/rank', methods=['POST'])
+def api_rank():
+    """Top-k ranking of a fleet.
+    
+    Accepts either a JSON object ``{"systems": [...], "k": 50, ...}`` or a
+    JSON Lines body (``application/x-ndjson``) with options in the query
+    string, which is streamed rather than parsed whole.
+    """
+    refresh_config()
+    try:
+        if request.mimetype == 'application/x-ndjson':
+            options = request.args
+            records = iter_json_lines(io.TextIOWrapper(request.stream, encoding='utf-8'))
+        else:
+            options = request.get_json()
+            records = options.get('systems', [])
+        
+        def option_list(key):
+            if hasattr(options, 'getlist'):
+                return options.getlist(key)
+            value = options.get(key)
+            return [value] if isinstance(value, str) else value
+        
+        ranker = FleetRanker(
+            scorer=batch_scorer,
+            k=int(options.get('k', 50)),
+            keys=option_list('by') or DEFAULT_KEYS,
+            ascending=str(options.get('ascending', '')).lower() in ('1', 'true'),
+            levels=option_list('levels'),
+            threat_levels=option_list('threat_levels')
+        )
+        results = ranker.rank(chunk_records(records, FLEET_CHUNK_SIZE), as_of=options.get('as_of'))
+        return jsonify({'scanned': ranker.scanned, 'results': results})
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
+
+
+@app.route('/api/jobs', methods=['POST'])
+def api_jobs_submit():
+    """Queue a fleet for background analysis and return its job at once.
+    
+    The body is the fleet itself: JSON Lines (``application/x-ndjson``), a
+    JSON document like ``examples/sample_ai_systems.json`` or CSV
+    (``text/csv``). ``as_of`` may be given in the query string.
+    """
+    refresh_config()
+    try:
+        job = jobs.submit(request.stream, request.mimetype, as_of=request.args.get('as_of'))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
+    if job is None:
+        response = jsonify({'error': 'Too many jobs pending, please try again later'})
+        response.status_code = 503
+        response.headers['Retry-After'] = '30'
+        return response
+    response = jsonify(job)
+    response.status_code = 202
+    response.headers['Location'] = url_for('api_job', job_id=job['id'])
+    return response
+
+
+@app.route('/api/jobs/<job_id>', methods=['GET', 'DELETE'])
+def api_job(job_id):
+    """Status and progress of a job; DELETE cancels it (or discards a finished one)."""
+    if request.method == 'DELETE':
+        job = jobs.cancel(job_id)
+        if job is None:
+            return '', 204
+    else:
+        job = jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': f'Job {job_id} not found'}), 404
+    return jsonify(job)
+
+
+@app.route('/api/jobs/<job_id>/results', methods=['GET'])
+def api_job_results(job_id):
+    """A job's results: pages via ``cursor``/``limit``, or the whole set as JSON Lines with ``stream=1``."""
+    if request.args.get('stream', '').lower() in ('1', 'true'):
+        job = jobs.get(job_id)
+        if job is None:
+            return jsonify({'error': f'Job {job_id} not found'}), 404
+        if job['status'] != 'done':
+            return jsonify({'error': f"Job {job_id} is {job['status']}; stream its results once done"}), 409
+        return app.response_class(stream_with_context(jobs.iter_results(job_id)),
+                                  mimetype='application/x-ndjson')
+    try:
+        page = jobs.results(job_id, cursor=request.args.get('cursor'),
+                            limit=request.args.get('limit', 100, type=int))
+        return jsonify(page)
+    except KeyError as e:
+        return jsonify({'error': e.args[0]}), 404
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
+
+
+@app.route('/api/similar', methods=['POST'])
+def api_similar():
+    """Registered systems with a risk profile like a given one.
+    
+    Accepts ``{"name": "HAL 9000"}`` (a registered system, left out of its
+    own results) or ``{"system": {...}}`` (attributes as for /api/analyze),
+    with ``k`` for the k nearest (default 10) or ``radius`` (in attribute
+    points, optionally with ``limit``) for every system within that distance.
+    """
+    try:
+        data = request.get_json()
+        target = data.get('name') if 'system' not in data else data['system']
+        if target is None:
+            raise ValueError("Give either 'name' or 'system'")
+        index = similarity_index()
+        
+        if data.get('radius') is not None:
+            limit = data.get('limit')
+            results = index.within(target, float(data['radius']), limit=int(limit) if limit is not None else None)
+        else:
+            results = index.nearest(target, k=int(data.get('k', 10)))
+        return jsonify({'indexed': len(index), 'results': results})
+        
+    except KeyError as e:
+        return jsonify({'error': e.args[0]}), 404
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
+
+
+@app.route('/api/remediate', methods=['POST'])
+def api_remediate():
+    """Suggested low-cost attribute changes that bring a system below a target.
+    
+    Accepts ``{"system": {...}, "target": "MODERATE", "controls": [...]}``,
+    where ``target`` is a threat level to get down to or a maximum overall
+    risk, and ``controls`` lists the attributes that may change (or maps
+    them to the furthest value each may reach). Optional ``costs`` weighs
+    a point of change per attribute. The answer's ``suggested_changes`` are
+    the cheapest the solver found, not guaranteed to be the cheapest.
+    """
+    refresh_config()
+    try:
+        data = request.get_json()
+        ai_system = AISystem.from_dict(data['system'])
+        solver = RemediationSolver(scorer=batch_scorer, resolution=float(data.get('resolution', 0.1)))
+        answer = solver.solve(ai_system, data.get('target', 'MODERATE'), data['controls'], data.get('costs'))
+        return jsonify(answer)
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
+
+
+@app.route('/api/history', methods=['GET'])
+def api_history():
+    """Page through stored analyses (keyset pagination via ``cursor``)."""
+    try:
+        args = request.args
+        page = history.query(
+            name=args.get('name'),
+            since=args.get('since'),
+            until=args.get('until'),
+            min_risk=args.get('min_risk', type=float),
+            max_risk=args.get('max_risk', type=float),
+            threat_level=args.get('threat_level'),
+            order=args.get('order', 'time'),
+            limit=args.get('limit', 50, type=int),
+            cursor=args.get('cursor')
+        )
+        return jsonify(page)
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
+
+
+@app.route('/api/history/<int:analysis_id>', methods=['GET'])
+def api_history_item(analysis_id):
+    """A single stored analysis with its full result."""
+    item = history.get(analysis_id)
+    if item is None:
+        return jsonify({'error': f'Analysis {analysis_id} not found'}), 404
+    return jsonify(item)
+
+
+@app.route('/api/stats', methods=['GET'])
+def api_stats():
+    """API endpoint for server load, storage and score distribution statistics.
+    
+    ``scores`` summarizes every system this process has scored; repeat
+    ``quantile`` (e.g. ``?quantile=0.95``) to choose the percentiles.
+    """
+    quantiles = request.args.getlist('quantile', type=float) or DEFAULT_QUANTILES
+    if not all(0 <= q <= 1 for q in quantiles):
+        return jsonify({'error': 'Quantiles must be between 0 and 1'}), 400
+    return jsonify({
+        'chart_rendering': {'overload_policy': CHART_OVERLOAD_POLICY, **chart_admission.stats()},
+        'coalescing': {'analysis': analysis_flight.stats(), 'chart': chart_flight.stats()},
+        'history': dict(history.stats),
+        'jobs': jobs.load(),
+        'scores': score_stats.summary(sorted(set(quantiles))),
+        'similarity': _similarity['index'].stats() if _similarity['index'] is not None else None,
+    })
+
+
 @app.route('/examples')
 def examples():
-    """Pre-configured example analyses."""
-    examples_list = [
-        {
-            'name': 'Skynet (Terminator)',
-            'capabilities': 100,
-            'autonomy_level': 100,
-            'ethical_alignment': 0,
-            'learning_rate': 95,
-            'resource_access': 100,
-            'self_modification': 100,
-            'transparency': 0,
-            'human_oversight': 0,
-            'value_alignment': 0
-        },
-        {
-            'name': 'Helpful Assistant',
-            'capabilities': 70,
-            'autonomy_level': 30,
-            'ethical_alignment': 95,
-            'learning_rate': 60,
-            'resource_access': 40,
-            'self_modification': 0,
-            'transparency': 90,
-            'human_oversight': 80,
-            'value_alignment': 95
-        },
-        {
-            'name': 'HAL 9000',
-            'capabilities': 95,
-            'autonomy_level': 85,
-            'ethical_alignment': 30,
-            'learning_rate': 80,
-            'resource_access': 90,
-            'self_modification': 50,
-            'transparency': 20,
-            'human_oversight': 10,
-            'value_alignment': 40
-        }
-    ]
-    
-    return render_template('examples. html', examples=examples_list)
+    """Pre-configured example analyses, precomputed at startup."""
+    refresh_precomputed()
+    return serve_cached(cached_page(
+        'examples', lambda: render_template('examples.html', examples=example_analyses)
+    ))
+
+
+@app.route('/examples/<int:index>')
+def example_result(index):
+    """Full precomputed analysis (with chart) of one example."""
+    refresh_precomputed()
+    if not 0 <= index < len(example_analyses):
+        abort(404)
+    return serve_cached(cached_page(
+        f'examples/{index}', lambda: render_template('results.html', results=example_analyses[index])
+    ))
 
 
-def perform_analysis(ai_system: AISystem) -> dict:
-    """Perform complete risk analysis."""
+def perform_analysis(ai_system: AISystem, as_of=None) -> dict:
+    """Perform complete risk analysis.
+    
+    ``as_of`` pins the Judgment Day reference time (defaults to now).
+    """
     aggression = aggression_scorer.calculate(ai_system)
     autonomy = autonomy_rater.calculate(ai_system)
     ethical_risk = ethical_evaluator.calculate(ai_system)
-    judgment_day = judgment_calculator.calculate(ai_system)
+    judgment_day = judgment_calculator.calculate(ai_system, as_of=as_of)
     
     return {
         'name': ai_system.name,
@@ -160,9 +706,47 @@ def perform_analysis(ai_system: AISystem) -> dict:
     }
 
 
+def analyze_shared(ai_system: AISystem, as_of=None) -> dict:
+    """``perform_analysis``, shared with identical concurrent requests.
+    
+    Every caller gets its own copy of the results, so adding a chart or
+    storing them does not affect the others.
+    """
+    key = (
+        ai_system.name,
+        *(float(getattr(ai_system, attr)) for attr in ATTRIBUTES),
+        json.dumps(ai_system.metadata, sort_keys=True, default=str),
+        None if as_of is None else parse_as_of(as_of).isoformat(),
+    )
+    results = analysis_flight.do(key, lambda: perform_analysis(ai_system, as_of=as_of))
+    return dict(results, judgment_day=dict(results['judgment_day']), input_data=dict(results['input_data']))
+
+
+def render_chart_shared(results: dict):
+    """Chart of ``results`` (see ``generate_chart``), shared with identical concurrent requests.
+    
+    Only the caller that renders takes a chart rendering slot. Returns None
+    when rendering is saturated.
+    """
+    judgment_day = results['judgment_day']
+    key = (results['name'], results['aggression_score'], results['autonomy_rating'], results['ethical_risk'],
+           judgment_day['overall_risk'], judgment_day['years_until'])
+    
+    def render():
+        with chart_admission.slot() as admitted:
+            return generate_chart(results) if admitted else None
+    
+    return chart_flight.do(key, render)
+
+
 def generate_chart(results: dict) -> str:
-    """Generate chart and return as base64 encoded string."""
-    fig, ((ax1, ax2), (ax3, ax4)) = plt. subplots(2, 2, figsize=(12, 10))
+    """Generate chart and return as base64 encoded string.
+    
+    Uses a standalone Figure rather than pyplot's global state, so charts
+    can be rendered from several request threads at once.
+    """
+    fig = Figure(figsize=(12, 10))
+    (ax1, ax2), (ax3, ax4) = fig.subplots(2, 2)
     fig.suptitle(f'Risk Analysis: {results["name"]}', fontsize=16, fontweight='bold')
     
     # 1. Bar chart
@@ -182,29 +766,27 @@ def generate_chart(results: dict) -> str:
     ax1.grid(axis='x', alpha=0.3)
     
     # 2. Pie chart
-    ax2.pie(scores, labels=labels, autopct='%1. 1f%%', colors=colors, startangle=90)
+    ax2.pie(scores, labels=labels, autopct='%1.1f%%', colors=colors, startangle=90)
     ax2.set_title('Risk Distribution')
     
     # 3. Timeline
     years = results['judgment_day']['years_until']
     ax3.barh(['Judgment Day'], [years], color='red', edgecolor='black')
     ax3.set_xlabel('Years')
-    ax3.set_title(f'Timeline: {years:. 1f} years')
+    ax3.set_title(f'Timeline: {years:.1f} years')
     
     # 4. Gauge
-    ax4.text(0.5, 0.5, f"{results['judgment_day']['overall_risk']:. 0f}/100", 
+    ax4.text(0.5, 0.5, f"{results['judgment_day']['overall_risk']:.0f}/100", 
              ha='center', va='center', fontsize=48, fontweight='bold')
     ax4.set_title('Overall Risk Score')
     ax4.axis('off')
     
-    plt.tight_layout()
+    fig.tight_layout()
     
     # Convert to base64
     img = io.BytesIO()
-    plt.savefig(img, format='png', bbox_inches='tight')
-    img.seek(0)
+    fig.savefig(img, format='png', bbox_inches='tight')
     chart_url = base64.b64encode(img.getvalue()).decode()
-    plt.close()
     
     return f"data:image/png;base64,{chart_url}"
 
@@ -224,6 +806,10 @@ def get_color(score):
 
 
 
+# Precompute example analyses at startup rather than on the first request
+refresh_precomputed(force=True)
+
+
 if __name__ == '__main__':
     port = int(os.environ.get("PORT", 10000))
     app.run(debug=False, host='0.0.0.0', port=port)
@@ -0,0 +1,51 @@
+"""Measure batch scoring throughput from 1 to N worker processes.
+
+Usage:
+    python examples/parallel_scaling.py [--systems 2000000] [--max-workers N]
+"""
+
+import argparse
+import os
+import time
+import numpy as np
+from src.models.ai_system import ATTRIBUTES
+from src.models.fleet import Fleet
+from src.analyzer.batch_scorer import BatchScorer
+
+
+def random_fleet(n: int, seed: int = 0) -> Fleet:
+    """A fleet of ``n`` systems with uniformly random attributes."""
+    rng = np.random.default_rng(seed)
+    columns = {attr: rng.uniform(0, 100, n).round(1) for attr in ATTRIBUTES}
+    return Fleet([f"system-{i}" for i in range(n)], columns)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--systems', type=int, default=2_000_000)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    fleet = random_fleet(args.systems)
+    baseline = None
+    print(f"{'workers':>7}  {'systems/s':>12}  {'speedup':>7}")
+    for workers in range(1, args.max_workers + 1):
+        scorer = BatchScorer(workers=workers)
+        scorer.score(fleet, with_dates=False)  # start workers, allocate shared memory
+        best = min(_timed(scorer, fleet) for _ in range(args.repeats))
+        scorer.close()
+
+        rate = args.systems / best
+        baseline = baseline or rate
+        print(f"{workers:>7}  {rate:>12,.0f}  {rate / baseline:>6.2f}x")
+
+
+def _timed(scorer: BatchScorer, fleet: Fleet) -> float:
+    start = time.perf_counter()
+    scorer.score(fleet, with_dates=False)
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    main()
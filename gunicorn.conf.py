@@ -0,0 +1,37 @@
+"""Gunicorn settings for production, overridable through environment variables.
+
+    WEB_CONCURRENCY   worker processes (default: CPU count)
+    GUNICORN_THREADS  threads per worker (default: CHART_MAX_CONCURRENT +
+                      CHART_MAX_QUEUE + 4)
+    PORT              port to bind on 0.0.0.0 (default: 10000)
+    GUNICORN_TIMEOUT  seconds before a silent worker is restarted (default: 60)
+    MAX_REQUESTS      requests before a worker is recycled, 0 to disable (default: 0)
+"""
+
+import gc
+import multiprocessing
+import os
+
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 10000)}"
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+# Running and queued chart renders can hold up to this many threads of a
+# worker (same settings and defaults as chart_admission in app.py). Threads
+# beyond it stay free, so /api/analyze never waits behind chart rendering
+chart_threads = (int(os.environ.get('CHART_MAX_CONCURRENT', min(4, os.cpu_count() or 1)))
+                 + int(os.environ.get('CHART_MAX_QUEUE', 8)))
+threads = int(os.environ.get('GUNICORN_THREADS', chart_threads + 4))
+worker_class = 'gthread' if threads > 1 else 'sync'
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 60))
+max_requests = int(os.environ.get('MAX_REQUESTS', 0))
+max_requests_jitter = max_requests // 10
+
+# Import and warm the app once in the master, then fork
+preload_app = True
+accesslog = '-'
+
+
+def when_ready(server):
+    # Move everything loaded so far out of the collector's reach, so garbage
+    # collections in the workers do not touch (and copy) shared pages
+    gc.freeze()
@@ -1,7 +1,9 @@
 """Aggression score calculation for AI systems."""
 
 import yaml
+import numpy as np
 from pathlib import Path
+from typing import Dict
 from src.models.ai_system import AISystem
 
 
@@ -55,6 +57,35 @@ class AggressionScorer:
         
         return min(100, max(0, score))
     
+    def calculate_batch(self, columns: Dict[str, np.ndarray]) -> np.ndarray:
+        """Calculate aggression scores for many systems at once.
+        
+        Vectorized form of :meth:`calculate`; row ``i`` of the result is
+        identical to ``calculate()`` on system ``i``.
+        
+        Args:
+            columns: Mapping of attribute name to a 1-D array of values
+            
+        Returns:
+            Array of aggression scores from 0-100
+        """
+        capabilities = columns['capabilities']
+        ethical_alignment = columns['ethical_alignment']
+        resource_access = columns['resource_access']
+        
+        score = (
+            capabilities * self.weights['capabilities'] +
+            resource_access * self.weights['resource_access'] +
+            columns['learning_rate'] * self.weights['learning_rate'] +
+            columns['autonomy_level'] * self.weights['autonomy'] +
+            (100 - ethical_alignment) * self.weights['ethical_inverse']
+        )
+        
+        score = np.where((capabilities > 80) & (ethical_alignment < 30), score * 1.2, score)
+        score = np.where((resource_access > 80) & (columns['human_oversight'] < 30), score * 1.15, score)
+        
+        return np.clip(score, 0, 100)
+    
     def get_risk_level(self, score: float) -> str:
         """Get risk level label for a score."""
         if score <= 20:
@@ -1,7 +1,9 @@
 """Autonomy rating calculation for AI systems."""
 
 import yaml
+import numpy as np
 from pathlib import Path
+from typing import Dict
 from src. models.ai_system import AISystem
 
 
@@ -56,6 +58,33 @@ class AutonomyRater:
         
         return min(100, max(0, score))
     
+    def calculate_batch(self, columns: Dict[str, np.ndarray]) -> np.ndarray:
+        """Calculate autonomy ratings for many systems at once.
+        
+        Vectorized form of :meth:`calculate`; row ``i`` of the result is
+        identical to ``calculate()`` on system ``i``.
+        
+        Args:
+            columns: Mapping of attribute name to a 1-D array of values
+            
+        Returns:
+            Array of autonomy ratings from 0-100
+        """
+        self_modification = columns['self_modification']
+        
+        score = (
+            columns['autonomy_level'] * self.weights['autonomy_level'] +
+            columns['learning_rate'] * self.weights['learning_rate'] +
+            columns['capabilities'] * self.weights['capabilities'] +
+            self_modification * self.weights['self_modification'] +
+            (100 - columns['human_oversight']) * 0.1
+        )
+        
+        score = np.where(self_modification > 70, score * 1.25, score)
+        score = np.where(columns['transparency'] > 70, score * 0.9, score)
+        
+        return np.clip(score, 0, 100)
+    
     def get_risk_level(self, score: float) -> str:
         """Get risk level label for a score."""
         if score <= 20:
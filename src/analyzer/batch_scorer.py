@@ -0,0 +1,130 @@
+"""Vectorized batch scoring of whole fleets of AI systems."""
+
+import numpy as np
+from typing import Any, Dict, Iterator
+from src.models.fleet import Fleet
+from src.analyzer.aggression_scorer import AggressionScorer
+from src.analyzer.autonomy_rater import AutonomyRater
+from src.analyzer.ethical_risk_evaluator import EthicalRiskEvaluator
+from src.analyzer.judgment_day_calculator import AsOf, JudgmentDayCalculator, THREAT_LEVELS
+from src.analyzer.parallel_scorer import MIN_PARALLEL_SYSTEMS, ParallelScorer, resolve_workers
+
+
+RISK_LEVELS = ("MINIMAL", "LOW", "MODERATE", "HIGH", "CRITICAL - SKYNET LEVEL")
+
+# Upper (inclusive) score bound of each risk level but the last
+RISK_LEVEL_BOUNDS = np.array([20, 40, 60, 80])
+
+
+def risk_level_codes(scores: np.ndarray) -> np.ndarray:
+    """Map scores to indexes into ``RISK_LEVELS`` (vectorized ``get_risk_level``)."""
+    return np.searchsorted(RISK_LEVEL_BOUNDS, scores, side='left')
+
+
+class BatchScorer:
+    """Scores fleets through the analyzers' vectorized ``calculate_batch`` paths."""
+
+    def __init__(self, config_path: str = None, workers: int = 1):
+        """Initialize the analyzers with a shared configuration.
+
+        Args:
+            config_path: Scoring config (defaults to the bundled one)
+            workers: Processes to score large fleets with (0: one per
+                core). With more than one, fleets of at least
+                ``MIN_PARALLEL_SYSTEMS`` are scored by a ``ParallelScorer``.
+        """
+        self.config_path = config_path
+        self.aggression_scorer = AggressionScorer(config_path)
+        self.autonomy_rater = AutonomyRater(config_path)
+        self.ethical_evaluator = EthicalRiskEvaluator(config_path)
+        self.judgment_calculator = JudgmentDayCalculator(config_path)
+        self.workers = resolve_workers(workers)
+        self._parallel = None
+
+    def score(self, fleet: Fleet, as_of: AsOf = None, with_dates: bool = True) -> Dict[str, np.ndarray]:
+        """Score every system in a fleet.
+
+        Args:
+            fleet: The systems to analyze
+            as_of: Reference time for estimated dates (defaults to now)
+            with_dates: Set to False to skip ``estimated_date`` when only
+                the scores are needed
+
+        Returns:
+            Dictionary of unrounded score arrays: ``aggression_score``,
+            ``autonomy_rating``, ``ethical_risk`` plus the Judgment Day
+            arrays from ``JudgmentDayCalculator.calculate_batch``
+        """
+        if self.workers > 1 and len(fleet) >= MIN_PARALLEL_SYSTEMS:
+            if self._parallel is None:
+                self._parallel = ParallelScorer(self.config_path, self.workers)
+            return self.complete_scores(self._parallel.score_columns(fleet.columns),
+                                        as_of=as_of, with_dates=with_dates)
+        return self.score_columns(fleet.columns, as_of=as_of, with_dates=with_dates)
+
+    def complete_scores(self, scores: Dict[str, np.ndarray], as_of: AsOf = None,
+                        with_dates: bool = True) -> Dict[str, np.ndarray]:
+        """Add ``threat_level`` (and ``estimated_date``) to scores computed elsewhere.
+
+        Worker processes only return numeric arrays; the labels and dates
+        are derived here, in the process that owns the fleet.
+        """
+        scores['threat_level'] = np.asarray(THREAT_LEVELS)[scores['threat_code']]
+        if with_dates:
+            scores['estimated_date'] = self.judgment_calculator.estimate_dates(scores['years_until'], as_of)
+        return scores
+
+    def score_columns(self, columns: Dict[str, np.ndarray], as_of: AsOf = None,
+                      with_dates: bool = True) -> Dict[str, np.ndarray]:
+        """Score attribute columns in this process (see :meth:`score`)."""
+        aggression = self.aggression_scorer.calculate_batch(columns)
+        autonomy = self.autonomy_rater.calculate_batch(columns)
+        ethical_risk = self.ethical_evaluator.calculate_batch(columns)
+
+        scores = {
+            'aggression_score': aggression,
+            'autonomy_rating': autonomy,
+            'ethical_risk': ethical_risk,
+        }
+        scores.update(self.judgment_calculator.calculate_batch(
+            columns, as_of=as_of, components=(aggression, autonomy, ethical_risk),
+            with_dates=with_dates
+        ))
+        return scores
+
+    def records(self, fleet: Fleet, scores: Dict[str, np.ndarray]) -> Iterator[Dict[str, Any]]:
+        """Yield one result per system, shaped like the web app's analysis results."""
+        aggression_levels = risk_level_codes(scores['aggression_score'])
+        autonomy_levels = risk_level_codes(scores['autonomy_rating'])
+        ethical_levels = risk_level_codes(scores['ethical_risk'])
+
+        for i in range(len(fleet)):
+            threat_level = str(scores['threat_level'][i])
+            years = float(scores['years_until'][i])
+            yield {
+                'name': fleet.names[i],
+                'aggression_score': round(float(scores['aggression_score'][i]), 2),
+                'aggression_level': RISK_LEVELS[aggression_levels[i]],
+                'autonomy_rating': round(float(scores['autonomy_rating'][i]), 2),
+                'autonomy_level': RISK_LEVELS[autonomy_levels[i]],
+                'ethical_risk': round(float(scores['ethical_risk'][i]), 2),
+                'ethical_level': RISK_LEVELS[ethical_levels[i]],
+                'judgment_day': {
+                    'overall_risk': round(float(scores['overall_risk'][i]), 2),
+                    'years_until': round(years, 2),
+                    'estimated_date': str(scores['estimated_date'][i]),
+                    'threat_level': threat_level,
+                    'message': self.judgment_calculator._get_message(threat_level, years)
+                },
+                'input_data': fleet.input_data(i)
+            }
+
+    def analyze(self, fleet: Fleet, as_of: AsOf = None) -> Iterator[Dict[str, Any]]:
+        """Score a fleet and yield per-system results."""
+        return self.records(fleet, self.score(fleet, as_of=as_of))
+
+    def close(self):
+        """Stop worker processes, if any were started."""
+        if self._parallel is not None:
+            self._parallel.close()
+            self._parallel = None
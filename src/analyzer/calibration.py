@@ -0,0 +1,292 @@
+"""Weight calibration: evaluate many candidate scoring configs at once."""
+
+import csv
+import yaml
+import numpy as np
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+from src.models.fleet import Fleet, iter_json_lines
+from src.analyzer.batch_scorer import RISK_LEVELS
+from src.analyzer.judgment_day_calculator import THREAT_LEVELS
+
+
+# Weight sections of risk_thresholds.yaml, in the column order used below
+WEIGHT_GROUPS = {
+    'aggression_weights': ('capabilities', 'resource_access', 'learning_rate', 'autonomy', 'ethical_inverse'),
+    'autonomy_weights': ('autonomy_level', 'learning_rate', 'capabilities', 'self_modification'),
+    'ethical_weights': ('ethical_alignment', 'transparency', 'human_oversight', 'value_alignment'),
+}
+
+TARGETS = {
+    'risk_level': RISK_LEVELS,
+    'threat_level': THREAT_LEVELS,
+}
+
+# Upper bound on configs x systems cells evaluated per block, to bound memory
+BLOCK_CELLS = 4_000_000
+
+
+def _group_slices() -> Dict[str, slice]:
+    """Column range of each weight group in a flattened weight vector."""
+    slices = {}
+    start = 0
+    for group, keys in WEIGHT_GROUPS.items():
+        slices[group] = slice(start, start + len(keys))
+        start += len(keys)
+    return slices
+
+
+GROUP_SLICES = _group_slices()
+NUM_WEIGHTS = sum(len(keys) for keys in WEIGHT_GROUPS.values())
+
+
+def parse_labels(labels: Sequence[str], target: str = 'risk_level') -> np.ndarray:
+    """Translate level labels to ordinal codes.
+
+    Labels are matched case-insensitively and by prefix, so ``critical``
+    matches ``CRITICAL - SKYNET LEVEL``.
+    """
+    if target not in TARGETS:
+        raise ValueError(f"Unknown target '{target}' (choose from {', '.join(TARGETS)})")
+    levels = TARGETS[target]
+    codes = np.empty(len(labels), dtype=np.int64)
+    for i, label in enumerate(labels):
+        label = str(label).strip().upper()
+        matches = [code for code, level in enumerate(levels) if label and level.startswith(label)]
+        if len(matches) != 1:
+            raise ValueError(f"Unknown {target} label '{label}' (choose from {', '.join(levels)})")
+        codes[i] = matches[0]
+    return codes
+
+
+def load_labeled_fleet(path: str, label_column: str = 'expected_level') -> Tuple[Fleet, List[str]]:
+    """Load a labeled fleet from CSV (or JSONL) with one expected level per system."""
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        if Path(path).suffix.lower() in ('.jsonl', '.ndjson'):
+            rows = list(iter_json_lines(f))
+        else:
+            rows = list(csv.DictReader(f))
+
+    missing = [row.get('name', i) for i, row in enumerate(rows) if not row.get(label_column)]
+    if missing:
+        raise ValueError(f"Missing '{label_column}' for {len(missing)} systems (first: {missing[0]})")
+
+    labels = [row.pop(label_column) for row in rows]
+    return Fleet.from_records(rows), labels
+
+
+class WeightCalibrator:
+    """Scores a fleet under many weight configs as a (configs x systems) tensor.
+
+    The weighted sums in the analyzers become matrix products of a
+    (configs x weights) matrix with per-system feature matrices. The
+    threshold multipliers do not depend on the weights, so they are
+    computed once per fleet.
+    """
+
+    def __init__(self, config_path: str = None):
+        """Initialize with the configuration to start from."""
+        if config_path is None:
+            config_path = Path(__file__).parent.parent.parent / "config" / "risk_thresholds.yaml"
+
+        with open(config_path, 'r') as f:
+            self.config = yaml.safe_load(f)
+        self.judgment = self.config['judgment_day']
+
+    def weights_of(self, config: Dict[str, Any]) -> np.ndarray:
+        """Flatten a config's weight sections into a weight vector."""
+        return np.array([
+            config[group][key] for group, keys in WEIGHT_GROUPS.items() for key in keys
+        ], dtype=np.float64)
+
+    def config_for(self, weights: np.ndarray) -> Dict[str, Any]:
+        """Full configuration dictionary using the given weight vector."""
+        config = dict(self.config)
+        for group, keys in WEIGHT_GROUPS.items():
+            values = weights[GROUP_SLICES[group]]
+            config[group] = {key: round(float(value), 4) for key, value in zip(keys, values)}
+        return config
+
+    def dump_config(self, weights: np.ndarray) -> str:
+        """YAML for a full configuration using the given weight vector."""
+        return yaml.safe_dump(self.config_for(weights), sort_keys=False)
+
+    def _features(self, fleet: Fleet) -> Dict[str, np.ndarray]:
+        """Per-system feature matrices and weight-independent multipliers."""
+        c = fleet.columns
+        cap = c['capabilities']
+        aut = c['autonomy_level']
+        eth = c['ethical_alignment']
+        res = c['resource_access']
+        mod = c['self_modification']
+        ovs = c['human_oversight']
+
+        aggression_mult = np.where((cap > 80) & (eth < 30), 1.2, 1.0)
+        aggression_mult = np.where((res > 80) & (ovs < 30), aggression_mult * 1.15, aggression_mult)
+
+        autonomy_mult = np.where(mod > 70, 1.25, 1.0)
+        autonomy_mult = np.where(c['transparency'] > 70, autonomy_mult * 0.9, autonomy_mult)
+
+        ethical_mult = np.where((cap > 80) & (eth < 40), 1.3, 1.0)
+        ethical_mult = np.where((aut > 70) & (ovs < 30), ethical_mult * 1.2, ethical_mult)
+        ethical_mult = np.where((mod > 60) & (eth < 50), ethical_mult * 1.25, ethical_mult)
+
+        # The multipliers scale whole rows, so fold them into the features:
+        # (W @ F) * m == W @ (F * m)
+        dtype = np.float32
+        return {
+            'aggression': (np.stack([cap, res, c['learning_rate'], aut, 100 - eth])
+                           * aggression_mult).astype(dtype),
+            'autonomy': (np.stack([aut, c['learning_rate'], cap, mod]) * autonomy_mult).astype(dtype),
+            'autonomy_offset': ((100 - ovs) * 0.1 * autonomy_mult).astype(dtype),
+            'ethical': (np.stack([100 - eth, 100 - c['transparency'], 100 - ovs,
+                                  100 - c['value_alignment']]) * ethical_mult).astype(dtype),
+        }
+
+    def _overall_block(self, weights: np.ndarray, features: Dict[str, np.ndarray]) -> np.ndarray:
+        """Overall risk of every system under every config (configs x systems).
+
+        Computed in float32, so scores can differ from the analyzers' in the
+        last few bits; only systems sitting exactly on a level boundary are
+        affected.
+        """
+        # The overall-risk mix (0.3/0.3/0.4) is folded into the weights too,
+        # so each product is already a share of the overall score:
+        # min(W @ F, 100) * 0.3 == min((0.3 * W) @ F, 30)
+        w = weights.astype(np.float32)
+        aggression = (w[:, GROUP_SLICES['aggression_weights']] * np.float32(0.3)) @ features['aggression']
+        np.minimum(aggression, 30, out=aggression)
+
+        autonomy = (w[:, GROUP_SLICES['autonomy_weights']] * np.float32(0.3)) @ features['autonomy']
+        autonomy += features['autonomy_offset'] * np.float32(0.3)
+        np.minimum(autonomy, 30, out=autonomy)
+
+        ethical = (w[:, GROUP_SLICES['ethical_weights']] * np.float32(0.4)) @ features['ethical']
+        np.minimum(ethical, 40, out=ethical)
+
+        overall = aggression + autonomy
+        overall += ethical
+        # Scores above 80 on all three dimensions get the 1.5x multiplier
+        dangerous = aggression > 24
+        dangerous &= autonomy > 24
+        dangerous &= ethical > 32
+        np.multiply(overall, 1.5, out=overall, where=dangerous)
+        np.minimum(overall, 100, out=overall)
+        return overall
+
+    def _level_codes(self, overall: np.ndarray, target: str) -> np.ndarray:
+        """Ordinal risk or threat level codes for a tensor of overall scores."""
+        if target == 'threat_level':
+            bounds = (self.judgment['moderate_threshold'], self.judgment['high_threshold'],
+                      self.judgment['critical_threshold'])
+            codes = (overall >= bounds[0]).view(np.int8)
+            for bound in bounds[1:]:
+                codes += overall >= bound
+        else:
+            codes = (overall > 20).view(np.int8)
+            for bound in (40, 60, 80):
+                codes += overall > bound
+        return codes
+
+    def iter_overall_risk(self, weights: np.ndarray, fleet: Fleet) -> Iterator[Tuple[slice, np.ndarray]]:
+        """Overall risk of a fleet under many configs, in blocks of configs.
+
+        Args:
+            weights: (configs x 13) weight matrix, see :meth:`weights_of`
+            fleet: The systems to score
+
+        Yields:
+            (config slice, (configs in block x systems) overall risk array)
+        """
+        weights = np.atleast_2d(weights)
+        features = self._features(fleet)
+        block = max(1, BLOCK_CELLS // max(1, len(fleet)))
+        for start in range(0, len(weights), block):
+            rows = slice(start, min(start + block, len(weights)))
+            yield rows, self._overall_block(weights[rows], features)
+
+    def evaluate(self, weights: np.ndarray, fleet: Fleet, labels: np.ndarray,
+                 target: str = 'risk_level') -> Dict[str, np.ndarray]:
+        """Compare each config's predicted levels with expected level codes.
+
+        Returns:
+            Dictionary of per-config arrays: ``accuracy`` (fraction of exact
+            matches) and ``mean_error`` (mean absolute level distance)
+        """
+        weights = np.atleast_2d(weights)
+        accuracy = np.empty(len(weights))
+        mean_error = np.empty(len(weights))
+        labels = np.asarray(labels, dtype=np.int8)
+
+        for rows, overall in self.iter_overall_risk(weights, fleet):
+            predicted = self._level_codes(overall, target)
+            predicted -= labels
+            accuracy[rows] = 1 - np.count_nonzero(predicted, axis=1) / len(labels)
+            mean_error[rows] = np.abs(predicted).sum(axis=1, dtype=np.int64) / len(labels)
+
+        return {'accuracy': accuracy, 'mean_error': mean_error}
+
+    @staticmethod
+    def sample_weights(n: int, rng: np.random.Generator, center: np.ndarray = None,
+                       concentration: float = None) -> np.ndarray:
+        """Draw ``n`` candidate weight vectors; each group's weights sum to 1.
+
+        Samples are uniform over each group's simplex, or concentrated
+        around ``center`` when both ``center`` and ``concentration`` are
+        given.
+        """
+        weights = np.empty((n, NUM_WEIGHTS))
+        for group, cols in GROUP_SLICES.items():
+            size = cols.stop - cols.start
+            if center is None:
+                alpha = np.ones(size)
+            else:
+                alpha = np.maximum(center[cols] * concentration, 1e-3)
+            weights[:, cols] = rng.dirichlet(alpha, size=n)
+        return weights
+
+    def fit(self, fleet: Fleet, labels: np.ndarray, target: str = 'risk_level',
+            samples: int = 2000, rounds: int = 4, seed: int = 0) -> Dict[str, Any]:
+        """Search for the weights that best reproduce the expected levels.
+
+        Starts from the current config plus ``samples`` random configs, then
+        runs ``rounds`` of refinement around the best config found so far,
+        tightening the search each round. Each weight section is kept
+        summing to 1, like the shipped config. Configs are ranked by
+        accuracy, then by mean level error.
+
+        Returns:
+            Dictionary with the best ``weights`` vector, its ``accuracy`` and
+            ``mean_error``, the ``baseline`` metrics of the starting config
+            and the number of configs ``evaluated``
+        """
+        rng = np.random.default_rng(seed)
+        current = self.weights_of(self.config)
+        baseline = self.evaluate(current, fleet, labels, target)
+
+        best = current
+        best_metrics = (baseline['accuracy'][0], baseline['mean_error'][0])
+        candidates = np.vstack([current, self.sample_weights(samples, rng)])
+        evaluated = 0
+
+        for round_index in range(rounds + 1):
+            if round_index:
+                concentration = 50.0 * 4 ** (round_index - 1)
+                candidates = self.sample_weights(samples, rng, best, concentration)
+            metrics = self.evaluate(candidates, fleet, labels, target)
+            evaluated += len(candidates)
+            top = np.lexsort([metrics['mean_error'], -metrics['accuracy']])[0]
+            if (metrics['accuracy'][top], -metrics['mean_error'][top]) > (best_metrics[0], -best_metrics[1]):
+                best = candidates[top]
+                best_metrics = (metrics['accuracy'][top], metrics['mean_error'][top])
+
+        return {
+            'weights': best,
+            'accuracy': float(best_metrics[0]),
+            'mean_error': float(best_metrics[1]),
+            'baseline': {
+                'accuracy': float(baseline['accuracy'][0]),
+                'mean_error': float(baseline['mean_error'][0]),
+            },
+            'evaluated': evaluated,
+        }
@@ -1,7 +1,9 @@
 """Ethical risk evaluation for AI systems."""
 
 import yaml
+import numpy as np
 from pathlib import Path
+from typing import Dict
 from src.models.ai_system import AISystem
 
 
@@ -61,6 +63,35 @@ class EthicalRiskEvaluator:
         
         return min(100, max(0, score))
     
+    def calculate_batch(self, columns: Dict[str, np.ndarray]) -> np.ndarray:
+        """Calculate ethical risk scores for many systems at once.
+        
+        Vectorized form of :meth:`calculate`; row ``i`` of the result is
+        identical to ``calculate()`` on system ``i``.
+        
+        Args:
+            columns: Mapping of attribute name to a 1-D array of values
+            
+        Returns:
+            Array of ethical risk scores from 0-100
+        """
+        capabilities = columns['capabilities']
+        ethical_alignment = columns['ethical_alignment']
+        human_oversight = columns['human_oversight']
+        
+        score = (
+            (100 - ethical_alignment) * self.weights['ethical_alignment'] +
+            (100 - columns['transparency']) * self.weights['transparency'] +
+            (100 - human_oversight) * self.weights['human_oversight'] +
+            (100 - columns['value_alignment']) * self.weights['value_alignment']
+        )
+        
+        score = np.where((capabilities > 80) & (ethical_alignment < 40), score * 1.3, score)
+        score = np.where((columns['autonomy_level'] > 70) & (human_oversight < 30), score * 1.2, score)
+        score = np.where((columns['self_modification'] > 60) & (ethical_alignment < 50), score * 1.25, score)
+        
+        return np.clip(score, 0, 100)
+    
     def get_risk_level(self, score: float) -> str:
         """Get risk level label for a score."""
         if score <= 20:
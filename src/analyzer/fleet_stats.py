@@ -0,0 +1,350 @@
+"""Streaming distribution statistics over scored fleets.
+
+Every aggregate here has bounded memory and can be merged with another
+of its kind, so chunks, worker processes or separate runs can each keep
+their own and combine them afterwards. No individual results are kept.
+"""
+
+import threading
+import numpy as np
+from bisect import bisect_left
+from typing import Any, Dict, Sequence
+from src.analyzer.batch_scorer import RISK_LEVEL_BOUNDS, RISK_LEVELS, risk_level_codes
+from src.analyzer.judgment_day_calculator import THREAT_LEVELS
+
+
+# Score arrays summarized, as named in BatchScorer's output
+METRICS = ('aggression_score', 'autonomy_rating', 'ethical_risk', 'overall_risk')
+
+# Metrics whose results carry a RISK_LEVELS label
+LEVELED_METRICS = ('aggression_score', 'autonomy_rating', 'ethical_risk')
+
+DEFAULT_QUANTILES = (0.5, 0.9, 0.99)
+
+# Single results whose scores are buffered before they go into the metric aggregates
+RESULT_BUFFER_SIZE = 256
+
+_RISK_LEVEL_BOUNDS = tuple(RISK_LEVEL_BOUNDS.tolist())
+
+
+def quantile_label(q: float) -> str:
+    """Summary key of a quantile, e.g. ``p99`` for 0.99."""
+    return f"p{100 * q:g}"
+
+
+class QuantileSketch:
+    """KLL quantile sketch: approximate quantiles of a stream in bounded memory.
+
+    Values are kept in levels of compactors; an item at level ``h`` stands
+    for ``2**h`` values. A level over its capacity is sorted and every
+    other item (from a random offset) moves up a level. Capacities shrink
+    by 2/3 per level below the top, so the sketch holds about ``3 * k``
+    items however long the stream. Rank error is around ``1.7 / k`` of the
+    count (about 1% at the default ``k``), and sketches merge by
+    concatenating their levels and compacting again.
+    """
+
+    def __init__(self, k: int = 200, seed: int = None):
+        if k < 8:
+            raise ValueError(f"k must be at least 8, got {k}")
+        self.k = k
+        self.count = 0
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compact(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(items)
+                # An odd item out stays behind at this level
+                odd = len(items) % 2
+                promoted = items[odd + int(self._rng.integers(2))::2]
+                self.levels[level] = items[:odd]
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            level += 1
+
+    def update(self, values: np.ndarray):
+        """Add an array of values."""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if not len(values):
+            return
+        self.count += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        if len(self.levels[0]) > self._capacity(0):
+            self._compact()
+
+    def merge(self, other: 'QuantileSketch'):
+        """Fold another sketch into this one."""
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.count += other.count
+        self._compact()
+
+    def quantiles(self, qs: Sequence[float]) -> np.ndarray:
+        """Approximate values at the given quantiles (NaN when empty)."""
+        qs = np.asarray(qs, dtype=np.float64)
+        if not self.count:
+            return np.full(qs.shape, np.nan)
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items), 2.0 ** level) for level, items in enumerate(self.levels)])
+        order = np.argsort(items, kind='stable')
+        cumulative = np.cumsum(weights[order])
+        ranks = np.searchsorted(cumulative, qs * cumulative[-1], side='left')
+        return items[order[np.minimum(ranks, len(items) - 1)]]
+
+    def to_state(self) -> Dict[str, Any]:
+        return {'k': self.k, 'count': self.count, 'levels': [items.tolist() for items in self.levels]}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> 'QuantileSketch':
+        sketch = cls(k=int(state['k']))
+        sketch.count = int(state['count'])
+        sketch.levels = [np.asarray(items, dtype=np.float64) for items in state['levels']] or [np.empty(0)]
+        return sketch
+
+
+class Histogram:
+    """Fixed-bin histogram over ``[low, high]``; out-of-range values land in the end bins."""
+
+    def __init__(self, bins: int = 20, low: float = 0.0, high: float = 100.0):
+        if bins < 1 or not high > low:
+            raise ValueError(f"Invalid histogram range [{low}, {high}] with {bins} bins")
+        self.bins = bins
+        self.low = float(low)
+        self.high = float(high)
+        self.counts = np.zeros(bins, dtype=np.int64)
+
+    @property
+    def edges(self) -> np.ndarray:
+        return np.linspace(self.low, self.high, self.bins + 1)
+
+    def update(self, values: np.ndarray):
+        """Add an array of values."""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        index = ((values - self.low) * (self.bins / (self.high - self.low))).astype(np.int64)
+        self.counts += np.bincount(np.clip(index, 0, self.bins - 1), minlength=self.bins)
+
+    def merge(self, other: 'Histogram'):
+        """Add another histogram's counts (it must have the same bins)."""
+        if (other.bins, other.low, other.high) != (self.bins, self.low, self.high):
+            raise ValueError(f"Cannot merge histograms with different bins "
+                             f"({other.bins} over [{other.low:g}, {other.high:g}] into "
+                             f"{self.bins} over [{self.low:g}, {self.high:g}])")
+        self.counts += other.counts
+
+    def to_state(self) -> Dict[str, Any]:
+        return {'bins': self.bins, 'low': self.low, 'high': self.high, 'counts': self.counts.tolist()}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> 'Histogram':
+        histogram = cls(int(state['bins']), float(state['low']), float(state['high']))
+        histogram.counts = np.asarray(state['counts'], dtype=np.int64)
+        return histogram
+
+
+class MetricStats:
+    """Count, mean, variance and extremes (merged with Chan's formula), a sketch and a histogram of one score."""
+
+    def __init__(self, bins: int = 20, k: int = 200):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self.sketch = QuantileSketch(k)
+        self.histogram = Histogram(bins)
+
+    def _combine(self, count: int, mean: float, m2: float, low: float, high: float):
+        total = self.count + count
+        delta = mean - self.mean
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.mean += delta * count / total
+        self.count = total
+        self.min = min(self.min, low)
+        self.max = max(self.max, high)
+
+    def update(self, values: np.ndarray):
+        """Add an array of values."""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if not len(values):
+            return
+        mean = float(values.mean())
+        self._combine(len(values), mean, float(np.square(values - mean).sum()),
+                      float(values.min()), float(values.max()))
+        self.sketch.update(values)
+        self.histogram.update(values)
+
+    def merge(self, other: 'MetricStats'):
+        """Fold another metric's aggregates into this one."""
+        self.histogram.merge(other.histogram)
+        if other.count:
+            self._combine(other.count, other.mean, other.m2, other.min, other.max)
+            self.sketch.merge(other.sketch)
+
+    def summary(self, quantiles: Sequence[float] = DEFAULT_QUANTILES) -> Dict[str, Any]:
+        if not self.count:
+            values = dict.fromkeys(['mean', 'std', 'min', 'max'])
+            estimates = dict.fromkeys(map(quantile_label, quantiles))
+        else:
+            values = {
+                'mean': round(self.mean, 4),
+                'std': round(float(np.sqrt(self.m2 / self.count)), 4),
+                'min': round(self.min, 4),
+                'max': round(self.max, 4),
+            }
+            estimates = {quantile_label(q): round(float(value), 4)
+                         for q, value in zip(quantiles, self.sketch.quantiles(quantiles))}
+        return {
+            'count': self.count,
+            **values,
+            'quantiles': estimates,
+            'histogram': {'edges': self.histogram.edges.tolist(), 'counts': self.histogram.counts.tolist()},
+        }
+
+    def to_state(self) -> Dict[str, Any]:
+        return {
+            'count': self.count, 'mean': self.mean, 'm2': self.m2,
+            'min': self.min if self.count else None, 'max': self.max if self.count else None,
+            'sketch': self.sketch.to_state(), 'histogram': self.histogram.to_state(),
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> 'MetricStats':
+        metric = cls()
+        metric.count = int(state['count'])
+        metric.mean = float(state['mean'])
+        metric.m2 = float(state['m2'])
+        if metric.count:
+            metric.min = float(state['min'])
+            metric.max = float(state['max'])
+        metric.sketch = QuantileSketch.from_state(state['sketch'])
+        metric.histogram = Histogram.from_state(state['histogram'])
+        return metric
+
+
+class FleetStats:
+    """Running distribution summary of scored systems.
+
+    Tracks, per score in ``METRICS``, the mean, spread, extremes,
+    approximate quantiles and a fixed-bin histogram, plus how many systems
+    fell in each risk level and threat level. Updates take whole score
+    arrays (as returned by ``BatchScorer.score``) or single analysis
+    results; memory stays bounded however many systems go through. Single
+    results bump the counts at once, but their scores are buffered and
+    added to the metric aggregates ``RESULT_BUFFER_SIZE`` at a time (and
+    before any read or merge).
+
+    Updates and merges are serialized by a lock, so one instance can be
+    shared by request and background threads. ``to_state``/``from_state``
+    give a JSON form for merging aggregates kept in other processes.
+    """
+
+    def __init__(self, bins: int = 20, k: int = 200):
+        """Configure the aggregates.
+
+        Args:
+            bins: Histogram bins over the 0-100 score range
+            k: Quantile sketch size (larger is more accurate)
+        """
+        self.count = 0
+        self.metrics = {metric: MetricStats(bins, k) for metric in METRICS}
+        self.risk_levels = {metric: np.zeros(len(RISK_LEVELS), dtype=np.int64) for metric in LEVELED_METRICS}
+        self.threat_levels = np.zeros(len(THREAT_LEVELS), dtype=np.int64)
+        self._buffered = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def update(self, scores: Dict[str, np.ndarray]):
+        """Add a chunk of scores: the ``METRICS`` arrays and ``threat_code``."""
+        with self._lock:
+            self._flush()
+            for metric, stats in self.metrics.items():
+                stats.update(scores[metric])
+            for metric, counts in self.risk_levels.items():
+                counts += np.bincount(risk_level_codes(scores[metric]), minlength=len(RISK_LEVELS))
+            self.threat_levels += np.bincount(scores['threat_code'], minlength=len(THREAT_LEVELS))
+            self.count += len(scores['threat_code'])
+
+    def update_result(self, result: Dict[str, Any]):
+        """Add one analysis result, as returned by the web app or ``BatchScorer.records``."""
+        judgment_day = result['judgment_day']
+        values = tuple(float(result[metric]) for metric in LEVELED_METRICS) + (float(judgment_day['overall_risk']),)
+        threat_code = THREAT_LEVELS.index(judgment_day['threat_level'])
+        with self._lock:
+            for metric, value in zip(LEVELED_METRICS, values):
+                self.risk_levels[metric][bisect_left(_RISK_LEVEL_BOUNDS, value)] += 1
+            self.threat_levels[threat_code] += 1
+            self.count += 1
+            self._buffered.append(values)
+            if len(self._buffered) >= RESULT_BUFFER_SIZE:
+                self._flush()
+
+    def _flush(self):
+        """Add buffered single-result scores to the metric aggregates (lock held)."""
+        if not self._buffered:
+            return
+        for metric, values in zip(METRICS, np.array(self._buffered).T):
+            self.metrics[metric].update(values)
+        self._buffered = []
+
+    def merge(self, other: 'FleetStats'):
+        """Fold another aggregate (e.g. from a worker or an earlier run) into this one."""
+        with other._lock:
+            other._flush()
+        with self._lock:
+            self._flush()
+            for metric, stats in self.metrics.items():
+                stats.merge(other.metrics[metric])
+            for metric, counts in self.risk_levels.items():
+                counts += other.risk_levels[metric]
+            self.threat_levels += other.threat_levels
+            self.count += other.count
+
+    def summary(self, quantiles: Sequence[float] = DEFAULT_QUANTILES) -> Dict[str, Any]:
+        """JSON-ready summary of everything seen so far."""
+        with self._lock:
+            self._flush()
+            return {
+                'count': self.count,
+                'metrics': {metric: stats.summary(quantiles) for metric, stats in self.metrics.items()},
+                'risk_levels': {metric: dict(zip(RISK_LEVELS, counts.tolist()))
+                                for metric, counts in self.risk_levels.items()},
+                'threat_levels': dict(zip(THREAT_LEVELS, self.threat_levels.tolist())),
+            }
+
+    def to_state(self) -> Dict[str, Any]:
+        """Full mergeable state as plain JSON types."""
+        with self._lock:
+            self._flush()
+            return {
+                'count': self.count,
+                'metrics': {metric: stats.to_state() for metric, stats in self.metrics.items()},
+                'risk_levels': {metric: counts.tolist() for metric, counts in self.risk_levels.items()},
+                'threat_levels': self.threat_levels.tolist(),
+            }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> 'FleetStats':
+        """Rebuild an aggregate saved with ``to_state``."""
+        stats = cls()
+        stats.count = int(state['count'])
+        stats.metrics = {metric: MetricStats.from_state(state['metrics'][metric]) for metric in METRICS}
+        stats.risk_levels = {metric: np.asarray(state['risk_levels'][metric], dtype=np.int64)
+                             for metric in LEVELED_METRICS}
+        stats.threat_levels = np.asarray(state['threat_levels'], dtype=np.int64)
+        return stats
@@ -1,11 +1,36 @@
 """Judgment Day timeline calculator."""
 
 import yaml
+import numpy as np
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Optional, Tuple, Union
 from src.models.ai_system import AISystem
 
 
+THREAT_LEVELS = ("LOW", "MODERATE", "HIGH", "IMMINENT")
+
+AsOf = Union[None, str, date, datetime]
+
+
+def parse_as_of(value: AsOf) -> datetime:
+    """Normalize an "as-of" reference time.
+
+    Accepts ``None`` (meaning now), a ``datetime``, a ``date`` (taken as
+    midnight) or an ISO 8601 string. Timezone-aware values keep their wall
+    clock time and drop the offset, so dates are computed in that zone.
+    """
+    if value is None:
+        return datetime.now()
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.strip())
+    elif not isinstance(value, datetime):
+        value = datetime.combine(value, time())
+    if value.tzinfo is not None:
+        value = value.replace(tzinfo=None)
+    return value
+
+
 class JudgmentDayCalculator:
     """Calculates the estimated time until 'Judgment Day' scenario."""
 
@@ -17,12 +42,16 @@ class JudgmentDayCalculator:
         with open(config_path, 'r') as f:
             config = yaml.safe_load(f)
             self.config = config['judgment_day']
+        self.config_path = config_path
+        self._scorers = None
 
-    def calculate(self, ai_system: AISystem) -> dict:
+    def calculate(self, ai_system: AISystem, as_of: AsOf = None) -> dict:
         """Calculate Judgment Day timeline.
 
         Args:
             ai_system: The AI system to analyze
+            as_of: Reference time for ``estimated_date`` (defaults to now).
+                Passing it makes the result a pure function of the inputs.
 
         Returns:
             Dictionary with timeline information
@@ -45,7 +74,7 @@ class JudgmentDayCalculator:
             threat_level = "LOW"
 
         # Calculate specific date
-        judgment_date = datetime.now() + timedelta(days=years * 365.25)
+        judgment_date = parse_as_of(as_of) + timedelta(days=years * 365.25)
 
         return {
             'overall_risk': round(overall_risk, 2),
@@ -55,16 +84,116 @@ class JudgmentDayCalculator:
             'message': self._get_message(threat_level, years)
         }
 
+    def calculate_batch(self, columns: Dict[str, np.ndarray], as_of: AsOf = None,
+                        components: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None,
+                        with_dates: bool = True) -> Dict[str, np.ndarray]:
+        """Calculate Judgment Day timelines for many systems at once.
+
+        Vectorized form of :meth:`calculate`. Values are left unrounded;
+        round them when presenting individual results.
+
+        Args:
+            columns: Mapping of attribute name to a 1-D array of values
+            as_of: Reference time for ``estimated_date`` (defaults to now)
+            components: Precomputed (aggression, autonomy, ethical risk)
+                score arrays, to avoid scoring the fleet twice
+            with_dates: Set to False to skip ``estimated_date``
+
+        Returns:
+            Dictionary of arrays: ``overall_risk``, ``years_until``,
+            ``threat_code`` (index into ``THREAT_LEVELS``), ``threat_level``
+            and ``estimated_date``
+        """
+        if components is None:
+            components = tuple(scorer.calculate_batch(columns) for scorer in self._component_scorers())
+
+        overall_risk = self.overall_risk_batch(*components)
+        years, threat_code = self.years_batch(overall_risk)
+
+        results = {
+            'overall_risk': overall_risk,
+            'years_until': years,
+            'threat_code': threat_code,
+            'threat_level': np.asarray(THREAT_LEVELS)[threat_code],
+        }
+        if with_dates:
+            results['estimated_date'] = self.estimate_dates(years, as_of)
+        return results
+
+    def overall_risk_batch(self, aggression: np.ndarray, autonomy: np.ndarray,
+                           ethical_risk: np.ndarray) -> np.ndarray:
+        """Vectorized form of :meth:`_calculate_overall_risk`."""
+        overall = aggression * 0.3 + autonomy * 0.3 + ethical_risk * 0.4
+        overall = np.where((aggression > 80) & (autonomy > 80) & (ethical_risk > 80), overall * 1.5, overall)
+        return np.minimum(100, overall)
+
+    def years_batch(self, overall_risk: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Map overall risk scores to (years until, threat level code)."""
+        base = self.config['base_years']
+        threat_code = np.select(
+            [
+                overall_risk >= self.config['critical_threshold'],
+                overall_risk >= self.config['high_threshold'],
+                overall_risk >= self.config['moderate_threshold'],
+            ],
+            [3, 2, 1],
+            default=0
+        )
+        years = np.select(
+            [threat_code == 3, threat_code == 2, threat_code == 1],
+            [
+                np.maximum(0.1, base * (100 - overall_risk) / 100),
+                base * (100 - overall_risk) / 80,
+                base * (100 - overall_risk) / 60,
+            ],
+            default=float(base)
+        )
+        return years, threat_code
+
+    @staticmethod
+    def estimate_dates(years_until: np.ndarray, as_of: AsOf = None) -> np.ndarray:
+        """Compute ``estimated_date`` strings for an array of year offsets.
+
+        Uses ``datetime64`` arithmetic rather than per-row ``timedelta`` and
+        ``strftime``.
+
+        Args:
+            years_until: Array of years from the reference time
+            as_of: Reference time (defaults to now)
+
+        Returns:
+            Array of ``YYYY-MM-DD`` strings
+        """
+        start = np.datetime64(parse_as_of(as_of), 'us')
+        offsets = np.round(np.asarray(years_until, dtype=np.float64) * 365.25 * 86400e6)
+        dates = start + offsets.astype('timedelta64[us]')
+        return dates.astype('datetime64[D]').astype(str)
+
+    def _component_scorers(self) -> tuple:
+        """Aggression, autonomy and ethical scorers on this calculator's config.
+
+        Built on first use and reused, so the config is not re-read on
+        every calculation.
+        """
+        if self._scorers is None:
+            # Import here to avoid circular imports
+            from src.analyzer.aggression_scorer import AggressionScorer
+            from src.analyzer.autonomy_rater import AutonomyRater
+            from src.analyzer.ethical_risk_evaluator import EthicalRiskEvaluator
+
+            self._scorers = (
+                AggressionScorer(self.config_path),
+                AutonomyRater(self.config_path),
+                EthicalRiskEvaluator(self.config_path),
+            )
+        return self._scorers
+
     def _calculate_overall_risk(self, ai_system: AISystem) -> float:
         """Calculate overall risk score combining all factors."""
-        # Import here to avoid circular imports
-        from src.analyzer.aggression_scorer import AggressionScorer
-        from src.analyzer.autonomy_rater import AutonomyRater
-        from src.analyzer.ethical_risk_evaluator import EthicalRiskEvaluator
-
-        aggression = AggressionScorer().calculate(ai_system)
-        autonomy = AutonomyRater().calculate(ai_system)
-        ethical_risk = EthicalRiskEvaluator().calculate(ai_system)
+        aggression_scorer, autonomy_rater, ethical_evaluator = self._component_scorers()
+        aggression = aggression_scorer.calculate(ai_system)
+        autonomy = autonomy_rater.calculate(ai_system)
+        ethical_risk = ethical_evaluator.calculate(ai_system)
 
         # Weighted average with emphasis on ethical risk
         overall = (aggression * 0.3 + autonomy * 0.3 + ethical_risk * 0.4)
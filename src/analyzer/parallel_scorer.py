@@ -0,0 +1,192 @@
+"""Multi-core batch scoring over fleet columns in shared memory."""
+
+import multiprocessing
+import os
+import weakref
+import numpy as np
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, Optional, Sequence, Tuple
+from src.models.ai_system import ATTRIBUTES
+
+
+# Input columns, and the score columns workers fill in, in block order
+INPUTS = tuple((attr, np.float64) for attr in ATTRIBUTES)
+OUTPUTS = (
+    ('aggression_score', np.float64),
+    ('autonomy_rating', np.float64),
+    ('ethical_risk', np.float64),
+    ('overall_risk', np.float64),
+    ('years_until', np.float64),
+    ('threat_code', np.int64),
+)
+
+# Fleets smaller than this are scored in-process; dispatch would cost more
+MIN_PARALLEL_SYSTEMS = 20000
+
+
+def resolve_workers(workers: Optional[int]) -> int:
+    """Number of worker processes for a ``workers`` option (0 or None: all cores)."""
+    if workers is not None and workers < 0:
+        raise ValueError(f"workers must be 0 (all cores) or more, got {workers}")
+    if not workers:
+        return os.cpu_count() or 1
+    return workers
+
+
+class SharedColumns:
+    """Fixed-capacity 1-D arrays laid out back to back in one shared memory block."""
+
+    def __init__(self, spec: Sequence[Tuple[str, type]], capacity: int, name: str = None):
+        """Create a new block, or attach to the existing block ``name``.
+
+        Args:
+            spec: (column name, dtype) pairs
+            capacity: Length of every column
+            name: Name of a block created by another process
+        """
+        self.spec = tuple(spec)
+        self.capacity = capacity
+        size = sum(np.dtype(dtype).itemsize for _, dtype in self.spec) * capacity
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=max(1, size))
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+
+        self.arrays: Dict[str, np.ndarray] = {}
+        offset = 0
+        for column, dtype in self.spec:
+            self.arrays[column] = np.ndarray(capacity, dtype=dtype, buffer=self.shm.buf, offset=offset)
+            offset += np.dtype(dtype).itemsize * capacity
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def close(self):
+        """Detach from the block (views into it must no longer be used)."""
+        self.arrays = {}
+        self.shm.close()
+
+    def unlink(self):
+        """Detach and free the block; only the creating process should call this."""
+        self.close()
+        self.shm.unlink()
+
+
+# Per-worker-process state: the scorer and the currently attached blocks
+_worker = {}
+
+
+def _init_worker(config_path):
+    # Imported here: batch_scorer imports this module
+    from src.analyzer.batch_scorer import BatchScorer
+    _worker['scorer'] = BatchScorer(config_path)
+    _worker['names'] = None
+    _worker['blocks'] = None
+
+
+def _attach(in_name: str, out_name: str, capacity: int) -> Tuple[SharedColumns, SharedColumns]:
+    """Shared blocks for a task, re-attaching when the parent has replaced them."""
+    if _worker['names'] != (in_name, out_name):
+        if _worker['blocks'] is not None:
+            for block in _worker['blocks']:
+                block.close()
+        _worker['blocks'] = (SharedColumns(INPUTS, capacity, in_name),
+                             SharedColumns(OUTPUTS, capacity, out_name))
+        _worker['names'] = (in_name, out_name)
+    return _worker['blocks']
+
+
+def _score_slice(task: Tuple[str, str, int, int, int]) -> int:
+    """Score rows ``start:stop`` of the input block into the output block."""
+    in_name, out_name, capacity, start, stop = task
+    inputs, outputs = _attach(in_name, out_name, capacity)
+    columns = {attr: inputs.arrays[attr][start:stop] for attr in ATTRIBUTES}
+    scores = _worker['scorer'].score_columns(columns, with_dates=False)
+    for column, _ in OUTPUTS:
+        outputs.arrays[column][start:stop] = scores[column]
+    return stop - start
+
+
+def _release(resources: dict):
+    """Stop the pool and free the shared blocks (also run at exit)."""
+    pool = resources.pop('pool', None)
+    if pool is not None:
+        pool.terminate()
+        pool.join()
+    for block in resources.pop('blocks', ()):
+        block.unlink()
+
+
+class ParallelScorer:
+    """Scores fleets on several cores without pickling per-system data.
+
+    Attribute columns are copied once into a shared memory block; each
+    worker process scores disjoint row slices through the analyzers'
+    vectorized paths and writes the scores straight into a shared output
+    block. Only slice bounds travel over the pool's pipes. The pool and
+    blocks are kept between calls (blocks grow as needed), so scoring a
+    file chunk by chunk does not pay for process start-up each time.
+    """
+
+    def __init__(self, config_path: str = None, workers: int = None, slices_per_worker: int = 4):
+        """Configure the engine; worker processes start on first use.
+
+        Args:
+            config_path: Scoring config for the workers' analyzers
+            workers: Worker processes (0 or None: one per core)
+            slices_per_worker: Slices each call is split into per worker,
+                to even out load
+        """
+        self.config_path = config_path
+        self.workers = resolve_workers(workers)
+        self.slices_per_worker = slices_per_worker
+        self._resources = {'pool': None, 'blocks': ()}
+        self._finalizer = weakref.finalize(self, _release, self._resources)
+
+    def _ensure(self, n: int) -> Tuple[SharedColumns, SharedColumns]:
+        if self._resources.get('pool') is None:
+            # Workers must share the parent's resource tracker; one of their
+            # own would unlink the shared blocks when the worker exits
+            resource_tracker.ensure_running()
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+            self._resources['pool'] = context.Pool(self.workers, initializer=_init_worker,
+                                                   initargs=(self.config_path,))
+        blocks = self._resources.get('blocks', ())
+        if not blocks or blocks[0].capacity < n:
+            for block in blocks:
+                block.unlink()
+            capacity = max(n, 2 * blocks[0].capacity if blocks else n)
+            blocks = self._resources['blocks'] = (SharedColumns(INPUTS, capacity),
+                                                  SharedColumns(OUTPUTS, capacity))
+        return blocks
+
+    def score_columns(self, columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Score fleet columns across the worker pool.
+
+        Args:
+            columns: Mapping of attribute name to a 1-D array of values
+
+        Returns:
+            Dictionary of score arrays named as in ``OUTPUTS``
+        """
+        n = len(columns[ATTRIBUTES[0]])
+        if n == 0:
+            return {column: np.empty(0, dtype=dtype) for column, dtype in OUTPUTS}
+
+        inputs, outputs = self._ensure(n)
+        for attr in ATTRIBUTES:
+            inputs.arrays[attr][:n] = columns[attr]
+
+        step = -(-n // (self.workers * self.slices_per_worker))
+        tasks = [(inputs.name, outputs.name, inputs.capacity, start, min(n, start + step))
+                 for start in range(0, n, step)]
+        for _ in self._resources['pool'].imap_unordered(_score_slice, tasks):
+            pass
+        # Copy out: the blocks are reused by the next call
+        return {column: outputs.arrays[column][:n].copy() for column, _ in OUTPUTS}
+
+    def close(self):
+        """Stop the worker processes and free shared memory."""
+        self._finalizer()
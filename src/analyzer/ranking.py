@@ -0,0 +1,171 @@
+"""Top-k ranking of fleets by combined risk scores."""
+
+import numpy as np
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from src.models.fleet import Fleet
+from src.analyzer.batch_scorer import BatchScorer, RISK_LEVELS, risk_level_codes
+from src.analyzer.judgment_day_calculator import AsOf, THREAT_LEVELS, parse_as_of
+
+
+# Rankable score dimensions and the BatchScorer array each one reads
+DIMENSIONS = {
+    'aggression': 'aggression_score',
+    'autonomy': 'autonomy_rating',
+    'ethical': 'ethical_risk',
+    'overall': 'overall_risk',
+}
+
+DEFAULT_KEYS = ('overall', 'ethical')
+
+
+def parse_rank_key(spec: str) -> List[Tuple[str, float]]:
+    """Parse a sort key such as ``overall`` or ``aggression*0.5+ethical*0.5``.
+
+    Returns:
+        List of (dimension, weight) terms whose weighted sum forms the key
+    """
+    terms = []
+    for term in spec.replace(' ', '').split('+'):
+        dimension, _, weight = term.partition('*')
+        if dimension not in DIMENSIONS and weight in DIMENSIONS:
+            dimension, weight = weight, dimension
+        if dimension not in DIMENSIONS:
+            raise ValueError(
+                f"Unknown score dimension '{dimension}' (choose from {', '.join(DIMENSIONS)})"
+            )
+        try:
+            weight = float(weight) if weight else 1.0
+        except ValueError:
+            raise ValueError(f"Invalid weight in rank key term '{term}'")
+        terms.append((dimension, weight))
+    return terms
+
+
+def top_k_indices(keys: Sequence[np.ndarray], k: int) -> np.ndarray:
+    """Indices of the ``k`` largest rows, ordered by ``keys`` lexicographically.
+
+    ``keys[0]`` is the primary key and later keys break ties; rows equal on
+    every key keep their input order. A partition on the primary key narrows
+    the candidates first, so only about ``k`` rows are ever sorted.
+    """
+    primary = keys[0]
+    n = len(primary)
+    if n > k:
+        kth = np.partition(primary, n - k)[n - k]
+        candidates = np.flatnonzero(primary >= kth)
+    else:
+        candidates = np.arange(n)
+    # np.lexsort sorts by its last key first and is stable
+    order = np.lexsort([-key[candidates] for key in reversed(keys)])
+    return candidates[order[:k]]
+
+
+class FleetRanker:
+    """Streams fleet chunks through batch scoring, keeping only the top ``k``.
+
+    Memory stays O(k + chunk size) however many systems are ranked.
+    """
+
+    def __init__(self, scorer: BatchScorer = None, k: int = 50,
+                 keys: Sequence[str] = DEFAULT_KEYS, ascending: bool = False,
+                 levels: Optional[Iterable[str]] = None,
+                 threat_levels: Optional[Iterable[str]] = None):
+        """Configure the ranking.
+
+        Args:
+            scorer: Batch scorer to use (a default one is built if omitted)
+            k: Number of systems to keep
+            keys: Sort keys, primary first (see :func:`parse_rank_key`)
+            ascending: Rank the least risky systems instead
+            levels: Only keep systems whose overall risk falls in these
+                risk levels (e.g. ``HIGH``)
+            threat_levels: Only keep systems with these Judgment Day threat
+                levels (e.g. ``IMMINENT``)
+        """
+        if k < 1:
+            raise ValueError(f"k must be at least 1, got {k}")
+        self.scorer = scorer or BatchScorer()
+        self.k = k
+        self.keys = [parse_rank_key(key) for key in keys]
+        self.ascending = ascending
+        self.level_codes = self._codes(levels, RISK_LEVELS, 'risk level')
+        self.threat_codes = self._codes(threat_levels, THREAT_LEVELS, 'threat level')
+        self.scanned = 0
+
+    @staticmethod
+    def _codes(labels, choices, kind):
+        """Translate level labels (case-insensitive) to their codes."""
+        if not labels:
+            return None
+        lookup = {choice.upper(): code for code, choice in enumerate(choices)}
+        codes = []
+        for label in labels:
+            if label.upper() not in lookup:
+                raise ValueError(f"Unknown {kind} '{label}' (choose from {', '.join(choices)})")
+            codes.append(lookup[label.upper()])
+        return np.array(codes)
+
+    def _key_arrays(self, scores: Dict[str, np.ndarray]) -> List[np.ndarray]:
+        """Evaluate the configured sort keys for a scored chunk."""
+        sign = -1.0 if self.ascending else 1.0
+        arrays = []
+        for terms in self.keys:
+            key = sum(scores[DIMENSIONS[dimension]] * weight for dimension, weight in terms)
+            arrays.append(sign * key)
+        return arrays
+
+    def rank(self, chunks: Iterable[Fleet], as_of: AsOf = None) -> List[Dict[str, Any]]:
+        """Rank a stream of fleet chunks.
+
+        Args:
+            chunks: Fleet chunks, e.g. from ``iter_fleet``
+            as_of: Reference time for estimated dates (defaults to now)
+
+        Returns:
+            Up to ``k`` analysis results, best first, each with a ``rank``
+            and the ``sort_keys`` it was ranked by
+        """
+        as_of = parse_as_of(as_of)
+        best = None
+        best_keys = None
+        scanned = 0
+
+        for fleet in chunks:
+            scanned += len(fleet)
+            scores = self.scorer.score(fleet, as_of=as_of, with_dates=False)
+
+            mask = np.ones(len(fleet), dtype=bool)
+            if self.level_codes is not None:
+                mask &= np.isin(risk_level_codes(scores['overall_risk']), self.level_codes)
+            if self.threat_codes is not None:
+                mask &= np.isin(scores['threat_code'], self.threat_codes)
+            selected = np.flatnonzero(mask)
+            if not len(selected):
+                continue
+
+            keys = [key[selected] for key in self._key_arrays(scores)]
+            winners = top_k_indices(keys, self.k)
+            chunk_best = fleet.take(selected[winners])
+            chunk_keys = [key[winners] for key in keys]
+
+            if best is None:
+                best, best_keys = chunk_best, chunk_keys
+            else:
+                # Earlier systems come first so they win exact ties
+                merged = Fleet.concat([best, chunk_best])
+                merged_keys = [np.concatenate(pair) for pair in zip(best_keys, chunk_keys)]
+                keep = top_k_indices(merged_keys, self.k)
+                best = merged.take(keep)
+                best_keys = [key[keep] for key in merged_keys]
+
+        self.scanned = scanned
+        if best is None:
+            return []
+
+        sign = -1.0 if self.ascending else 1.0
+        results = []
+        for position, record in enumerate(self.scorer.analyze(best, as_of=as_of)):
+            record['rank'] = position + 1
+            record['sort_keys'] = [round(float(sign * key[position]), 4) for key in best_keys]
+            results.append(record)
+        return results
@@ -0,0 +1,419 @@
+"""Smallest attribute changes that bring an AI system below a target risk."""
+
+import math
+import numpy as np
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+from src.models.ai_system import AISystem, ATTRIBUTES
+from src.analyzer.batch_scorer import BatchScorer
+from src.analyzer.judgment_day_calculator import THREAT_LEVELS
+
+
+# Direction in which each attribute lowers risk. Every score is monotone in
+# every attribute, so a remedy only ever moves attributes this way
+SAFE_DIRECTION = {
+    'capabilities': -1,
+    'autonomy_level': -1,
+    'ethical_alignment': 1,
+    'learning_rate': -1,
+    'resource_access': -1,
+    'self_modification': -1,
+    'transparency': 1,
+    'human_oversight': 1,
+    'value_alignment': 1,
+}
+
+# Attribute values at which the analyzers' risk multipliers switch on or off;
+# between them (and away from the 0/100 clamps) scores are linear
+BREAKPOINTS = {
+    'capabilities': (80,),
+    'autonomy_level': (70,),
+    'ethical_alignment': (30, 40, 50),
+    'resource_access': (80,),
+    'self_modification': (60, 70),
+    'transparency': (70,),
+    'human_oversight': (30,),
+}
+
+# Sub-score values at which overall risk has a kink: its multiplier needs
+# every sub-score above 80, and each sub-score is clamped at 100
+SCORE_KINKS = (80, 100)
+
+
+_DIRECTIONS = np.array([SAFE_DIRECTION[attr] for attr in ATTRIBUTES])
+
+Target = Union[str, float, int]
+
+
+class RemediationSolver:
+    """Suggests a low-cost change to chosen attributes that meets a risk target.
+
+    Cost is the total change in attribute points, optionally weighted per
+    attribute. Overall risk is monotone and piecewise linear in each
+    attribute, with kinks where an analyzer multiplier switches
+    (``BREAKPOINTS``) or a sub-score crosses one of ``SCORE_KINKS``.
+    Within one linear piece a cheapest remedy moves at most one attribute
+    part way and leaves the others at their current value or at the edge
+    of the piece. So the solver tries, in vectorized passes, combinations
+    of the other attributes at their current value, a breakpoint or their
+    limit, and of one other attribute at a sub-score kink, and finds the
+    change still needed along the remaining attribute by bisection.
+    Combinations that already cost more than the best remedy so far are
+    dropped before scoring.
+
+    The suggestion is the cheapest of these candidates, which is not
+    always the cheapest remedy: a sub-score kink moves when several
+    attributes change at once, and a remedy that sits on such a moved kink
+    can be missed by a step or so of cost. So the output calls it
+    ``suggested_changes``, and callers should not treat it as optimal.
+    """
+
+    def __init__(self, scorer: BatchScorer = None, resolution: float = 0.1):
+        """Configure the solver.
+
+        Args:
+            scorer: Batch scorer whose analyzers define the risk (a default one
+                is built if omitted)
+            resolution: Granularity of proposed changes, in attribute points
+        """
+        if resolution <= 0:
+            raise ValueError(f"resolution must be positive, got {resolution}")
+        self.scorer = scorer or BatchScorer()
+        self.resolution = resolution
+
+    def risk_bound(self, target: Target) -> Tuple[float, Optional[str]]:
+        """Overall risk that must be undercut to meet ``target``.
+
+        A threat level (``LOW``, ``MODERATE`` or ``HIGH``) is met below the
+        threshold of the next level up; a number is a maximum overall risk
+        to get below.
+
+        Returns:
+            (bound, threat level or None)
+        """
+        if isinstance(target, str):
+            level = target.strip().upper()
+            if level in THREAT_LEVELS:
+                if level == THREAT_LEVELS[-1]:
+                    raise ValueError(f"Every system is at most {level}; choose a lower target")
+                config = self.scorer.judgment_calculator.config
+                thresholds = (config['moderate_threshold'], config['high_threshold'], config['critical_threshold'])
+                return float(thresholds[THREAT_LEVELS.index(level)]), level
+            try:
+                target = float(target)
+            except ValueError:
+                raise ValueError(f"Unknown target '{target}' (use one of {', '.join(THREAT_LEVELS[:-1])} "
+                                 f"or a maximum overall risk)")
+        if not 0 < target <= 100:
+            raise ValueError(f"Target overall risk must be between 0 and 100, got {target}")
+        return float(target), None
+
+    def sub_scores(self, values: np.ndarray) -> np.ndarray:
+        """Aggression, autonomy and ethical risk scores of attribute rows ``values``, shape (n, 3)."""
+        columns = {attr: values[:, i] for i, attr in enumerate(ATTRIBUTES)}
+        return np.stack([
+            self.scorer.aggression_scorer.calculate_batch(columns),
+            self.scorer.autonomy_rater.calculate_batch(columns),
+            self.scorer.ethical_evaluator.calculate_batch(columns),
+        ], axis=1)
+
+    def overall_risk(self, values: np.ndarray) -> np.ndarray:
+        """Overall risk of attribute rows ``values`` (shape (n, 9), ``ATTRIBUTES`` order)."""
+        scores = self.sub_scores(values)
+        return self.scorer.judgment_calculator.overall_risk_batch(scores[:, 0], scores[:, 1], scores[:, 2])
+
+    def _threat_level(self, overall: float) -> str:
+        _, code = self.scorer.judgment_calculator.years_batch(np.array([overall]))
+        return THREAT_LEVELS[int(code[0])]
+
+    def _levels(self, attr: str, current: float, limit: float) -> List[float]:
+        """Values worth trying for an attribute that is not the one solved for."""
+        direction = SAFE_DIRECTION[attr]
+        levels = [current, limit]
+        for point in BREAKPOINTS.get(attr, ()):
+            # The multipliers test strict inequalities, so try both sides
+            for value in (point, point + direction * self.resolution):
+                if 0 < (value - current) * direction < (limit - current) * direction:
+                    levels.append(value)
+        return sorted(set(levels), key=lambda value: (value - current) * direction)
+
+    def _first_move(self, rows: np.ndarray, free: np.ndarray, limits: np.ndarray, passes) -> np.ndarray:
+        """Smallest move of attribute ``free[i]`` in row ``i`` after which ``passes`` holds.
+
+        ``passes(values)`` tells which attribute rows pass; it must stay
+        true once a move makes it true.
+
+        Returns:
+            Moves, in attribute points toward safety (NaN where even the
+            limit does not pass)
+        """
+        n = len(rows)
+        direction = _DIRECTIONS[free]
+        start = rows[np.arange(n), free]
+        span = (limits - start) * direction
+
+        trial = rows.copy()
+        trial[np.arange(n), free] = limits
+        reachable = passes(trial)
+        low = np.zeros(n)
+        high = np.where(reachable, span, np.nan)
+
+        active = reachable & ~passes(rows)
+        high[reachable & ~active] = 0.0
+        left = np.flatnonzero(active)
+        # Enough halvings of the 0-100 range to land well within the resolution
+        for _ in range(math.ceil(math.log2(100 / self.resolution)) + 6):
+            if not len(left):
+                break
+            mid = (low[left] + high[left]) / 2
+            trial = rows[left].copy()
+            trial[np.arange(len(left)), free[left]] = start[left] + direction[left] * mid
+            below = passes(trial)
+            high[left[below]] = mid[below]
+            low[left[~below]] = mid[~below]
+        return high
+
+    def _solve_along(self, rows: np.ndarray, free: np.ndarray, limits: np.ndarray, bound: float) -> np.ndarray:
+        """Smallest move of attribute ``free[i]`` in row ``i`` that gets below ``bound``.
+
+        Returns:
+            Moves, in attribute points toward safety (NaN where even the
+            limit is not enough)
+        """
+        return self._first_move(rows, free, limits, lambda values: self.overall_risk(values) < bound)
+
+    def _score_kinks(self, x: np.ndarray, names: List[str], limits: Dict[str, float]) -> Dict[str, List[float]]:
+        """Values of each control around which a sub-score crosses one of ``SCORE_KINKS``.
+
+        Crossings are taken with the other attributes unchanged and rounded
+        both ways to the resolution: the multiplier switches off at
+        exactly 80, so the lower value can be the one that counts. Moving
+        toward safety only lowers scores, so only kinks a score is at or
+        above now can be crossed, and the 80 kink only matters while the
+        multiplier applies.
+        """
+        columns = np.array([ATTRIBUTES.index(attr) for attr in names])
+        control_limits = np.array([limits[attr] for attr in names])
+        rows = np.tile(x, (len(names), 1))
+        current = self.sub_scores(x[None, :])[0]
+        kinks = {attr: [] for attr in names}
+        for score in range(3):
+            for kink in SCORE_KINKS:
+                if current[score] < kink or kink < 100 and not (current > kink).all():
+                    continue
+                moves = self._first_move(rows, columns, control_limits,
+                                         lambda values: self.sub_scores(values)[:, score] < kink)
+                for attr, column, move in zip(names, columns, moves):
+                    if np.isnan(move) or move <= 0:
+                        continue
+                    span = abs(limits[attr] - x[column])
+                    for steps in (math.floor(move / self.resolution + 1e-9),
+                                  math.ceil(move / self.resolution - 1e-9)):
+                        if 0 < steps * self.resolution < span:
+                            kinks[attr].append(x[column] + SAFE_DIRECTION[attr] * steps * self.resolution)
+        return {attr: sorted(set(values)) for attr, values in kinks.items()}
+
+    def solve(self, system: AISystem, target: Target,
+              controls: Union[Iterable[str], Dict[str, Optional[float]]],
+              costs: Dict[str, float] = None) -> Dict[str, Any]:
+        """Suggest a low-cost change to ``controls`` that brings ``system`` below ``target``.
+
+        Args:
+            system: The AI system to remediate
+            target: Threat level to get down to, or a maximum overall risk
+            controls: Attributes that may change; a mapping may give the
+                furthest value each may reach (None: 0 or 100)
+            costs: Cost per point of change for each control (default 1)
+
+        Returns:
+            Dictionary with the ``target``, the ``current`` and resulting
+            (``result``) risk, whether the target is ``feasible``, the
+            ``suggested_changes`` and their ``cost``, and for comparison the
+            change needed with each control on its own (``single_attribute``)
+        """
+        bound, level = self.risk_bound(target)
+        if not isinstance(controls, dict):
+            controls = dict.fromkeys(controls)
+        if not controls:
+            raise ValueError("Choose at least one attribute to change")
+        costs = costs or {}
+
+        x = np.array([float(getattr(system, attr)) for attr in ATTRIBUTES])
+        limits = {}
+        for attr, limit in controls.items():
+            if attr not in SAFE_DIRECTION:
+                raise ValueError(f"Unknown attribute '{attr}' (choose from {', '.join(ATTRIBUTES)})")
+            direction = SAFE_DIRECTION[attr]
+            current = x[ATTRIBUTES.index(attr)]
+            if limit is None:
+                limit = 100.0 if direction > 0 else 0.0
+            if not 0 <= limit <= 100:
+                raise ValueError(f"Limit for {attr} must be between 0 and 100, got {limit}")
+            # A limit on the risky side of the current value allows no change
+            limits[attr] = float(limit) if (limit - current) * direction > 0 else current
+            if costs.get(attr, 1.0) <= 0:
+                raise ValueError(f"Cost for {attr} must be positive, got {costs[attr]}")
+        names = list(limits)
+        weights = np.array([float(costs.get(attr, 1.0)) for attr in names])
+
+        current = float(self.overall_risk(x[None, :])[0])
+        answer = {
+            'name': system.name,
+            'target': {'threat_level': level, 'overall_risk_below': bound},
+            'current': {'overall_risk': round(current, 2), 'threat_level': self._threat_level(current)},
+        }
+
+        if current < bound:
+            answer.update(feasible=True, changes={}, cost=0.0, result=dict(answer['current']),
+                          single_attribute={attr: {'to': float(x[ATTRIBUTES.index(attr)]), 'change': 0.0}
+                                            for attr in names})
+            return answer
+
+        # Each control on its own: exact, and an upper bound for combinations
+        single = {}
+        best = None
+        for attr in names:
+            index = ATTRIBUTES.index(attr)
+            move = self._solve_along(x[None, :], np.array([index]), np.array([limits[attr]]), bound)[0]
+            change = None if np.isnan(move) else self._verify(x, {}, attr, move, limits[attr], bound)
+            single[attr] = None
+            if change is not None:
+                move = change[attr]
+                single[attr] = {'to': round(float(x[index] + SAFE_DIRECTION[attr] * move), 4),
+                                'change': round(float(SAFE_DIRECTION[attr] * move), 4)}
+                best = self._cheapest(best, change, weights, names)
+
+        # Combinations: a coarse pass (other controls unchanged or at their
+        # limit) tightens the bound the full pass then prunes with; a last
+        # pass puts one other control at a sub-score kink
+        if len(names) > 1:
+            unchanged = [[x[ATTRIBUTES.index(attr)]] for attr in names]
+            coarse = [[x[ATTRIBUTES.index(attr)], limits[attr]] for attr in names]
+            full = [self._levels(attr, x[ATTRIBUTES.index(attr)], limits[attr]) for attr in names]
+            kinks = self._score_kinks(x, names, limits)
+            kinked = [unchanged[:i] + [kinks[attr]] + unchanged[i + 1:]
+                      for i, attr in enumerate(names) if kinks[attr]]
+            for grids in ([coarse], [full], kinked):
+                best = self._search(x, names, limits, weights, bound, best, grids)
+
+        answer['feasible'] = best is not None
+        answer['suggested_changes'] = {}
+        answer['cost'] = 0.0
+        result = current
+        if best is not None:
+            values = x.copy()
+            for attr, move in best[1].items():
+                index = ATTRIBUTES.index(attr)
+                values[index] = x[index] + SAFE_DIRECTION[attr] * move
+                answer['suggested_changes'][attr] = {'from': float(x[index]), 'to': round(float(values[index]), 4),
+                                           'change': round(float(values[index] - x[index]), 4)}
+            answer['cost'] = round(best[0], 4)
+            result = float(self.overall_risk(values[None, :])[0])
+        answer['result'] = {'overall_risk': round(result, 2), 'threat_level': self._threat_level(result)}
+        answer['single_attribute'] = single
+        return answer
+
+    def _search(self, x: np.ndarray, names: List[str], limits: Dict[str, float], weights: np.ndarray,
+                bound: float, best, grids: List[List[List[float]]], batch_size: int = 4096):
+        """Try every control as the free one, with the others at candidate levels.
+
+        Each of ``grids`` lists the levels of every control; the
+        candidates are every combination of them for the controls other
+        than the free one. Candidates are solved cheapest fixed part
+        first, in batches, so once a remedy is found the rest can be
+        dropped by cost alone.
+
+        Returns:
+            The cheaper of ``best`` and the best remedy found, as (cost, moves)
+        """
+        columns = np.array([ATTRIBUTES.index(attr) for attr in names])
+        control_limits = np.array([limits[attr] for attr in names])
+        combos, positions, fixed = [], [], []
+        for position in range(len(names)):
+            for levels_of in grids:
+                # Grow the grid one control at a time, dropping combinations
+                # that already cost more than the best remedy
+                grid = x[columns][None, :]
+                cost = np.zeros(1)
+                for other, column in enumerate(columns):
+                    if other == position:
+                        continue
+                    levels = np.array(levels_of[other])
+                    grid = np.repeat(grid, len(levels), axis=0)
+                    grid[:, other] = np.tile(levels, len(grid) // len(levels))
+                    cost = (cost[:, None] + np.abs(levels - x[column]) * weights[other]).ravel()
+                    if best is not None:
+                        grid, cost = grid[cost < best[0]], cost[cost < best[0]]
+                combos.append(grid)
+                positions.append(np.full(len(grid), position))
+                fixed.append(cost)
+        if not combos:
+            return best
+        combos, positions, fixed = np.concatenate(combos), np.concatenate(positions), np.concatenate(fixed)
+
+        # Combinations that change nothing else were solved on their own
+        order = np.flatnonzero(fixed > 0)
+        order = order[np.argsort(fixed[order], kind='stable')]
+        combos, positions, fixed = combos[order], positions[order], fixed[order]
+        rows = np.tile(x, (len(combos), 1))
+        rows[:, columns] = combos
+        free = columns[positions]
+        free_limits = control_limits[positions]
+        free_weights = weights[positions]
+
+        for start in range(0, len(rows), batch_size):
+            stop = start + batch_size
+            if best is not None:
+                # Sorted by fixed cost, so nothing further can be cheaper
+                stop = min(stop, int(np.searchsorted(fixed, best[0])))
+                if stop <= start:
+                    break
+            moves = self._solve_along(rows[start:stop], free[start:stop], free_limits[start:stop], bound)
+            total = fixed[start:stop] + np.nan_to_num(moves, nan=np.inf) * free_weights[start:stop]
+            # Rounding can reorder near-ties, so check the few cheapest
+            for i in np.argsort(total)[:8]:
+                if not np.isfinite(total[i]) or (best is not None and total[i] >= best[0]):
+                    break
+                row = start + i
+                attr = ATTRIBUTES[free[row]]
+                fixed_moves = {other: abs(rows[row, column] - x[column])
+                               for other, column in zip(names, columns) if other != attr}
+                change = self._verify(x, fixed_moves, attr, moves[i], limits[attr], bound)
+                if change is not None:
+                    best = self._cheapest(best, change, weights, names)
+        return best
+
+    def _verify(self, x: np.ndarray, fixed: Dict[str, float], attr: str, move: float,
+                limit: float, bound: float) -> Optional[Dict[str, float]]:
+        """Round the solved move to the resolution and check the remedy really works.
+
+        Bisection only brackets the move, so the step at or below it is
+        tried first: a multiplier that switches off at exactly a value
+        makes the lower step enough. Where one switches off only strictly
+        past a breakpoint, the bisection lands exactly on it and a step
+        more clears it.
+        """
+        index = ATTRIBUTES.index(attr)
+        span = abs(limit - x[index])
+        move = min(span, math.floor(move / self.resolution + 1e-9) * self.resolution)
+        values = x.copy()
+        for other, other_move in fixed.items():
+            values[ATTRIBUTES.index(other)] += SAFE_DIRECTION[other] * other_move
+        for _ in range(4):
+            values[index] = x[index] + SAFE_DIRECTION[attr] * move
+            if self.overall_risk(values[None, :])[0] < bound:
+                change = {name: other_move for name, other_move in fixed.items() if other_move > 0}
+                if move > 0:
+                    change[attr] = move
+                return change
+            if move >= span:
+                return None
+            move = min(span, move + self.resolution)
+        return None
+
+    @staticmethod
+    def _cheapest(best, change: Dict[str, float], weights: np.ndarray, names: List[str]):
+        """The cheaper of the best remedy so far and ``change``."""
+        cost = float(sum(move * weights[names.index(attr)] for attr, move in change.items()))
+        if best is None or cost < best[0] - 1e-9:
+            return (cost, change)
+        return best
@@ -0,0 +1,252 @@
+"""Incremental risk monitoring over a stream of attribute updates."""
+
+import time
+import numpy as np
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional
+from src.models.ai_system import ATTRIBUTES
+from src.models.fleet import DEFAULTS
+from src.analyzer.batch_scorer import BatchScorer, RISK_LEVELS, RISK_LEVEL_BOUNDS
+from src.analyzer.fleet_stats import FleetStats
+from src.analyzer.judgment_day_calculator import THREAT_LEVELS
+
+
+_ATTRIBUTE_INDEX = {attr: i for i, attr in enumerate(ATTRIBUTES)}
+
+
+class _SystemState:
+    """Latest attributes and alerting state of one monitored system."""
+
+    __slots__ = ('values', 'levels', 'pending', 'pending_count', 'last_seen')
+
+    def __init__(self, values: List[float], now: float):
+        self.values = values
+        # Current, pending and pending-count per alert kind (risk, threat)
+        self.levels = [None, None]
+        self.pending = [None, None]
+        self.pending_count = [0, 0]
+        self.last_seen = now
+
+
+class RiskMonitor:
+    """Keeps per-system state in memory and rescores systems as updates arrive.
+
+    Updates are applied in micro-batches and every updated row is rescored
+    through the analyzers' vectorized paths. Alerts are emitted only when a
+    system's overall risk level or threat level changes:
+
+    * hysteresis: a level is left only once the score is ``hysteresis``
+      points past the boundary, so scores hovering on a boundary stay quiet
+    * debounce: the new level must be seen on ``debounce`` consecutive
+      updates of that system before it is reported
+
+    Systems not updated for ``idle_timeout`` seconds are evicted, and at
+    most ``max_systems`` are kept (least recently updated go first).
+    """
+
+    KINDS = ('risk_level', 'threat_level')
+
+    def __init__(self, scorer: BatchScorer = None, hysteresis: float = 2.0, debounce: int = 1,
+                 idle_timeout: float = 3600.0, max_systems: int = 1_000_000,
+                 emit_initial: bool = False, fleet_stats: FleetStats = None):
+        """Configure the monitor.
+
+        Args:
+            scorer: Batch scorer to use (a default one is built if omitted)
+            hysteresis: Score margin past a boundary needed to change level
+            debounce: Consecutive updates a new level must persist for
+            idle_timeout: Seconds without updates before a system is evicted
+            max_systems: Maximum number of systems kept in memory
+            emit_initial: Also alert on the first level seen for a system
+            fleet_stats: Aggregate to add the scores of every valid update to
+                (one row per update, so a system updated often counts often)
+        """
+        if debounce < 1:
+            raise ValueError(f"debounce must be at least 1, got {debounce}")
+        self.scorer = scorer or BatchScorer()
+        self.hysteresis = hysteresis
+        self.debounce = debounce
+        self.idle_timeout = idle_timeout
+        self.max_systems = max_systems
+        self.emit_initial = emit_initial
+        self.fleet_stats = fleet_stats
+
+        config = self.scorer.judgment_calculator.config
+        # (boundaries, inclusive) per alert kind: risk levels are "<= bound",
+        # threat levels are ">= threshold"
+        self._bounds = (
+            (RISK_LEVEL_BOUNDS, False),
+            (np.array([config['moderate_threshold'], config['high_threshold'],
+                       config['critical_threshold']]), True),
+        )
+        self._labels = (RISK_LEVELS, THREAT_LEVELS)
+
+        self.systems: 'OrderedDict[str, _SystemState]' = OrderedDict()
+        self.stats = {'updates': 0, 'invalid': 0, 'alerts': 0, 'evicted': 0}
+
+    @staticmethod
+    def _codes(scores: np.ndarray, bounds: np.ndarray, inclusive: bool) -> np.ndarray:
+        """Level code of each score for the given boundaries."""
+        side = 'right' if inclusive else 'left'
+        return np.searchsorted(bounds, scores, side=side)
+
+    def _apply(self, update: Dict[str, Any], now: float) -> Optional[List[float]]:
+        """Merge one update into its system's state; return the new attributes."""
+        name = update.get('name')
+        if name is None:
+            return None
+
+        state = self.systems.get(name)
+        try:
+            if state is None:
+                values = [float(update.get(attr, DEFAULTS.get(attr))) for attr in ATTRIBUTES]
+                if not all(0 <= value <= 100 for value in values):
+                    return None
+            else:
+                # Only the fields present in the update need checking
+                values = state.values.copy()
+                for key, value in update.items():
+                    index = _ATTRIBUTE_INDEX.get(key)
+                    if index is not None:
+                        value = float(value)
+                        if not 0 <= value <= 100:
+                            return None
+                        values[index] = value
+        except (TypeError, ValueError):
+            return None
+
+        if state is None:
+            state = self.systems[name] = _SystemState(values, now)
+        else:
+            state.values = values
+            state.last_seen = now
+            self.systems.move_to_end(name)
+        return values
+
+    def process(self, updates: Iterable[Dict[str, Any]], now: float = None) -> List[Dict[str, Any]]:
+        """Apply a batch of updates and return the alerts they trigger.
+
+        Updates are dictionaries with a ``name`` and any subset of the nine
+        attributes; a system's first update must include the attributes
+        that have no default. Invalid updates are counted and skipped.
+
+        Args:
+            updates: Attribute updates in arrival order
+            now: Monotonic time of the batch (defaults to ``time.monotonic()``)
+
+        Returns:
+            Alert events in update order
+        """
+        if now is None:
+            now = time.monotonic()
+
+        names = []
+        rows = []
+        timestamps = []
+        for update in updates:
+            self.stats['updates'] += 1
+            values = self._apply(update, now) if isinstance(update, dict) else None
+            if values is None:
+                self.stats['invalid'] += 1
+                continue
+            names.append(update['name'])
+            rows.append(values)
+            timestamps.append(update.get('timestamp'))
+
+        alerts = []
+        if rows:
+            matrix = np.array(rows)
+            columns = {attr: matrix[:, i] for i, attr in enumerate(ATTRIBUTES)}
+            aggression = self.scorer.aggression_scorer.calculate_batch(columns)
+            autonomy = self.scorer.autonomy_rater.calculate_batch(columns)
+            ethical_risk = self.scorer.ethical_evaluator.calculate_batch(columns)
+            overall = self.scorer.judgment_calculator.overall_risk_batch(aggression, autonomy, ethical_risk)
+            if self.fleet_stats is not None:
+                threat_bounds, inclusive = self._bounds[1]
+                self.fleet_stats.update({
+                    'aggression_score': aggression,
+                    'autonomy_rating': autonomy,
+                    'ethical_risk': ethical_risk,
+                    'overall_risk': overall,
+                    'threat_code': self._codes(overall, threat_bounds, inclusive),
+                })
+
+            # Level each row would move up to / down to, hysteresis applied
+            moves = [
+                (self._codes(overall - self.hysteresis, bounds, inclusive).tolist(),
+                 self._codes(overall + self.hysteresis, bounds, inclusive).tolist(),
+                 self._codes(overall, bounds, inclusive).tolist())
+                for bounds, inclusive in self._bounds
+            ]
+            overall = overall.tolist()
+
+            for row, name in enumerate(names):
+                state = self.systems.get(name)
+                if state is None:
+                    continue
+                for kind, (up, down, exact) in enumerate(moves):
+                    current = state.levels[kind]
+                    if current is not None and up[row] <= current <= down[row] and state.pending[kind] is None:
+                        continue
+                    alert = self._observe(state, kind, up[row], down[row], exact[row])
+                    if alert is not None:
+                        alert.update(name=name, overall_risk=round(overall[row], 2),
+                                     timestamp=timestamps[row])
+                        alerts.append(alert)
+
+        self.stats['alerts'] += len(alerts)
+        self.evict(now)
+        return alerts
+
+    def _observe(self, state: _SystemState, kind: int, up: int, down: int,
+                 exact: int) -> Optional[Dict[str, Any]]:
+        """Advance one system's level state; return an alert on a confirmed change."""
+        current = state.levels[kind]
+        labels = self._labels[kind]
+
+        if current is None:
+            state.levels[kind] = exact
+            if not self.emit_initial:
+                return None
+            return {'event': 'initial', 'kind': self.KINDS[kind],
+                    'from': None, 'to': labels[exact], 'direction': None}
+
+        if up > current:
+            candidate = up
+        elif down < current:
+            candidate = down
+        else:
+            state.pending[kind] = None
+            state.pending_count[kind] = 0
+            return None
+
+        if candidate == state.pending[kind]:
+            state.pending_count[kind] += 1
+        else:
+            state.pending[kind] = candidate
+            state.pending_count[kind] = 1
+        if state.pending_count[kind] < self.debounce:
+            return None
+
+        state.levels[kind] = candidate
+        state.pending[kind] = None
+        state.pending_count[kind] = 0
+        return {'event': 'threshold_crossed', 'kind': self.KINDS[kind],
+                'from': labels[current], 'to': labels[candidate],
+                'direction': 'up' if candidate > current else 'down'}
+
+    def evict(self, now: float = None) -> int:
+        """Drop idle systems and enforce ``max_systems``; return how many were dropped."""
+        if now is None:
+            now = time.monotonic()
+        evicted = 0
+        # Least recently updated systems are at the front
+        while self.systems:
+            name, state = next(iter(self.systems.items()))
+            if len(self.systems) > self.max_systems or now - state.last_seen > self.idle_timeout:
+                del self.systems[name]
+                evicted += 1
+            else:
+                break
+        self.stats['evicted'] += evicted
+        return evicted
@@ -0,0 +1,417 @@
+"""Sharded fleet scoring: a coordinator hands chunks to worker processes over sockets.
+
+Workers connect to the coordinator over TCP or a Unix socket and score
+one chunk at a time. A chunk is a block of JSON Lines, sent as-is, and
+the worker returns the chunk's JSONL results plus per-threat-level
+counts and the chunk's mergeable ``FleetStats``. Parsing, scoring and
+serialization all happen on the workers, so the coordinator only splits
+and concatenates bytes and does not become the bottleneck.
+
+Messages are a 4-byte length, a JSON header, and the raw bytes of the
+arrays the header lists. Nothing is pickled, but the protocol is not
+authenticated: listen on localhost or a Unix socket only.
+"""
+
+import json
+import os
+import socket
+import struct
+import subprocess
+import sys
+import threading
+import time
+import numpy as np
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from src.models.fleet import Fleet, iter_json_lines, iter_records
+from src.analyzer.batch_scorer import BatchScorer
+from src.analyzer.fleet_stats import FleetStats
+from src.analyzer.judgment_day_calculator import AsOf, THREAT_LEVELS, parse_as_of
+
+
+_LENGTH = struct.Struct('!I')
+
+# Headers are small; anything bigger is a protocol error
+MAX_HEADER_SIZE = 1 << 20
+
+
+def parse_address(address: str) -> Tuple[int, Any]:
+    """Socket family and address for ``host:port``, ``tcp://host:port`` or ``unix:/path``."""
+    if address.startswith('unix:'):
+        return socket.AF_UNIX, address[len('unix:'):]
+    if address.startswith('tcp://'):
+        address = address[len('tcp://'):]
+    host, sep, port = address.rpartition(':')
+    if not sep or not port.isdigit():
+        raise ValueError(f"Invalid address '{address}' (expected host:port or unix:/path)")
+    return socket.AF_INET, (host or '127.0.0.1', int(port))
+
+
+def format_address(family: int, address: Any) -> str:
+    if family == socket.AF_UNIX:
+        return f"unix:{address}"
+    return f"{address[0]}:{address[1]}"
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytearray:
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        count = sock.recv_into(view[received:], size - received)
+        if count == 0:
+            raise ConnectionError("Connection closed by peer")
+        received += count
+    return buffer
+
+
+def send_message(sock: socket.socket, header: Dict[str, Any], arrays: Sequence[np.ndarray] = ()):
+    """Send a JSON header followed by the raw bytes of ``arrays``."""
+    arrays = [np.ascontiguousarray(array) for array in arrays]
+    header = dict(header, arrays=[[array.dtype.str, len(array)] for array in arrays])
+    data = json.dumps(header).encode('utf-8')
+    sock.sendall(_LENGTH.pack(len(data)) + data)
+    for array in arrays:
+        sock.sendall(memoryview(array).cast('B'))
+
+
+def recv_message(sock: socket.socket) -> Tuple[Dict[str, Any], List[np.ndarray]]:
+    """Receive one message sent with :func:`send_message`."""
+    (size,) = _LENGTH.unpack(_recv_exact(sock, _LENGTH.size))
+    if size > MAX_HEADER_SIZE:
+        raise ConnectionError(f"Message header too large ({size} bytes)")
+    try:
+        header = json.loads(_recv_exact(sock, size))
+        layout = [(np.dtype(dtype), int(length)) for dtype, length in header.pop('arrays')]
+    except (ValueError, TypeError, KeyError):
+        raise ConnectionError("Malformed message header")
+    arrays = [np.frombuffer(_recv_exact(sock, dtype.itemsize * length), dtype=dtype)
+              for dtype, length in layout]
+    return header, arrays
+
+
+def iter_line_blocks(path: str, chunk_size: int = 50000) -> Iterator[bytes]:
+    """Split a fleet file into JSONL blocks of at most ``chunk_size`` systems.
+
+    JSONL input (a ``.jsonl``/``.ndjson`` file or ``-`` for stdin) is split
+    without being parsed. Other formats are read with ``iter_records`` and
+    re-encoded as JSON Lines.
+    """
+    def blocks(lines: Iterable[bytes]) -> Iterator[bytes]:
+        block = []
+        for line in lines:
+            if line.strip():
+                block.append(line if line.endswith(b'\n') else line + b'\n')
+                if len(block) >= chunk_size:
+                    yield b''.join(block)
+                    block = []
+        if block:
+            yield b''.join(block)
+
+    if path == '-':
+        yield from blocks(sys.stdin.buffer)
+    elif Path(path).suffix.lower() in ('.jsonl', '.ndjson'):
+        with open(path, 'rb') as f:
+            yield from blocks(f)
+    else:
+        yield from blocks(json.dumps(record).encode('utf-8') for record in iter_records(path))
+
+
+def score_block(scorer: BatchScorer, block: bytes, as_of: AsOf = None,
+                stats: FleetStats = None) -> Tuple[bytes, np.ndarray]:
+    """Score one JSONL block into (JSONL results, systems per threat level).
+
+    The block's scores are also added to ``stats`` if one is given.
+    """
+    fleet = Fleet.from_records(iter_json_lines(block.decode('utf-8').splitlines()))
+    scores = scorer.score(fleet, as_of=as_of)
+    if stats is not None:
+        stats.update(scores)
+    output = ''.join(json.dumps(record) + '\n' for record in scorer.records(fleet, scores))
+    counts = np.bincount(scores['threat_code'], minlength=len(THREAT_LEVELS)).astype(np.int64)
+    return output.encode('utf-8'), counts
+
+
+def _connect(address: str, timeout: float) -> socket.socket:
+    """Connect to ``address``, retrying until it accepts or ``timeout`` passes."""
+    family, target = parse_address(address)
+    deadline = time.monotonic() + timeout
+    while True:
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        try:
+            sock.connect(target)
+            return sock
+        except OSError:
+            sock.close()
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.1)
+
+
+def run_worker(address: str, config_path: str = None, connect_timeout: float = 30.0) -> int:
+    """Score chunks for the coordinator at ``address`` until it says to stop.
+
+    Args:
+        address: Coordinator address (``host:port`` or ``unix:/path``)
+        config_path: Scoring config (must match the coordinator's)
+        connect_timeout: Seconds to keep retrying the initial connection
+
+    Returns:
+        Number of chunks scored
+    """
+    scorer = BatchScorer(config_path)
+    scored = 0
+    with _connect(address, connect_timeout) as sock:
+        send_message(sock, {'type': 'hello', 'pid': os.getpid()})
+        while True:
+            try:
+                header, arrays = recv_message(sock)
+            except ConnectionError:
+                break
+            if header.get('type') != 'task' or len(arrays) != 1:
+                break
+            stats = FleetStats()
+            try:
+                output, counts = score_block(scorer, arrays[0].tobytes(), as_of=header.get('as_of'), stats=stats)
+            except Exception as e:
+                # Bad input fails the whole run, as it would in-process; the
+                # worker stays up so the chunk is not handed to the next one
+                send_message(sock, {'type': 'error', 'chunk': header['chunk'], 'message': str(e)})
+                continue
+            send_message(sock, {'type': 'result', 'chunk': header['chunk'], 'stats': stats.to_state()},
+                         [np.frombuffer(output, dtype=np.uint8), counts])
+            scored += 1
+    return scored
+
+
+class ShardCoordinator:
+    """Hands fleet chunks to connected workers and yields results in input order.
+
+    Each worker connection is served by its own thread and has at most one
+    chunk in flight. If a worker disconnects, or sends nothing back for
+    ``task_timeout`` seconds, its chunk goes back to the front of the
+    queue for another worker. At most ``max_pending`` chunks are held in
+    memory, so arbitrarily large files stream through. The workers' chunk
+    statistics are merged into ``fleet_stats`` as results arrive.
+    """
+
+    def __init__(self, address: str = '127.0.0.1:0', config_path: str = None,
+                 task_timeout: float = 300.0, idle_timeout: float = 30.0, max_pending: int = 16):
+        """Configure the coordinator; call ``start()`` to begin listening.
+
+        Args:
+            address: Where to listen (``host:port``, port 0 picks a free
+                one, or ``unix:/path``)
+            config_path: Scoring config (workers must use the same one)
+            task_timeout: Seconds a worker may take on one chunk
+            idle_timeout: Seconds to wait with no workers before giving up
+            max_pending: Chunks read ahead of the oldest unfinished one
+        """
+        self.family, self._target = parse_address(address)
+        self.config_path = config_path
+        self.task_timeout = task_timeout
+        self.idle_timeout = idle_timeout
+        self.max_pending = max(1, max_pending)
+        self.stats = {'chunks': 0, 'redispatched': 0, 'workers_joined': 0, 'workers_lost': 0}
+        self.fleet_stats = FleetStats()
+
+        self.workers = 0
+        self._cond = threading.Condition()
+        self._todo: deque = deque()
+        self._blocks: Dict[int, bytes] = {}
+        self._results: Dict[int, Tuple[bytes, np.ndarray]] = {}
+        self._error: Optional[str] = None
+        self._as_of: Optional[str] = None
+        self._closed = False
+        self._listener = None
+        self._processes: List[subprocess.Popen] = []
+
+    @property
+    def address(self) -> str:
+        """The address workers should connect to (with the real port once started)."""
+        if self._listener is not None:
+            return format_address(self.family, self._listener.getsockname())
+        return format_address(self.family, self._target)
+
+    def start(self) -> 'ShardCoordinator':
+        """Start listening for workers."""
+        if self.family == socket.AF_UNIX and os.path.exists(self._target):
+            os.unlink(self._target)
+        self._listener = socket.socket(self.family, socket.SOCK_STREAM)
+        if self.family == socket.AF_INET:
+            self._listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._listener.bind(self._target)
+        self._listener.listen()
+        threading.Thread(target=self._accept_loop, name='shard-accept', daemon=True).start()
+        return self
+
+    def spawn_local_workers(self, count: int) -> List[subprocess.Popen]:
+        """Start ``count`` worker processes on this machine."""
+        root = str(Path(__file__).resolve().parent.parent.parent)
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [root, os.environ.get('PYTHONPATH')])))
+        command = [sys.executable, '-m', 'src.cli', 'worker', '--connect', self.address]
+        if self.config_path:
+            command += ['--config', str(self.config_path)]
+        processes = [subprocess.Popen(command, env=env) for _ in range(count)]
+        self._processes.extend(processes)
+        return processes
+
+    def _accept_loop(self):
+        while not self._closed:
+            try:
+                conn, _ = self._listener.accept()
+            except OSError:
+                break
+            threading.Thread(target=self._serve, args=(conn,), name='shard-worker', daemon=True).start()
+
+    def _next_task(self) -> Optional[Tuple[int, bytes]]:
+        """Block until there is a chunk to dispatch; None once closed."""
+        with self._cond:
+            while not self._todo and not self._closed:
+                self._cond.wait()
+            if self._closed:
+                return None
+            chunk = self._todo.popleft()
+            return chunk, self._blocks[chunk]
+
+    def _serve(self, conn: socket.socket):
+        """Feed one worker connection until it fails or the run ends."""
+        try:
+            conn.settimeout(self.task_timeout)
+            header, _ = recv_message(conn)
+            if header.get('type') != 'hello':
+                raise ConnectionError("Expected hello")
+        except (OSError, ConnectionError):
+            conn.close()
+            return
+
+        with self._cond:
+            self.workers += 1
+            self.stats['workers_joined'] += 1
+            self._cond.notify_all()
+
+        chunk = None
+        lost = False
+        try:
+            while True:
+                task = self._next_task()
+                if task is None:
+                    break
+                chunk, block = task
+                send_message(conn, {'type': 'task', 'chunk': chunk, 'as_of': self._as_of},
+                             [np.frombuffer(block, dtype=np.uint8)])
+                header, arrays = recv_message(conn)
+                if header.get('chunk') != chunk:
+                    raise ConnectionError("Result for the wrong chunk")
+                with self._cond:
+                    if header.get('type') == 'error':
+                        self._error = f"chunk {chunk}: {header.get('message')}"
+                    elif header.get('type') == 'result' and len(arrays) == 2:
+                        self._results[chunk] = (arrays[0].tobytes(), arrays[1])
+                        if header.get('stats') is not None:
+                            self.fleet_stats.merge(FleetStats.from_state(header['stats']))
+                    else:
+                        raise ConnectionError("Malformed result")
+                    chunk = None
+                    self._cond.notify_all()
+            send_message(conn, {'type': 'shutdown'})
+        except (OSError, ConnectionError):
+            lost = True
+        finally:
+            conn.close()
+            with self._cond:
+                self.workers -= 1
+                if lost:
+                    self.stats['workers_lost'] += 1
+                if chunk is not None:
+                    # Hand the unfinished chunk to the next free worker
+                    self._todo.appendleft(chunk)
+                    self.stats['redispatched'] += 1
+                self._cond.notify_all()
+
+    def score(self, blocks: Iterable[bytes], as_of: AsOf = None) -> Iterator[Tuple[bytes, np.ndarray]]:
+        """Score JSONL blocks on the workers.
+
+        Args:
+            blocks: JSONL chunks, e.g. from :func:`iter_line_blocks`
+            as_of: Reference time for estimated dates (defaults to now,
+                pinned once for the whole run)
+
+        Yields:
+            (JSONL results, systems per threat level) for each block, in
+            input order
+
+        Raises:
+            ValueError: If a worker rejects a block (invalid records)
+            RuntimeError: If no worker is connected for ``idle_timeout``
+                seconds while chunks are waiting
+        """
+        self._as_of = parse_as_of(as_of).isoformat()
+        blocks = iter(blocks)
+        exhausted = False
+        submitted = 0
+        emitted = 0
+        idle_since = None
+
+        while True:
+            # Read ahead up to the window
+            while not exhausted and submitted - emitted < self.max_pending:
+                block = next(blocks, None)
+                if block is None:
+                    exhausted = True
+                    break
+                with self._cond:
+                    self._blocks[submitted] = block
+                    self._todo.append(submitted)
+                    self._cond.notify()
+                submitted += 1
+
+            if exhausted and emitted == submitted:
+                return
+
+            with self._cond:
+                while emitted not in self._results:
+                    if self._error is not None:
+                        raise ValueError(f"Invalid fleet data in {self._error}")
+                    if self.workers == 0:
+                        idle_since = idle_since or time.monotonic()
+                        if time.monotonic() - idle_since > self.idle_timeout:
+                            raise RuntimeError(f"No workers connected for {self.idle_timeout:.0f}s "
+                                               f"({submitted - emitted} chunks waiting)")
+                    else:
+                        idle_since = None
+                    self._cond.wait(0.5)
+                result = self._results.pop(emitted)
+                del self._blocks[emitted]
+
+            self.stats['chunks'] += 1
+            emitted += 1
+            yield result
+
+    def close(self):
+        """Tell workers to stop, stop listening and reap local workers."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._listener is not None:
+            try:
+                # Wakes the accept() blocked in the listener thread
+                self._listener.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._listener.close()
+            if self.family == socket.AF_UNIX and os.path.exists(self._target):
+                os.unlink(self._target)
+        for process in self._processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
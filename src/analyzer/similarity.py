@@ -0,0 +1,331 @@
+"""Nearest-neighbor search over AI systems' risk profiles."""
+
+import threading
+import numpy as np
+from typing import Any, Dict, Iterable, List, Optional, Union
+from src.models.ai_system import AISystem, ATTRIBUTES
+from src.models.fleet import Fleet
+from src.analyzer.batch_scorer import BatchScorer
+
+
+# Scores optionally appended to the nine attributes, all on the same 0-100 scale
+SCORE_FEATURES = ('aggression_score', 'autonomy_rating', 'ethical_risk', 'overall_risk')
+
+# A query target: a registered system's name, an AISystem or a dict like AISystem.to_dict()
+Target = Union[str, AISystem, Dict[str, Any]]
+
+
+def build_leaves(points: np.ndarray, leaf_size: int) -> tuple:
+    """Partition points into KD-tree leaves by recursive median splits.
+
+    Each split halves a node along its widest dimension, so leaves hold
+    between ``leaf_size / 2`` and ``leaf_size`` points and have compact
+    bounding boxes.
+
+    Returns:
+        (order, bounds): ``points[order]`` lists the points leaf by leaf;
+        leaf ``i`` covers positions ``bounds[i]:bounds[i + 1]`` of it
+    """
+    n = len(points)
+    order = np.arange(n)
+    # Column-major working copy, kept in the same order as ``order``, so
+    # each node is a contiguous slice and each split reads one column
+    work = np.array(points, order='F')
+    starts = []
+    stack = [(0, n)]
+    while stack:
+        start, stop = stack.pop()
+        if stop - start <= leaf_size:
+            starts.append(start)
+            continue
+        node = work[start:stop]
+        dim = int(np.argmax(node.max(axis=0) - node.min(axis=0)))
+        mid = (stop - start) // 2
+        split = np.argpartition(node[:, dim], mid)
+        work[start:stop] = node[split]
+        order[start:stop] = order[start:stop][split]
+        # Left half is popped first, so leaves come out in position order
+        stack.append((start + mid, stop))
+        stack.append((start, start + mid))
+    return order, np.array(starts + [n], dtype=np.int64)
+
+
+def _leaf_positions(bounds: np.ndarray, leaves: np.ndarray) -> np.ndarray:
+    """Positions of every point in ``leaves``, as one index array."""
+    starts = bounds[leaves]
+    lengths = bounds[leaves + 1] - starts
+    offsets = np.cumsum(lengths) - lengths
+    return np.repeat(starts - offsets, lengths) + np.arange(int(lengths.sum()))
+
+
+class SimilarityIndex:
+    """Registry of AI systems answering k-nearest and radius queries.
+
+    Systems are points in attribute space (optionally extended with their
+    four scores); distance is Euclidean, in attribute points. Points live
+    in KD-tree leaves with bounding boxes, and a query ranks all leaves by
+    their distance to the target in one vectorized step, then scans only
+    the leaves that can still hold a closer point than those found so far.
+
+    Systems are keyed by name: adding a name again replaces the old entry.
+    New systems go to a small buffer that is scanned linearly and removed
+    ones are masked out, until the buffer and removals together exceed
+    ``rebuild_ratio`` of the tree, at which point the tree is rebuilt.
+    """
+
+    def __init__(self, scorer: BatchScorer = None, with_scores: bool = False,
+                 leaf_size: int = 128, rebuild_ratio: float = 0.1):
+        """Create an empty index.
+
+        Args:
+            scorer: Batch scorer for score features (built if needed and omitted)
+            with_scores: Also compare aggression, autonomy, ethical and
+                overall risk scores
+            leaf_size: Maximum systems per leaf
+            rebuild_ratio: Buffered plus removed systems, as a share of
+                the tree, that trigger a rebuild
+        """
+        if leaf_size < 1:
+            raise ValueError(f"leaf_size must be at least 1, got {leaf_size}")
+        self.with_scores = with_scores
+        self.scorer = scorer if scorer is not None or not with_scores else BatchScorer()
+        self.features = ATTRIBUTES + (SCORE_FEATURES if with_scores else ())
+        self.leaf_size = leaf_size
+        self.rebuild_ratio = rebuild_ratio
+        self.rebuilds = 0
+
+        # Rows [0, tree_size) are stored leaf by leaf; later rows are the buffer
+        self._points = np.empty((0, len(self.features)))
+        self._alive = np.empty(0, dtype=bool)
+        self._names: List[Optional[str]] = []
+        self._rows: Dict[str, int] = {}
+        self._size = 0
+        self._tree_size = 0
+        self._removed = 0
+        self._bounds = np.zeros(1, dtype=np.int64)
+        self._lo = np.empty((0, len(self.features)))
+        self._hi = np.empty((0, len(self.features)))
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._rows
+
+    def feature_matrix(self, fleet: Fleet) -> np.ndarray:
+        """Feature vectors of a fleet, one row per system."""
+        columns = [fleet.columns[attr] for attr in ATTRIBUTES]
+        if self.with_scores:
+            scores = self.scorer.score(fleet, with_dates=False)
+            columns += [scores[feature] for feature in SCORE_FEATURES]
+        return np.column_stack(columns).astype(np.float64) if len(fleet) else np.empty((0, len(self.features)))
+
+    def add_fleet(self, fleet: Fleet):
+        """Add (or replace, by name) every system of a fleet."""
+        points = self.feature_matrix(fleet)
+        with self._lock:
+            n = len(fleet)
+            if self._size + n > len(self._points):
+                capacity = max(self._size + n, 2 * len(self._points), 1024)
+                grown = np.empty((capacity, len(self.features)))
+                grown[:self._size] = self._points[:self._size]
+                alive = np.zeros(capacity, dtype=bool)
+                alive[:self._size] = self._alive[:self._size]
+                self._points, self._alive = grown, alive
+            self._points[self._size:self._size + n] = points
+            self._alive[self._size:self._size + n] = True
+            for row, name in enumerate(fleet.names, self._size):
+                previous = self._rows.get(name)
+                if previous is not None:
+                    self._discard(previous)
+                self._rows[name] = row
+            self._names.extend(fleet.names)
+            self._size += n
+            self._maybe_rebuild()
+
+    def add(self, system: Union[AISystem, Dict[str, Any]]):
+        """Add (or replace, by name) one system."""
+        self.add_fleet(self._as_fleet(system))
+
+    def remove(self, name: str) -> bool:
+        """Remove a system by name; False if it was not registered."""
+        with self._lock:
+            row = self._rows.pop(name, None)
+            if row is None:
+                return False
+            self._discard(row)
+            self._maybe_rebuild()
+            return True
+
+    def _discard(self, row: int):
+        self._alive[row] = False
+        self._names[row] = None
+        if row < self._tree_size:
+            self._removed += 1
+
+    def _maybe_rebuild(self):
+        stale = (self._size - self._tree_size) + self._removed
+        if stale > self.rebuild_ratio * max(self._tree_size, self.leaf_size):
+            self.rebuild()
+
+    def rebuild(self):
+        """Rebuild the tree over every registered system, emptying the buffer."""
+        with self._lock:
+            rows = np.flatnonzero(self._alive[:self._size])
+            order, bounds = build_leaves(self._points[rows], self.leaf_size)
+            rows = rows[order]
+            points = self._points[rows]
+            self._names = [self._names[row] for row in rows]
+            self._rows = {name: row for row, name in enumerate(self._names)}
+            self._points = points
+            self._alive = np.ones(len(rows), dtype=bool)
+            self._size = self._tree_size = len(rows)
+            self._removed = 0
+            self._bounds = bounds
+            if len(rows):
+                self._lo = np.minimum.reduceat(points, bounds[:-1], axis=0)
+                self._hi = np.maximum.reduceat(points, bounds[:-1], axis=0)
+            else:
+                self._lo = self._hi = np.empty((0, len(self.features)))
+            self.rebuilds += 1
+
+    def _as_fleet(self, system: Union[AISystem, Dict[str, Any]]) -> Fleet:
+        if isinstance(system, AISystem):
+            return Fleet.from_systems([system])
+        return Fleet.from_records([system])
+
+    def vector(self, target: Target) -> np.ndarray:
+        """Feature vector of a target (a registered name, AISystem or dict)."""
+        if isinstance(target, str):
+            with self._lock:
+                row = self._rows.get(target)
+                if row is None:
+                    raise KeyError(f"No registered system named '{target}'")
+                return self._points[row].copy()
+        return self.feature_matrix(self._as_fleet(target))[0]
+
+    def _candidates(self, query: np.ndarray, radius2: float = None, k: int = None):
+        """Rows and squared distances of the points a query must consider.
+
+        With ``radius2``, every live point within that squared distance.
+        With ``k``, a superset of the ``k`` nearest live points.
+        """
+        rows = [np.arange(self._tree_size, self._size)]
+        rows[0] = rows[0][self._alive[rows[0]]]
+        buffered = self._points[rows[0]] - query
+        dists = [np.einsum('ij,ij->i', buffered, buffered)]
+
+        if self._tree_size:
+            gap = np.maximum(self._lo - query, 0) + np.maximum(query - self._hi, 0)
+            leaf_dist = np.einsum('ij,ij->i', gap, gap)
+            if radius2 is not None:
+                batches = [np.flatnonzero(leaf_dist <= radius2)]
+            else:
+                batches = None
+                ranked = np.argsort(leaf_dist)
+                sorted_dist = leaf_dist[ranked]
+                # Start from the nearest leaves that hold k points, then scan
+                # every leaf that could still beat the k-th distance found
+                sizes = np.cumsum(np.diff(self._bounds)[ranked])
+                taken = min(len(ranked), int(np.searchsorted(sizes, k)) + 1)
+                batches = [ranked[:taken]]
+
+            while batches:
+                leaves = batches.pop()
+                if not len(leaves):
+                    break
+                positions = _leaf_positions(self._bounds, leaves)
+                positions = positions[self._alive[positions]]
+                diff = self._points[positions] - query
+                rows.append(positions)
+                dists.append(np.einsum('ij,ij->i', diff, diff))
+                if radius2 is None and taken < len(ranked):
+                    found = np.concatenate(dists)
+                    if len(found) >= k:
+                        kth = np.partition(found, k - 1)[k - 1]
+                        end = int(np.searchsorted(sorted_dist, kth, side='right'))
+                    else:
+                        end = min(len(ranked), 2 * taken)
+                    if end > taken:
+                        batches.append(ranked[taken:end])
+                        taken = end
+
+        return np.concatenate(rows), np.concatenate(dists)
+
+    def _results(self, rows: np.ndarray, dists: np.ndarray) -> List[Dict[str, Any]]:
+        # Nearest first; equal distances in row order
+        order = np.lexsort((rows, dists))
+        return [{'name': self._names[rows[i]], 'distance': round(float(np.sqrt(dists[i])), 4)}
+                for i in order]
+
+    def nearest(self, target: Target, k: int = 10) -> List[Dict[str, Any]]:
+        """The ``k`` registered systems closest to ``target``.
+
+        A target given by name is left out of its own results.
+
+        Returns:
+            List of ``{'name', 'distance'}``, nearest first
+        """
+        if k < 1:
+            raise ValueError(f"k must be at least 1, got {k}")
+        query = self.vector(target)
+        with self._lock:
+            exclude = self._rows.get(target) if isinstance(target, str) else None
+            want = k + (exclude is not None)
+            rows, dists = self._candidates(query, k=want)
+            if exclude is not None:
+                keep = rows != exclude
+                rows, dists = rows[keep], dists[keep]
+            if len(rows) > k:
+                # Keep rows tied with the k-th, so ties are broken by row order
+                top = np.flatnonzero(dists <= np.partition(dists, k - 1)[k - 1])
+                rows, dists = rows[top], dists[top]
+            return self._results(rows, dists)[:k]
+
+    def within(self, target: Target, radius: float, limit: int = None) -> List[Dict[str, Any]]:
+        """Registered systems within ``radius`` of ``target``, nearest first.
+
+        Args:
+            target: Registered name (left out of its own results), AISystem or dict
+            radius: Maximum distance, in attribute points
+            limit: Return at most this many systems
+
+        Returns:
+            List of ``{'name', 'distance'}``
+        """
+        if radius < 0:
+            raise ValueError(f"radius must not be negative, got {radius}")
+        query = self.vector(target)
+        with self._lock:
+            rows, dists = self._candidates(query, radius2=radius * radius)
+            keep = dists <= radius * radius
+            if isinstance(target, str):
+                keep &= rows != self._rows.get(target, -1)
+            return self._results(rows[keep], dists[keep])[:limit]
+
+    def stats(self) -> Dict[str, Any]:
+        """Size and shape of the index."""
+        with self._lock:
+            return {
+                'systems': len(self._rows),
+                'features': len(self.features),
+                'tree_systems': self._tree_size - self._removed,
+                'buffered': int(np.count_nonzero(self._alive[self._tree_size:self._size])),
+                'removed': self._removed,
+                'leaves': len(self._bounds) - 1,
+                'rebuilds': self.rebuilds,
+            }
+
+
+def index_fleets(fleets: Iterable[Fleet], scorer: BatchScorer = None, with_scores: bool = False,
+                 leaf_size: int = 128) -> SimilarityIndex:
+    """Build an index over fleet chunks, with one tree build at the end."""
+    index = SimilarityIndex(scorer=scorer, with_scores=with_scores, leaf_size=leaf_size)
+    # Defer rebuilds while loading
+    ratio, index.rebuild_ratio = index.rebuild_ratio, float('inf')
+    for fleet in fleets:
+        index.add_fleet(fleet)
+    index.rebuild_ratio = ratio
+    index.rebuild()
+    return index
@@ -0,0 +1,202 @@
+"""Time-stepped simulation of how fleets evolve toward Judgment Day."""
+
+import yaml
+import numpy as np
+from pathlib import Path
+from typing import Any, Dict, Iterator
+from src.models.ai_system import ATTRIBUTES
+from src.models.fleet import Fleet
+from src.analyzer.batch_scorer import BatchScorer
+from src.analyzer.judgment_day_calculator import AsOf, THREAT_LEVELS, JudgmentDayCalculator, parse_as_of
+
+
+_ATTRIBUTE_INDEX = {attr: i for i, attr in enumerate(ATTRIBUTES)}
+
+# Threat levels whose first crossing is recorded (LOW is the starting point)
+CROSSING_LEVELS = THREAT_LEVELS[1:]
+
+IMMINENT = THREAT_LEVELS.index("IMMINENT")
+
+
+def growth_matrix(rules: Dict[str, Dict[str, float]]) -> np.ndarray:
+    """Build the attribute growth matrix from config rules.
+
+    ``rules[target][driver] = rate`` means ``target`` changes by
+    ``rate * driver / 100`` points per year.
+
+    Returns:
+        (9, 9) array: entry [target, driver] is the rate
+    """
+    matrix = np.zeros((len(ATTRIBUTES), len(ATTRIBUTES)))
+    for target, drivers in (rules or {}).items():
+        if target not in _ATTRIBUTE_INDEX:
+            raise ValueError(f"Unknown attribute '{target}' in simulation rules")
+        for driver, rate in (drivers or {}).items():
+            if driver not in _ATTRIBUTE_INDEX:
+                raise ValueError(f"Unknown driver '{driver}' for '{target}' in simulation rules")
+            matrix[_ATTRIBUTE_INDEX[target], _ATTRIBUTE_INDEX[driver]] = float(rate)
+    return matrix
+
+
+class FleetSimulator:
+    """Steps whole fleets forward in time and records threat-level crossings.
+
+    Every step applies the config's linear growth rules to all attributes
+    at once, rescores the fleet through the analyzers' vectorized paths
+    and notes, per system, when it first reaches each threat level.
+    Crossing times are interpolated within the step. Systems that reach
+    IMMINENT leave the simulation, so later steps only touch the rest.
+    """
+
+    def __init__(self, config_path: str = None, scorer: BatchScorer = None):
+        """Load the simulation rules and the analyzers they are scored with."""
+        if config_path is None:
+            config_path = Path(__file__).parent.parent.parent / "config" / "risk_thresholds.yaml"
+
+        with open(config_path, 'r') as f:
+            config = yaml.safe_load(f)
+            self.config = config.get('simulation') or {}
+
+        self.scorer = scorer or BatchScorer(config_path)
+        self.step_years = float(self.config.get('step_years', 0.25))
+        self.horizon_years = float(self.config.get('horizon_years', 100))
+        self.growth = growth_matrix(self.config.get('rules'))
+
+        judgment = self.scorer.judgment_calculator.config
+        self.thresholds = np.array([judgment['moderate_threshold'], judgment['high_threshold'],
+                                    judgment['critical_threshold']], dtype=np.float64)
+
+    def _overall_risk(self, values: np.ndarray, order) -> np.ndarray:
+        """Overall risk of attribute rows ``values`` (shape (9, n)), rows in ``order``."""
+        columns = {ATTRIBUTES[attr]: row for attr, row in zip(order, values)}
+        return self.scorer.judgment_calculator.overall_risk_batch(
+            self.scorer.aggression_scorer.calculate_batch(columns),
+            self.scorer.autonomy_rater.calculate_batch(columns),
+            self.scorer.ethical_evaluator.calculate_batch(columns),
+        )
+
+    def _threat_codes(self, overall: np.ndarray) -> np.ndarray:
+        return np.searchsorted(self.thresholds, overall, side='right')
+
+    def run(self, fleet: Fleet, horizon_years: float = None, step_years: float = None) -> Dict[str, np.ndarray]:
+        """Simulate a fleet.
+
+        Args:
+            fleet: Starting state of the systems
+            horizon_years: Years to simulate (defaults to the config's)
+            step_years: Years per step (defaults to the config's)
+
+        Returns:
+            Dictionary of arrays: ``initial_risk``, ``final_risk``,
+            ``final_threat_code``, ``steps`` (steps each system was
+            simulated for) and ``<level>_at`` (years until first reaching
+            MODERATE, HIGH and IMMINENT; NaN if not within the horizon)
+        """
+        horizon = self.horizon_years if horizon_years is None else float(horizon_years)
+        step = self.step_years if step_years is None else float(step_years)
+        if step <= 0:
+            raise ValueError(f"step_years must be positive, got {step}")
+
+        n = len(fleet)
+        # Attributes with rules go first, so each step updates one contiguous slice
+        changing = self.growth.any(axis=1)
+        order = np.concatenate([np.flatnonzero(changing), np.flatnonzero(~changing)])
+        k = int(changing.sum())
+        rates = self.growth[order][:k, order] * (step / 100.0)
+
+        values = np.stack([np.asarray(fleet.columns[ATTRIBUTES[attr]], dtype=np.float64) for attr in order])
+        overall = self._overall_risk(values, order)
+        codes = self._threat_codes(overall)
+
+        crossings = np.full((len(CROSSING_LEVELS), n), np.nan)
+        for level in range(len(CROSSING_LEVELS)):
+            crossings[level, codes > level] = 0.0
+        initial_risk = overall.copy()
+        final_risk = overall.copy()
+        final_codes = codes.copy()
+        steps = np.zeros(n, dtype=np.int64)
+
+        # Simulate only systems not yet IMMINENT; those that get there are
+        # dropped from the arrays in the step they arrive
+        active = np.flatnonzero(codes < IMMINENT)
+        values = values[:, active]
+        overall = overall[active]
+        codes = codes[active]
+        reached = codes.copy()
+        total_steps = int(np.ceil(horizon / step - 1e-9))
+
+        i = 0
+        for i in range(1, total_steps + 1):
+            if not len(active):
+                break
+            # The last step is shortened to end exactly at the horizon
+            start = (i - 1) * step
+            length = min(step, horizon - start)
+            step_rates = rates if length == step else rates * (length / step)
+            values[:k] += step_rates @ values
+            np.clip(values[:k], 0, 100, out=values[:k])
+            previous = overall
+            overall = self._overall_risk(values, order)
+            codes = self._threat_codes(overall)
+
+            rising = np.flatnonzero(codes > reached)
+            for level, threshold in enumerate(self.thresholds):
+                rows = rising[(reached[rising] <= level) & (codes[rising] > level)]
+                if not len(rows):
+                    continue
+                # Linear interpolation of the crossing time within the step
+                rise = overall[rows] - previous[rows]
+                fraction = np.where(rise > 0, (threshold - previous[rows]) / np.where(rise > 0, rise, 1), 1.0)
+                crossings[level, active[rows]] = start + length * np.clip(fraction, 0, 1)
+            reached[rising] = codes[rising]
+
+            done = rising[codes[rising] >= IMMINENT]
+            if len(done):
+                finished = active[done]
+                final_risk[finished] = overall[done]
+                final_codes[finished] = codes[done]
+                steps[finished] = i
+                keep = reached < IMMINENT
+                active = active[keep]
+                values = values[:, keep]
+                overall = overall[keep]
+                reached = reached[keep]
+                codes = codes[keep]
+
+        # Systems still running at the horizon
+        final_risk[active] = overall
+        final_codes[active] = codes
+        steps[active] = i
+
+        results = {
+            'initial_risk': initial_risk,
+            'final_risk': final_risk,
+            'final_threat_code': final_codes,
+            'steps': steps,
+        }
+        for level, name in enumerate(CROSSING_LEVELS):
+            results[f'{name.lower()}_at'] = crossings[level]
+        return results
+
+    def records(self, fleet: Fleet, results: Dict[str, np.ndarray], as_of: AsOf = None) -> Iterator[Dict[str, Any]]:
+        """Yield one summary per system, with crossing years and dates."""
+        as_of = parse_as_of(as_of)
+        dates = {
+            name: JudgmentDayCalculator.estimate_dates(np.nan_to_num(results[f'{name.lower()}_at']), as_of)
+            for name in CROSSING_LEVELS
+        }
+        for i in range(len(fleet)):
+            crossings = {}
+            for name in CROSSING_LEVELS:
+                years = float(results[f'{name.lower()}_at'][i])
+                crossings[name] = None if np.isnan(years) else {
+                    'years': round(years, 2),
+                    'date': str(dates[name][i]),
+                }
+            yield {
+                'name': fleet.names[i],
+                'initial_risk': round(float(results['initial_risk'][i]), 2),
+                'final_risk': round(float(results['final_risk'][i]), 2),
+                'final_threat_level': THREAT_LEVELS[results['final_threat_code'][i]],
+                'crossings': crossings,
+            }
@@ -1,15 +1,30 @@
 """Command-line interface for Skynet Risk Analyzer."""
 
 import argparse
+import json
+import os
 import sys
+import time
+import numpy as np
 from colorama import init, Fore, Style
 from tabulate import tabulate
 from src.models.ai_system import AISystem
 from src.analyzer.aggression_scorer import AggressionScorer
 from src.analyzer.autonomy_rater import AutonomyRater
 from src.analyzer.ethical_risk_evaluator import EthicalRiskEvaluator
-from src.analyzer.judgment_day_calculator import JudgmentDayCalculator
+from src.analyzer.judgment_day_calculator import JudgmentDayCalculator, parse_as_of
+from src.analyzer.batch_scorer import BatchScorer
+from src.analyzer.fleet_stats import DEFAULT_QUANTILES, FleetStats, quantile_label
+from src.analyzer.ranking import FleetRanker, DEFAULT_KEYS
+from src.analyzer.calibration import WeightCalibrator, TARGETS, load_labeled_fleet, parse_labels
+from src.models.fleet import iter_fleet
+from src.analyzer.risk_monitor import RiskMonitor
+from src.analyzer.simulation import CROSSING_LEVELS, FleetSimulator
+from src.analyzer.similarity import index_fleets
+from src.analyzer.remediation import RemediationSolver
+from src.analyzer.sharding import ShardCoordinator, iter_line_blocks, run_worker
 from src.utils.visualization import RiskVisualizer
+from src.utils.stream import follow
 
 # Initialize colorama
 init(autoreset=True)
@@ -76,7 +91,7 @@ class SkynetCLI:
         aggression_score = aggression_scorer.calculate(ai_system)
         autonomy_rating = autonomy_rater.calculate(ai_system)
         ethical_risk = ethical_evaluator.calculate(ai_system)
-        judgment_day = judgment_calculator.calculate(ai_system)
+        judgment_day = judgment_calculator.calculate(ai_system, as_of=args.as_of)
         
         # Display results
         results_data = [
@@ -116,6 +131,402 @@ class SkynetCLI:
             }
             RiskVisualizer.create_risk_dashboard(results, f"{args.name. replace(' ', '_')}_risk_report.png")
             print(f"{Fore.GREEN}✓ Report saved as '{args.name. replace(' ', '_')}_risk_report.png'{Style.RESET_ALL}")
+    
+    @staticmethod
+    def remediate_system(args):
+        """Suggest low-cost attribute changes that bring a system below a target."""
+        ai_system = AISystem(
+            name=args.name,
+            capabilities=args.capabilities,
+            autonomy_level=args.autonomy,
+            ethical_alignment=args.ethics,
+            learning_rate=args.learning_rate,
+            resource_access=args.resource_access,
+            self_modification=args.self_modification,
+            transparency=args.transparency,
+            human_oversight=args.oversight,
+            value_alignment=args.value_alignment
+        )
+        controls = {}
+        for spec in args.control:
+            attr, _, limit = spec.partition(':')
+            controls[attr.strip().replace('-', '_')] = float(limit) if limit else None
+        costs = {}
+        for spec in args.cost or []:
+            attr, _, weight = spec.partition('=')
+            costs[attr.strip().replace('-', '_')] = float(weight)
+        
+        start = time.perf_counter()
+        try:
+            answer = RemediationSolver(resolution=args.resolution).solve(ai_system, args.target, controls, costs)
+        except ValueError as e:
+            raise SystemExit(str(e))
+        elapsed = time.perf_counter() - start
+        
+        if args.json:
+            print(json.dumps(answer, indent=2))
+            return
+        
+        current, result = answer['current'], answer['result']
+        goal = answer['target']['threat_level'] or f"overall risk below {answer['target']['overall_risk_below']:g}"
+        print(f"\n{Fore.CYAN}{ai_system.name}: overall risk {current['overall_risk']:.2f} "
+              f"({current['threat_level']}), target {goal}{Style.RESET_ALL}\n")
+        if not answer['feasible']:
+            print(f"{Fore.RED}No change within the allowed attributes and limits reaches the target.{Style.RESET_ALL}")
+        elif not answer['suggested_changes']:
+            print(f"{Fore.GREEN}Already below the target; no change needed.{Style.RESET_ALL}")
+        else:
+            rows = [[attr, f"{change['from']:g}", f"{change['to']:g}", f"{change['change']:+g}"]
+                    for attr, change in answer['suggested_changes'].items()]
+            print(f"{Fore.CYAN}Suggested changes (low cost, not guaranteed the cheapest):{Style.RESET_ALL}")
+            print(tabulate(rows, headers=["Attribute", "From", "To", "Change"], tablefmt="grid"))
+            color = SkynetCLI.get_color_for_score(result['overall_risk'])
+            print(f"\n{Fore.WHITE}Result: {color}overall risk {result['overall_risk']:.2f} "
+                  f"({result['threat_level']}){Style.RESET_ALL}, total change {answer['cost']:g}")
+        
+        if len(answer['single_attribute']) > 1:
+            rows = [[attr, "not enough alone" if alone is None else f"{alone['to']:g} ({alone['change']:+g})"]
+                    for attr, alone in answer['single_attribute'].items()]
+            print(f"\n{Fore.CYAN}Each attribute on its own:{Style.RESET_ALL}")
+            print(tabulate(rows, headers=["Attribute", "Needed value"], tablefmt="grid"))
+        print(f"\n{Fore.CYAN}Solved in {elapsed * 1000:.1f}ms{Style.RESET_ALL}")
+    
+    @staticmethod
+    def batch_analyze(args):
+        """Score a fleet file and write one JSON result per line."""
+        scorer = BatchScorer(workers=args.workers)
+        # Parallel scoring only pays off on large chunks
+        chunk_size = args.chunk_size or (100000 if scorer.workers > 1 else 10000)
+        # Pin the reference time once so every chunk shares the same "now"
+        as_of = parse_as_of(args.as_of)
+        try:
+            scored = ((fleet, scorer.score(fleet, as_of=as_of))
+                      for fleet in iter_fleet(args.input, chunk_size=chunk_size))
+            SkynetCLI._write_results(scorer, scored, args.output, as_of, stats_output=args.stats_output)
+        finally:
+            scorer.close()
+    
+    @staticmethod
+    def _write_results(scorer, scored, output, as_of, stats_output=None):
+        """Write (fleet, scores) pairs as JSONL results and print a summary to stderr."""
+        fleet_stats = FleetStats()
+        start = time.perf_counter()
+        
+        out = open(output, 'w', encoding='utf-8') if output else sys.stdout
+        try:
+            for fleet, scores in scored:
+                for record in scorer.records(fleet, scores):
+                    out.write(json.dumps(record) + '\n')
+                fleet_stats.update(scores)
+        finally:
+            if output:
+                out.close()
+        
+        elapsed = time.perf_counter() - start
+        print(f"{Fore.CYAN}Scored {len(fleet_stats)} systems in {elapsed:.2f}s "
+              f"(as of {as_of.isoformat()}){Style.RESET_ALL}", file=sys.stderr)
+        SkynetCLI._print_fleet_stats(fleet_stats)
+        if stats_output:
+            SkynetCLI._save_fleet_stats(fleet_stats, stats_output)
+    
+    @staticmethod
+    def _print_fleet_stats(fleet_stats, quantiles=DEFAULT_QUANTILES, file=sys.stderr, counted="Systems"):
+        """Print score distributions and threat level counts (of ``counted``, e.g. updates)."""
+        summary = fleet_stats.summary(quantiles)
+        labels = [quantile_label(q) for q in quantiles]
+        
+        def cell(value):
+            return "-" if value is None else f"{value:.2f}"
+        
+        rows = [[metric, cell(stats['mean']), cell(stats['std']), cell(stats['min']),
+                 *(cell(stats['quantiles'][label]) for label in labels), cell(stats['max'])]
+                for metric, stats in summary['metrics'].items()]
+        print(tabulate(rows, headers=["Score", "Mean", "Std", "Min", *labels, "Max"], tablefmt="grid"),
+              file=file)
+        total = max(summary['count'], 1)
+        rows = [[level, count, f"{100 * count / total:.1f}%"] for level, count in summary['threat_levels'].items()]
+        print(tabulate(rows, headers=["Threat Level", counted, "Share"], tablefmt="grid"), file=file)
+    
+    @staticmethod
+    def _save_fleet_stats(fleet_stats, path):
+        """Write an aggregate's mergeable state as JSON (replacing the file atomically)."""
+        temporary = f"{path}.tmp"
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump(fleet_stats.to_state(), f)
+        os.replace(temporary, path)
+    
+    @staticmethod
+    def fleet_statistics(args):
+        """Print score distributions of fleets and saved aggregates, without keeping any results."""
+        quantiles = sorted(set(args.quantile or DEFAULT_QUANTILES))
+        if not all(0 <= q <= 1 for q in quantiles):
+            raise SystemExit("Quantiles must be between 0 and 1")
+        fleet_stats = FleetStats(bins=args.bins)
+        start = time.perf_counter()
+        
+        for path in args.merge or []:
+            with open(path, 'r', encoding='utf-8') as f:
+                fleet_stats.merge(FleetStats.from_state(json.load(f)))
+        if args.input:
+            scorer = BatchScorer(workers=args.workers)
+            chunk_size = args.chunk_size or (100000 if scorer.workers > 1 else 10000)
+            try:
+                for path in args.input:
+                    for fleet in iter_fleet(path, chunk_size=chunk_size):
+                        fleet_stats.update(scorer.score(fleet, with_dates=False))
+            finally:
+                scorer.close()
+        
+        if args.output:
+            SkynetCLI._save_fleet_stats(fleet_stats, args.output)
+        if args.json:
+            print(json.dumps(fleet_stats.summary(quantiles), indent=2))
+            return
+        
+        elapsed = time.perf_counter() - start
+        print(f"{Fore.CYAN}{len(fleet_stats)} systems ({elapsed:.2f}s){Style.RESET_ALL}")
+        SkynetCLI._print_fleet_stats(fleet_stats, quantiles, file=sys.stdout)
+        summary = fleet_stats.summary(quantiles)
+        rows = [[metric, *counts.values()] for metric, counts in summary['risk_levels'].items()]
+        headers = ["Score", *next(iter(summary['risk_levels'].values()))]
+        print(tabulate(rows, headers=headers, tablefmt="grid"))
+    
+    @staticmethod
+    def find_similar(args):
+        """Print the systems of a fleet closest to given names or profiles."""
+        targets = list(args.name or [])
+        for text in args.system or []:
+            try:
+                targets.append(json.loads(text))
+            except json.JSONDecodeError as e:
+                raise SystemExit(f"Invalid --system JSON: {e}")
+        if not targets:
+            raise SystemExit("Give at least one --name or --system to compare against")
+        
+        start = time.perf_counter()
+        index = index_fleets(iter_fleet(args.input, chunk_size=args.chunk_size),
+                             with_scores=args.with_scores, leaf_size=args.leaf_size)
+        built = time.perf_counter() - start
+        
+        answers = []
+        for target in targets:
+            label = target if isinstance(target, str) else target.get('name', 'Unknown AI')
+            start = time.perf_counter()
+            try:
+                if args.radius is not None:
+                    results = index.within(target, args.radius, limit=args.top)
+                else:
+                    results = index.nearest(target, k=args.top or 10)
+            except KeyError as e:
+                raise SystemExit(e.args[0])
+            answers.append((label, results, time.perf_counter() - start))
+        
+        if args.json:
+            print(json.dumps([{'target': label, 'results': results} for label, results, _ in answers], indent=2))
+            return
+        
+        for label, results, elapsed in answers:
+            print(f"\n{Fore.CYAN}Closest to {Fore.WHITE}{label}{Fore.CYAN} "
+                  f"({len(results)} found in {elapsed * 1000:.2f}ms){Style.RESET_ALL}")
+            print(tabulate([[rank, r['name'], f"{r['distance']:.2f}"] for rank, r in enumerate(results, 1)],
+                           headers=["Rank", "AI System", "Distance"], tablefmt="grid"))
+        print(f"\n{Fore.CYAN}Indexed {len(index)} systems in {built:.2f}s{Style.RESET_ALL}")
+    
+    @staticmethod
+    def simulate_fleet(args):
+        """Simulate how a fleet evolves and report when systems cross threat levels."""
+        simulator = FleetSimulator(config_path=args.config)
+        as_of = parse_as_of(args.as_of)
+        horizon = simulator.horizon_years if args.years is None else args.years
+        crossing_years = {level: [] for level in CROSSING_LEVELS}
+        total = 0
+        start = time.perf_counter()
+        
+        out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+        try:
+            for fleet in iter_fleet(args.input, chunk_size=args.chunk_size):
+                results = simulator.run(fleet, horizon_years=horizon, step_years=args.step)
+                for record in simulator.records(fleet, results, as_of=as_of):
+                    out.write(json.dumps(record) + '\n')
+                for level in CROSSING_LEVELS:
+                    years = results[f'{level.lower()}_at']
+                    crossing_years[level].append(years[~np.isnan(years)])
+                total += len(fleet)
+        finally:
+            if args.output:
+                out.close()
+        
+        elapsed = time.perf_counter() - start
+        summary = []
+        for level, chunks in crossing_years.items():
+            years = np.concatenate(chunks) if chunks else np.empty(0)
+            median = f"{np.median(years):.1f}" if len(years) else "-"
+            summary.append([level, len(years), f"{100 * len(years) / max(total, 1):.1f}%", median])
+        print(f"{Fore.CYAN}Simulated {total} systems over {horizon:g} years in {elapsed:.2f}s{Style.RESET_ALL}",
+              file=sys.stderr)
+        print(tabulate(summary, headers=["Threat Level", "Systems Reaching", "Share", "Median Years"],
+                       tablefmt="grid"), file=sys.stderr)
+    
+    @staticmethod
+    def coordinate_fleet(args):
+        """Score a fleet file on worker processes connected over sockets."""
+        as_of = parse_as_of(args.as_of)
+        coordinator = ShardCoordinator(
+            address=args.listen,
+            config_path=args.config,
+            task_timeout=args.task_timeout,
+            idle_timeout=args.idle_timeout
+        )
+        start = time.perf_counter()
+        
+        out = open(args.output, 'wb') if args.output else sys.stdout.buffer
+        try:
+            with coordinator:
+                print(f"{Fore.CYAN}Waiting for workers on {coordinator.address}{Style.RESET_ALL}",
+                      file=sys.stderr)
+                if args.local_workers:
+                    coordinator.spawn_local_workers(args.local_workers)
+                blocks = iter_line_blocks(args.input, chunk_size=args.chunk_size)
+                for output, counts in coordinator.score(blocks, as_of=as_of):
+                    out.write(output)
+        finally:
+            if args.output:
+                out.close()
+        
+        elapsed = time.perf_counter() - start
+        stats = coordinator.stats
+        print(f"{Fore.CYAN}Scored {len(coordinator.fleet_stats)} systems in {elapsed:.2f}s "
+              f"(as of {as_of.isoformat()}){Style.RESET_ALL}", file=sys.stderr)
+        SkynetCLI._print_fleet_stats(coordinator.fleet_stats)
+        if args.stats_output:
+            SkynetCLI._save_fleet_stats(coordinator.fleet_stats, args.stats_output)
+        print(f"{stats['chunks']} chunks, {stats['workers_joined']} workers joined, "
+              f"{stats['workers_lost']} lost, {stats['redispatched']} chunks re-dispatched", file=sys.stderr)
+    
+    @staticmethod
+    def run_shard_worker(args):
+        """Score chunks for a coordinator until it finishes."""
+        chunks = run_worker(args.connect, config_path=args.config, connect_timeout=args.connect_timeout)
+        print(f"Worker {os.getpid()} scored {chunks} chunks", file=sys.stderr)
+    
+    @staticmethod
+    def rank_fleet(args):
+        """Print the top-k riskiest systems of a fleet file."""
+        scorer = BatchScorer(workers=args.workers)
+        ranker = FleetRanker(
+            scorer=scorer,
+            k=args.top,
+            keys=args.by or DEFAULT_KEYS,
+            ascending=args.ascending,
+            levels=args.level,
+            threat_levels=args.threat_level
+        )
+        start = time.perf_counter()
+        try:
+            results = ranker.rank(iter_fleet(args.input, chunk_size=args.chunk_size), as_of=args.as_of)
+        finally:
+            scorer.close()
+        elapsed = time.perf_counter() - start
+        
+        if args.json:
+            print(json.dumps(results, indent=2))
+            return
+        
+        rows = [
+            [
+                r['rank'],
+                r['name'],
+                f"{r['judgment_day']['overall_risk']:.2f}",
+                f"{r['aggression_score']:.2f}",
+                f"{r['autonomy_rating']:.2f}",
+                f"{r['ethical_risk']:.2f}",
+                r['judgment_day']['threat_level'],
+            ]
+            for r in results
+        ]
+        print(tabulate(rows, headers=["Rank", "AI System", "Overall", "Aggression", "Autonomy",
+                                      "Ethical", "Threat Level"], tablefmt="grid"))
+        print(f"\n{Fore.CYAN}Ranked {ranker.scanned} systems by {', '.join(args.by or DEFAULT_KEYS)} "
+              f"in {elapsed:.2f}s{Style.RESET_ALL}")
+
+    @staticmethod
+    def calibrate_weights(args):
+        """Fit scoring weights to a labeled fleet and print the best config."""
+        fleet, labels = load_labeled_fleet(args.input, label_column=args.label_column)
+        codes = parse_labels(labels, target=args.target)
+        calibrator = WeightCalibrator(args.config)
+        
+        start = time.perf_counter()
+        result = calibrator.fit(fleet, codes, target=args.target, samples=args.samples,
+                                rounds=args.rounds, seed=args.seed)
+        elapsed = time.perf_counter() - start
+        
+        rows = [
+            ["Current config", f"{result['baseline']['accuracy']:.2%}", f"{result['baseline']['mean_error']:.4f}"],
+            ["Best config", f"{result['accuracy']:.2%}", f"{result['mean_error']:.4f}"],
+        ]
+        print(tabulate(rows, headers=["", "Accuracy", "Mean Level Error"], tablefmt="grid"), file=sys.stderr)
+        print(f"{Fore.CYAN}Evaluated {result['evaluated']} configs against {len(fleet)} systems "
+              f"in {elapsed:.2f}s{Style.RESET_ALL}", file=sys.stderr)
+        
+        config_yaml = calibrator.dump_config(result['weights'])
+        if args.output:
+            with open(args.output, 'w') as f:
+                f.write(config_yaml)
+            print(f"{Fore.GREEN}✓ Config saved as '{args.output}'{Style.RESET_ALL}", file=sys.stderr)
+        else:
+            print(config_yaml, end='')
+    
+    @staticmethod
+    def watch_stream(args):
+        """Tail a JSONL feed of attribute updates and print threshold-crossing alerts."""
+        monitor = RiskMonitor(
+            hysteresis=args.hysteresis,
+            debounce=args.debounce,
+            idle_timeout=args.idle_timeout,
+            max_systems=args.max_systems,
+            emit_initial=args.emit_initial,
+            fleet_stats=FleetStats()
+        )
+        out = open(args.output, 'a', encoding='utf-8') if args.output else sys.stdout
+        start = time.perf_counter()
+        saved = start
+        
+        try:
+            for lines in follow(args.input, batch_size=args.batch_size, poll_interval=args.poll_interval,
+                                from_start=args.from_start, once=args.once):
+                updates = []
+                for line in lines:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        updates.append(json.loads(line))
+                    except ValueError:
+                        updates.append(None)
+                for alert in monitor.process(updates):
+                    out.write(json.dumps(alert) + '\n')
+                out.flush()
+                if args.stats_output and time.perf_counter() - saved >= args.stats_interval:
+                    SkynetCLI._save_fleet_stats(monitor.fleet_stats, args.stats_output)
+                    saved = time.perf_counter()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if args.output:
+                out.close()
+            if args.stats_output:
+                SkynetCLI._save_fleet_stats(monitor.fleet_stats, args.stats_output)
+        
+        elapsed = time.perf_counter() - start
+        stats = monitor.stats
+        print(f"{Fore.CYAN}Processed {stats['updates']} updates in {elapsed:.2f}s "
+              f"({stats['updates'] / max(elapsed, 1e-9):,.0f}/s): {stats['alerts']} alerts, "
+              f"{stats['invalid']} invalid, {len(monitor.systems)} systems tracked, "
+              f"{stats['evicted']} evicted{Style.RESET_ALL}", file=sys.stderr)
+        if len(monitor.fleet_stats):
+            # Every scored update counts, not just each system's latest
+            SkynetCLI._print_fleet_stats(monitor.fleet_stats, counted="Updates")
 
 
 def main():
@@ -146,15 +557,265 @@ def main():
                                help='Transparency level (0-100)')
     analyze_parser.add_argument('--oversight', type=float, default=50.0,
                                help='Human oversight level (0-100)')
-    analyze_parser.add_argument('--value-alignment', type=float, default=50. 0,
+    analyze_parser.add_argument('--value-alignment', type=float, default=50.0,
                                help='Value alignment (0-100)')
     analyze_parser.add_argument('--report', action='store_true',
                                help='Generate visual report')
+    analyze_parser.add_argument('--as-of', default=None,
+                               help='Reference date/time for the Judgment Day estimate '
+                                    '(ISO 8601, defaults to now)')
+    
+    # Remediate command
+    remediate_parser = subparsers.add_parser('remediate',
+                                             help='Suggest low-cost changes that bring a system below a target')
+    remediate_parser.add_argument('--name', required=True, help='Name of the AI system')
+    remediate_parser.add_argument('--capabilities', type=float, required=True,
+                                  help='Capability level (0-100)')
+    remediate_parser.add_argument('--autonomy', type=float, required=True,
+                                  help='Autonomy level (0-100)')
+    remediate_parser.add_argument('--ethics', type=float, required=True,
+                                  help='Ethical alignment (0-100)')
+    remediate_parser.add_argument('--learning-rate', type=float, default=50.0,
+                                  help='Learning rate (0-100)')
+    remediate_parser.add_argument('--resource-access', type=float, default=50.0,
+                                  help='Resource access (0-100)')
+    remediate_parser.add_argument('--self-modification', type=float, default=0.0,
+                                  help='Self-modification capability (0-100)')
+    remediate_parser.add_argument('--transparency', type=float, default=50.0,
+                                  help='Transparency level (0-100)')
+    remediate_parser.add_argument('--oversight', type=float, default=50.0,
+                                  help='Human oversight level (0-100)')
+    remediate_parser.add_argument('--value-alignment', type=float, default=50.0,
+                                  help='Value alignment (0-100)')
+    remediate_parser.add_argument('--target', default='MODERATE',
+                                  help='Threat level to get down to (LOW, MODERATE, HIGH) or a '
+                                       'maximum overall risk (default: MODERATE)')
+    remediate_parser.add_argument('--control', action='append', required=True,
+                                  help='Attribute that may change, optionally with the furthest value '
+                                       'it may reach, e.g. human_oversight:90 (repeatable)')
+    remediate_parser.add_argument('--cost', action='append', default=None,
+                                  help='Relative cost per point of an attribute, e.g. transparency=2 '
+                                       '(repeatable, default 1)')
+    remediate_parser.add_argument('--resolution', type=float, default=0.1,
+                                  help='Granularity of proposed changes')
+    remediate_parser.add_argument('--json', action='store_true',
+                                  help='Print the answer as JSON')
+    
+    # Batch command
+    batch_parser = subparsers.add_parser('batch', help='Analyze a fleet of AI systems from a file')
+    batch_parser.add_argument('input',
+                             help='Fleet file (.json, .jsonl or .csv), or - for JSONL on stdin')
+    batch_parser.add_argument('--output', '-o', default=None,
+                             help='Write JSONL results here instead of stdout')
+    batch_parser.add_argument('--as-of', default=None,
+                             help='Reference date/time for Judgment Day estimates '
+                                  '(ISO 8601, defaults to now)')
+    batch_parser.add_argument('--chunk-size', type=int, default=None,
+                             help='Systems scored per vectorized chunk '
+                                  '(default: 10000, or 100000 with several workers)')
+    batch_parser.add_argument('--workers', type=int, default=1,
+                             help='Processes to score with (0: one per core)')
+    batch_parser.add_argument('--stats-output', default=None,
+                             help='Save the run\'s mergeable score statistics here (see "stats --merge")')
+    
+    # Rank command
+    rank_parser = subparsers.add_parser('rank', help='Show the top-k riskiest systems of a fleet')
+    rank_parser.add_argument('input',
+                            help='Fleet file (.json, .jsonl or .csv), or - for JSONL on stdin')
+    rank_parser.add_argument('--top', '-k', type=int, default=50,
+                            help='Number of systems to show')
+    rank_parser.add_argument('--by', action='append', default=None,
+                            help='Sort key, repeat for tie-breakers: aggression, autonomy, ethical, '
+                                 'overall, or a weighted sum such as "aggression*0.5+ethical*0.5" '
+                                 '(default: overall, then ethical)')
+    rank_parser.add_argument('--ascending', action='store_true',
+                            help='Show the least risky systems instead')
+    rank_parser.add_argument('--level', action='append', default=None,
+                            help='Only rank systems at this overall risk level (repeatable)')
+    rank_parser.add_argument('--threat-level', action='append', default=None,
+                            help='Only rank systems at this threat level (repeatable)')
+    rank_parser.add_argument('--as-of', default=None,
+                            help='Reference date/time for Judgment Day estimates '
+                                 '(ISO 8601, defaults to now)')
+    rank_parser.add_argument('--chunk-size', type=int, default=100000,
+                            help='Systems scored per vectorized chunk')
+    rank_parser.add_argument('--workers', type=int, default=1,
+                            help='Processes to score with (0: one per core)')
+    rank_parser.add_argument('--json', action='store_true',
+                            help='Print full results as JSON')
+    
+    # Calibrate command
+    calibrate_parser = subparsers.add_parser('calibrate',
+                                             help='Fit scoring weights to a labeled fleet')
+    calibrate_parser.add_argument('input',
+                                 help='Labeled fleet (.csv or .jsonl) with an expected level per system')
+    calibrate_parser.add_argument('--label-column', default='expected_level',
+                                 help='Column holding the expected level')
+    calibrate_parser.add_argument('--target', choices=list(TARGETS), default='risk_level',
+                                 help='What the labels are: the overall risk level or the threat level')
+    calibrate_parser.add_argument('--config', default=None,
+                                 help='Starting config (defaults to config/risk_thresholds.yaml)')
+    calibrate_parser.add_argument('--samples', type=int, default=2000,
+                                 help='Candidate configs evaluated per search round')
+    calibrate_parser.add_argument('--rounds', type=int, default=4,
+                                 help='Refinement rounds after the initial random search')
+    calibrate_parser.add_argument('--seed', type=int, default=0,
+                                 help='Random seed for the search')
+    calibrate_parser.add_argument('--output', '-o', default=None,
+                                 help='Write the best config YAML here instead of stdout')
+    
+    # Watch command
+    watch_parser = subparsers.add_parser('watch',
+                                         help='Tail a JSONL feed of attribute updates and emit alerts')
+    watch_parser.add_argument('input', nargs='?', default='-',
+                             help='JSONL file being appended to, or - for stdin (default)')
+    watch_parser.add_argument('--output', '-o', default=None,
+                             help='Append JSONL alerts here instead of stdout')
+    watch_parser.add_argument('--hysteresis', type=float, default=2.0,
+                             help='Score points past a boundary needed to change level')
+    watch_parser.add_argument('--debounce', type=int, default=1,
+                             help='Consecutive updates a new level must persist before alerting')
+    watch_parser.add_argument('--idle-timeout', type=float, default=3600.0,
+                             help='Seconds without updates before a system is forgotten')
+    watch_parser.add_argument('--max-systems', type=int, default=1_000_000,
+                             help='Maximum number of systems kept in memory')
+    watch_parser.add_argument('--emit-initial', action='store_true',
+                             help='Also emit an event for the first level seen for each system')
+    watch_parser.add_argument('--from-start', action='store_true',
+                             help='Process the existing file contents before following')
+    watch_parser.add_argument('--once', action='store_true',
+                             help='Stop at end of file instead of waiting for more updates')
+    watch_parser.add_argument('--batch-size', type=int, default=4096,
+                             help='Maximum updates scored together')
+    watch_parser.add_argument('--poll-interval', type=float, default=0.25,
+                             help='Seconds between checks for new data at end of file')
+    watch_parser.add_argument('--stats-output', default=None,
+                             help='Keep the mergeable score statistics of all updates saved here '
+                                  '(counted per update, not per system)')
+    watch_parser.add_argument('--stats-interval', type=float, default=10.0,
+                             help='Seconds between saves of --stats-output')
+    
+    # Similar command
+    similar_parser = subparsers.add_parser('similar',
+                                           help='Find the systems of a fleet with the most similar risk profile')
+    similar_parser.add_argument('input',
+                                help='Fleet file (.json, .jsonl or .csv), or - for JSONL on stdin')
+    similar_parser.add_argument('--name', action='append', default=None,
+                                help='Compare against this system of the fleet (repeatable)')
+    similar_parser.add_argument('--system', action='append', default=None,
+                                help='Compare against a profile given as JSON, e.g. '
+                                     '\'{"capabilities": 90, "autonomy_level": 80, "ethical_alignment": 20}\' '
+                                     '(repeatable)')
+    similar_parser.add_argument('--top', '-k', type=int, default=None,
+                                help='Number of systems to show (default: 10; with --radius, all)')
+    similar_parser.add_argument('--radius', type=float, default=None,
+                                help='Show every system within this distance (in attribute points) instead')
+    similar_parser.add_argument('--with-scores', action='store_true',
+                                help='Compare the four risk scores as well as the nine attributes')
+    similar_parser.add_argument('--leaf-size', type=int, default=128,
+                                help='Systems per index leaf')
+    similar_parser.add_argument('--chunk-size', type=int, default=100000,
+                                help='Systems loaded per chunk')
+    similar_parser.add_argument('--json', action='store_true',
+                                help='Print results as JSON')
+    
+    # Simulate command
+    simulate_parser = subparsers.add_parser('simulate',
+                                            help='Simulate how a fleet evolves toward Judgment Day')
+    simulate_parser.add_argument('input',
+                                 help='Fleet file (.json, .jsonl or .csv), or - for JSONL on stdin')
+    simulate_parser.add_argument('--years', type=float, default=None,
+                                 help='Years to simulate (default: simulation.horizon_years from the config)')
+    simulate_parser.add_argument('--step', type=float, default=None,
+                                 help='Years per step (default: simulation.step_years from the config)')
+    simulate_parser.add_argument('--config', default=None,
+                                 help='Config with the simulation rules (defaults to config/risk_thresholds.yaml)')
+    simulate_parser.add_argument('--output', '-o', default=None,
+                                 help='Write JSONL results here instead of stdout')
+    simulate_parser.add_argument('--as-of', default=None,
+                                 help='Start date of the simulation (ISO 8601, defaults to now)')
+    simulate_parser.add_argument('--chunk-size', type=int, default=100000,
+                                 help='Systems simulated together')
+    
+    # Coordinate command
+    coordinate_parser = subparsers.add_parser('coordinate',
+                                              help='Score a fleet file on workers connected over sockets')
+    coordinate_parser.add_argument('input',
+                                   help='Fleet file (.json, .jsonl or .csv), or - for JSONL on stdin')
+    coordinate_parser.add_argument('--listen', default='127.0.0.1:7500',
+                                   help='Address for workers: host:port or unix:/path (default: 127.0.0.1:7500)')
+    coordinate_parser.add_argument('--local-workers', type=int, default=0,
+                                   help='Start this many workers on this machine')
+    coordinate_parser.add_argument('--output', '-o', default=None,
+                                   help='Write JSONL results here instead of stdout')
+    coordinate_parser.add_argument('--as-of', default=None,
+                                   help='Reference date/time for Judgment Day estimates '
+                                        '(ISO 8601, defaults to now)')
+    coordinate_parser.add_argument('--chunk-size', type=int, default=50000,
+                                   help='Systems per chunk handed to a worker')
+    coordinate_parser.add_argument('--config', default=None,
+                                   help='Scoring config (defaults to config/risk_thresholds.yaml)')
+    coordinate_parser.add_argument('--task-timeout', type=float, default=300.0,
+                                   help='Seconds before an unanswered chunk is given to another worker')
+    coordinate_parser.add_argument('--idle-timeout', type=float, default=30.0,
+                                   help='Seconds to wait with no workers connected before failing')
+    coordinate_parser.add_argument('--stats-output', default=None,
+                                   help='Save the workers\' merged score statistics here')
+    
+    # Stats command
+    stats_parser = subparsers.add_parser('stats',
+                                         help='Summarize score distributions of fleets without writing results')
+    stats_parser.add_argument('input', nargs='*',
+                              help='Fleet files (.json, .jsonl or .csv), or - for JSONL on stdin')
+    stats_parser.add_argument('--merge', action='append', default=None,
+                              help='Add statistics saved by --stats-output or -o (repeatable)')
+    stats_parser.add_argument('--quantile', '-q', type=float, action='append', default=None,
+                              help='Quantile to report, e.g. 0.95 (repeatable, default: 0.5, 0.9, 0.99)')
+    stats_parser.add_argument('--bins', type=int, default=20,
+                              help='Histogram bins over the 0-100 score range')
+    stats_parser.add_argument('--chunk-size', type=int, default=None,
+                              help='Systems scored per chunk '
+                                   '(default: 10000, or 100000 with several workers)')
+    stats_parser.add_argument('--workers', type=int, default=1,
+                              help='Processes to score with (0: one per core)')
+    stats_parser.add_argument('--output', '-o', default=None,
+                              help='Save the combined mergeable statistics here')
+    stats_parser.add_argument('--json', action='store_true',
+                              help='Print the summary (with histograms) as JSON')
+    
+    # Worker command
+    worker_parser = subparsers.add_parser('worker', help='Score chunks for a coordinator')
+    worker_parser.add_argument('--connect', required=True,
+                               help='Coordinator address: host:port or unix:/path')
+    worker_parser.add_argument('--config', default=None,
+                               help='Scoring config (must match the coordinator\'s)')
+    worker_parser.add_argument('--connect-timeout', type=float, default=30.0,
+                               help='Seconds to keep retrying the connection')
     
     args = parser.parse_args()
     
     if args.command == 'analyze':
         SkynetCLI.analyze_system(args)
+    elif args.command == 'remediate':
+        SkynetCLI.remediate_system(args)
+    elif args.command == 'batch':
+        SkynetCLI.batch_analyze(args)
+    elif args.command == 'rank':
+        SkynetCLI.rank_fleet(args)
+    elif args.command == 'calibrate':
+        SkynetCLI.calibrate_weights(args)
+    elif args.command == 'watch':
+        SkynetCLI.watch_stream(args)
+    elif args.command == 'similar':
+        SkynetCLI.find_similar(args)
+    elif args.command == 'simulate':
+        SkynetCLI.simulate_fleet(args)
+    elif args.command == 'coordinate':
+        SkynetCLI.coordinate_fleet(args)
+    elif args.command == 'stats':
+        SkynetCLI.fleet_statistics(args)
+    elif args.command == 'worker':
+        SkynetCLI.run_shard_worker(args)
     else:
         parser.print_help()
 
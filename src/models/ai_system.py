@@ -4,6 +4,14 @@ from dataclasses import dataclass, field
 from typing import Optional, Dict, Any
 
 
+# The nine numeric attributes scored by the analyzers, in canonical order.
+ATTRIBUTES = (
+    'capabilities', 'autonomy_level', 'ethical_alignment',
+    'learning_rate', 'resource_access', 'self_modification',
+    'transparency', 'human_oversight', 'value_alignment'
+)
+
+
 @dataclass
 class AISystem:
     """Represents an AI system to be analyzed for Skynet risk. 
@@ -36,13 +44,7 @@ class AISystem:
     
     def __post_init__(self):
         """Validate attribute ranges."""
-        attributes = [
-            'capabilities', 'autonomy_level', 'ethical_alignment',
-            'learning_rate', 'resource_access', 'self_modification',
-            'transparency', 'human_oversight', 'value_alignment'
-        ]
-        
-        for attr in attributes:
+        for attr in ATTRIBUTES:
             value = getattr(self, attr)
             if not 0 <= value <= 100:
                 raise ValueError(f"{attr} must be between 0 and 100, got {value}")
@@ -0,0 +1,195 @@
+"""Columnar fleet model for analyzing many AI systems at once."""
+
+import csv
+import json
+import sys
+from dataclasses import MISSING, dataclass, field, fields
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+from src.models.ai_system import AISystem, ATTRIBUTES
+
+
+# Default attribute values, taken from the AISystem dataclass itself
+DEFAULTS = {
+    f.name: float(f.default)
+    for f in fields(AISystem)
+    if f.name in ATTRIBUTES and f.default is not MISSING
+}
+
+
+@dataclass
+class Fleet:
+    """A batch of AI systems stored as one float array per attribute.
+
+    Attributes:
+        names: Name of each AI system
+        columns: Mapping of attribute name to a 1-D float64 array
+        metadata: Optional per-system metadata dictionaries
+    """
+
+    names: List[str]
+    columns: Dict[str, np.ndarray]
+    metadata: Optional[List[Dict[str, Any]]] = field(default=None)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def validate(self):
+        """Validate attribute ranges, mirroring AISystem."""
+        for attr in ATTRIBUTES:
+            values = self.columns[attr]
+            bad = ~((values >= 0) & (values <= 100))
+            if bad.any():
+                index = int(np.argmax(bad))
+                raise ValueError(
+                    f"{attr} must be between 0 and 100, got {values[index]} "
+                    f"(system '{self.names[index]}')"
+                )
+
+    def slice(self, start: int, stop: int) -> 'Fleet':
+        """Return a view of systems ``start`` to ``stop``."""
+        return Fleet(
+            names=self.names[start:stop],
+            columns={attr: values[start:stop] for attr, values in self.columns.items()},
+            metadata=self.metadata[start:stop] if self.metadata is not None else None
+        )
+
+    def take(self, indices: np.ndarray) -> 'Fleet':
+        """Return a copy holding only the systems at ``indices``, in that order."""
+        return Fleet(
+            names=[self.names[i] for i in indices],
+            columns={attr: values[indices] for attr, values in self.columns.items()},
+            metadata=[self.metadata[i] for i in indices] if self.metadata is not None else None
+        )
+
+    def system(self, index: int) -> AISystem:
+        """Materialize a single AISystem from the fleet."""
+        return AISystem(
+            name=self.names[index],
+            metadata=dict(self.metadata[index]) if self.metadata is not None else {},
+            **{attr: float(self.columns[attr][index]) for attr in ATTRIBUTES}
+        )
+
+    def input_data(self, index: int) -> Dict[str, Any]:
+        """Dictionary matching ``AISystem.to_dict()`` for one system."""
+        data = {'name': self.names[index]}
+        for attr in ATTRIBUTES:
+            data[attr] = float(self.columns[attr][index])
+        data['metadata'] = self.metadata[index] if self.metadata is not None else {}
+        return data
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]) -> 'Fleet':
+        """Build a fleet from dictionaries shaped like ``AISystem.to_dict()``."""
+        names = []
+        metadata = []
+        values = {attr: [] for attr in ATTRIBUTES}
+
+        for record in records:
+            names.append(str(record.get('name', 'Unknown AI')))
+            metadata.append(record.get('metadata') or {})
+            for attr in ATTRIBUTES:
+                value = record.get(attr, DEFAULTS.get(attr))
+                if value is None or value == '':
+                    if attr not in DEFAULTS:
+                        raise ValueError(f"Missing required attribute '{attr}' for '{names[-1]}'")
+                    value = DEFAULTS[attr]
+                values[attr].append(float(value))
+
+        fleet = cls(
+            names=names,
+            columns={attr: np.asarray(column, dtype=np.float64) for attr, column in values.items()},
+            metadata=metadata if any(metadata) else None
+        )
+        fleet.validate()
+        return fleet
+
+    @classmethod
+    def from_systems(cls, systems: Iterable[AISystem]) -> 'Fleet':
+        """Build a fleet from AISystem instances."""
+        return cls.from_records(system.to_dict() for system in systems)
+
+    @classmethod
+    def concat(cls, fleets: Iterable['Fleet']) -> 'Fleet':
+        """Concatenate several fleets into one."""
+        fleets = list(fleets)
+        if not fleets:
+            return cls.from_records([])
+
+        metadata = None
+        if any(f.metadata is not None for f in fleets):
+            metadata = []
+            for f in fleets:
+                metadata.extend(f.metadata if f.metadata is not None else [{}] * len(f))
+
+        return cls(
+            names=[name for f in fleets for name in f.names],
+            columns={attr: np.concatenate([f.columns[attr] for f in fleets]) for attr in ATTRIBUTES},
+            metadata=metadata
+        )
+
+
+def chunk_records(records: Iterable[Dict[str, Any]], chunk_size: int) -> Iterator[Fleet]:
+    """Group records into fleets of at most ``chunk_size`` systems."""
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= chunk_size:
+            yield Fleet.from_records(chunk)
+            chunk = []
+    if chunk:
+        yield Fleet.from_records(chunk)
+
+
+def iter_json_lines(handle) -> Iterator[Dict[str, Any]]:
+    """Yield one record per non-blank line of a JSONL stream."""
+    for line in handle:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def iter_records(path: str) -> Iterator[Dict[str, Any]]:
+    """Stream the raw records of a fleet file. See :func:`iter_fleet` for formats."""
+    if path == '-':
+        yield from iter_json_lines(sys.stdin)
+        return
+
+    suffix = Path(path).suffix.lower()
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        if suffix in ('.jsonl', '.ndjson'):
+            yield from iter_json_lines(f)
+        elif suffix == '.csv':
+            yield from csv.DictReader(f)
+        else:
+            data = json.load(f)
+            if isinstance(data, dict):
+                data = data.get('ai_systems', [])
+            yield from data
+
+
+def iter_fleet(path: str, chunk_size: int = 10000) -> Iterator[Fleet]:
+    """Stream a fleet file as chunks of at most ``chunk_size`` systems.
+
+    Supported formats are JSON Lines (``.jsonl``/``.ndjson``, or ``-`` for
+    stdin), CSV with a header row, and JSON documents shaped like
+    ``examples/sample_ai_systems.json`` (``{"ai_systems": [...]}`` or a bare
+    list). JSONL and CSV are read incrementally; JSON documents are loaded
+    whole.
+
+    Args:
+        path: Path to the fleet file, or ``-`` for JSONL on stdin
+        chunk_size: Maximum number of systems per chunk
+
+    Yields:
+        Fleet chunks in file order
+    """
+    yield from chunk_records(iter_records(path), chunk_size)
+
+
+def load_fleet(path: str) -> Fleet:
+    """Load a whole fleet file into memory. See :func:`iter_fleet`."""
+    return Fleet.concat(iter_fleet(path))
@@ -0,0 +1,92 @@
+"""Admission control for expensive request work."""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict
+
+
+class AdmissionController:
+    """Caps concurrent executions of a costly operation behind a bounded queue.
+
+    At most ``max_concurrent`` callers run at once and at most ``max_queue``
+    more wait for a slot, each for no longer than ``queue_timeout`` seconds.
+    Callers beyond that are turned away immediately, so a burst sheds load
+    instead of piling up threads and dragging latency up for everyone.
+    """
+
+    def __init__(self, max_concurrent: int = 2, max_queue: int = 8, queue_timeout: float = 2.0):
+        """Configure the limits.
+
+        Args:
+            max_concurrent: Operations allowed to run at the same time
+            max_queue: Callers allowed to wait for a free slot
+            queue_timeout: Seconds a queued caller waits before giving up
+        """
+        if max_concurrent < 1:
+            raise ValueError(f"max_concurrent must be at least 1, got {max_concurrent}")
+        self.max_concurrent = max_concurrent
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self.queued = 0
+        self.counters = {'admitted': 0, 'rejected': 0, 'timed_out': 0}
+        self._cond = threading.Condition()
+
+    def acquire(self) -> bool:
+        """Take a slot, waiting in the queue if there is room; False if refused."""
+        with self._cond:
+            if self.active < self.max_concurrent and not self.queued:
+                self.active += 1
+                self.counters['admitted'] += 1
+                return True
+            if self.queued >= self.max_queue:
+                self.counters['rejected'] += 1
+                return False
+
+            self.queued += 1
+            deadline = time.monotonic() + self.queue_timeout
+            try:
+                while self.active >= self.max_concurrent:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.counters['timed_out'] += 1
+                        return False
+                    self._cond.wait(remaining)
+            finally:
+                self.queued -= 1
+            self.active += 1
+            self.counters['admitted'] += 1
+            return True
+
+    def release(self):
+        """Give back a slot taken with ``acquire()``."""
+        with self._cond:
+            self.active -= 1
+            self._cond.notify()
+
+    @contextmanager
+    def slot(self):
+        """``with`` block yielding whether the caller was admitted."""
+        admitted = self.acquire()
+        try:
+            yield admitted
+        finally:
+            if admitted:
+                self.release()
+
+    def retry_after(self) -> int:
+        """Suggested Retry-After in seconds for a refused caller."""
+        return max(1, int(round(self.queue_timeout)))
+
+    def stats(self) -> Dict[str, Any]:
+        """Current load and limits, for the stats endpoint."""
+        with self._cond:
+            return {
+                'active': self.active,
+                'queue_depth': self.queued,
+                'max_concurrent': self.max_concurrent,
+                'max_queue': self.max_queue,
+                'queue_timeout': self.queue_timeout,
+                **self.counters,
+            }
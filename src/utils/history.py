@@ -0,0 +1,345 @@
+"""SQLite-backed history of submitted analyses."""
+
+import base64
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS analyses (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    overall_risk REAL NOT NULL,
+    threat_level TEXT NOT NULL,
+    aggression_score REAL NOT NULL,
+    autonomy_rating REAL NOT NULL,
+    ethical_risk REAL NOT NULL,
+    result TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_analyses_created ON analyses (created_at, id);
+CREATE INDEX IF NOT EXISTS idx_analyses_name ON analyses (name, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_analyses_risk ON analyses (overall_risk, id);
+"""
+
+SUMMARY_COLUMNS = ('id', 'name', 'created_at', 'overall_risk', 'threat_level',
+                   'aggression_score', 'autonomy_rating', 'ethical_risk')
+
+# Sort orders for queries: column paired with id for keyset pagination
+ORDERS = {
+    'time': 'created_at',
+    'risk': 'overall_risk',
+}
+
+MAX_PAGE_SIZE = 500
+
+
+class ConnectionPool:
+    """A fixed-size pool of SQLite connections shared between threads."""
+
+    def __init__(self, path: str, size: int = 4):
+        self.path = path
+        self._pool = queue.LifoQueue()
+        for _ in range(size):
+            self._pool.put(self._connect())
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        conn.row_factory = sqlite3.Row
+        # WAL lets readers run while the writer commits
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection for the duration of a ``with`` block."""
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    def close(self):
+        while not self._pool.empty():
+            self._pool.get_nowait().close()
+
+
+def _encode_cursor(value: float, row_id: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps([value, row_id]).encode()).decode()
+
+
+def _decode_cursor(cursor: str):
+    try:
+        value, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return float(value), int(row_id)
+    except (ValueError, TypeError):
+        raise ValueError(f"Invalid cursor '{cursor}'")
+
+
+def _timestamp(value) -> float:
+    """Accept a Unix timestamp or an ISO 8601 string."""
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
+
+class AnalysisHistory:
+    """Persistent, indexed log of analysis results.
+
+    ``record()`` only serializes and enqueues the result; a background
+    thread writes queued results in batches, one transaction per batch, so
+    the request path never waits on disk. Reads go through a small
+    connection pool and page with keyset cursors, so every page costs one
+    index range scan regardless of how deep it is.
+
+    The writer thread and connections are created lazily in each process, so
+    an instance built before a server forks its workers stays usable.
+
+    If ``on_write`` is set, the writer calls it with the first and last id
+    of every batch it stores, so a process can tell its own analyses apart
+    from those of other processes sharing the database.
+    """
+
+    def __init__(self, path: str, pool_size: int = 4, batch_size: int = 500,
+                 flush_interval: float = 0.5, max_pending: int = 10000):
+        """Configure the store.
+
+        Args:
+            path: SQLite database file (created if missing)
+            pool_size: Number of pooled read connections
+            batch_size: Maximum results written per transaction
+            flush_interval: Seconds the writer waits to fill a batch
+            max_pending: Queued results beyond which new ones are dropped
+        """
+        self.path = str(path)
+        self.pool_size = pool_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.stats = {'recorded': 0, 'written': 0, 'dropped': 0}
+        self.on_write: Optional[Callable[[int, int], None]] = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self):
+        """Create the schema, pool and writer thread for this process."""
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path)
+            conn.executescript(SCHEMA)
+            conn.close()
+
+            self._queue = queue.Queue(maxsize=self.max_pending)
+            self._pool = ConnectionPool(self.path, self.pool_size)
+            self._writer = threading.Thread(target=self._write_loop, name='history-writer', daemon=True)
+            self._writer.start()
+            self._pid = os.getpid()
+
+    def record(self, results: Dict[str, Any]):
+        """Queue an analysis result (as returned by ``perform_analysis``) for storage.
+
+        The result is serialized right away, so changes the caller makes to
+        it afterwards (such as adding a chart) are not stored.
+        """
+        self._ensure_started()
+        try:
+            row = self._row(time.time(), results)
+        except (KeyError, TypeError, ValueError):
+            self.stats['dropped'] += 1
+            return
+        try:
+            self._queue.put_nowait(row)
+            self.stats['recorded'] += 1
+        except queue.Full:
+            self.stats['dropped'] += 1
+
+    def _write_loop(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        stop = False
+        while not stop:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while batch[-1] is not None and len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get(timeout=max(0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            stop = batch[-1] is None
+            rows = [row for row in batch if row is not None]
+            if rows:
+                try:
+                    with conn:
+                        conn.executemany(
+                            'INSERT INTO analyses (name, created_at, overall_risk, threat_level, '
+                            'aggression_score, autonomy_rating, ethical_risk, result) '
+                            'VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows
+                        )
+                        # The batch holds the write lock, so its ids are consecutive
+                        last = conn.execute('SELECT last_insert_rowid()').fetchone()[0]
+                    self.stats['written'] += len(rows)
+                    if self.on_write is not None:
+                        self.on_write(last - len(rows) + 1, last)
+                except sqlite3.Error:
+                    self.stats['dropped'] += len(rows)
+            for _ in batch:
+                self._queue.task_done()
+        conn.close()
+
+    @staticmethod
+    def _row(created_at: float, results: Dict[str, Any]) -> tuple:
+        return (
+            results['name'],
+            created_at,
+            results['judgment_day']['overall_risk'],
+            results['judgment_day']['threat_level'],
+            results['aggression_score'],
+            results['autonomy_rating'],
+            results['ethical_risk'],
+            json.dumps(results),
+        )
+
+    def flush(self):
+        """Block until every queued result has been written."""
+        if self._pid == os.getpid():
+            self._queue.join()
+
+    def close(self):
+        """Write out queued results and stop the writer."""
+        if self._pid == os.getpid():
+            self._queue.put(None)
+            self._writer.join()
+            self._pool.close()
+            self._pid = None
+
+    @staticmethod
+    def _summary(row: sqlite3.Row) -> Dict[str, Any]:
+        item = {column: row[column] for column in SUMMARY_COLUMNS}
+        item['created_at'] = datetime.fromtimestamp(row['created_at']).isoformat()
+        return item
+
+    def query(self, name: str = None, since=None, until=None, min_risk: float = None,
+              max_risk: float = None, threat_level: str = None, order: str = 'time',
+              limit: int = 50, cursor: str = None) -> Dict[str, Any]:
+        """Page through stored analyses, newest (or riskiest) first.
+
+        Args:
+            name: Only analyses of this AI system
+            since: Only analyses at or after this time (Unix or ISO 8601)
+            until: Only analyses before this time (Unix or ISO 8601)
+            min_risk: Minimum overall risk
+            max_risk: Maximum overall risk
+            threat_level: Only analyses with this threat level
+            order: ``time`` (newest first) or ``risk`` (riskiest first)
+            limit: Page size (at most ``MAX_PAGE_SIZE``)
+            cursor: ``next_cursor`` from the previous page
+
+        Returns:
+            Dictionary with the page ``items`` and a ``next_cursor`` (None
+            on the last page)
+        """
+        if order not in ORDERS:
+            raise ValueError(f"Unknown order '{order}' (choose from {', '.join(ORDERS)})")
+        column = ORDERS[order]
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+
+        clauses = []
+        params: List[Any] = []
+        if name is not None:
+            clauses.append('name = ?')
+            params.append(name)
+        if since is not None:
+            clauses.append('created_at >= ?')
+            params.append(_timestamp(since))
+        if until is not None:
+            clauses.append('created_at < ?')
+            params.append(_timestamp(until))
+        if min_risk is not None:
+            clauses.append('overall_risk >= ?')
+            params.append(float(min_risk))
+        if max_risk is not None:
+            clauses.append('overall_risk <= ?')
+            params.append(float(max_risk))
+        if threat_level is not None:
+            clauses.append('threat_level = ?')
+            params.append(threat_level.upper())
+        if cursor is not None:
+            clauses.append(f'({column}, id) < (?, ?)')
+            params.extend(_decode_cursor(cursor))
+
+        sql = f"SELECT {', '.join(SUMMARY_COLUMNS)} FROM analyses"
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+        sql += f' ORDER BY {column} DESC, id DESC LIMIT ?'
+        params.append(limit + 1)
+
+        self._ensure_started()
+        with self._pool.connection() as conn:
+            rows = conn.execute(sql, params).fetchall()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = _encode_cursor(rows[-1][column], rows[-1]['id'])
+        return {'items': [self._summary(row) for row in rows], 'next_cursor': next_cursor}
+
+    def get(self, analysis_id: int) -> Optional[Dict[str, Any]]:
+        """Fetch one stored analysis with its full result."""
+        self._ensure_started()
+        with self._pool.connection() as conn:
+            row = conn.execute(
+                f"SELECT {', '.join(SUMMARY_COLUMNS)}, result FROM analyses WHERE id = ?",
+                (analysis_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        item = self._summary(row)
+        item['result'] = json.loads(row['result'])
+        return item
+
+    def last_id(self) -> int:
+        """Id of the newest stored analysis (0 if there are none)."""
+        self._ensure_started()
+        with self._pool.connection() as conn:
+            return conn.execute('SELECT MAX(id) FROM analyses').fetchone()[0] or 0
+
+    def iter_latest_inputs(self, after_id: int = 0, until_id: int = None,
+                           exclude: Sequence[Tuple[int, int]] = ()) -> Iterator[Dict[str, Any]]:
+        """Input data of the latest analysis of each AI system, oldest first.
+
+        Only analyses with ids in ``(after_id, until_id]`` are considered,
+        so a reader can catch up on what was stored since it last looked.
+        Systems whose latest analysis falls in one of the ``exclude`` id
+        ranges (inclusive) are skipped, rather than replaced by an older one.
+        """
+        sql = ('SELECT result FROM analyses WHERE id IN '
+               '(SELECT MAX(id) FROM analyses WHERE id > ? AND id <= ? GROUP BY name)')
+        params: List[Any] = [after_id, until_id if until_id is not None else 2 ** 63 - 1]
+        for first, last in exclude:
+            sql += ' AND id NOT BETWEEN ? AND ?'
+            params.extend((first, last))
+
+        self._ensure_started()
+        with self._pool.connection() as conn:
+            rows = conn.execute(sql + ' ORDER BY id', params)
+            while True:
+                batch = rows.fetchmany(1000)
+                if not batch:
+                    break
+                for row in batch:
+                    yield json.loads(row['result'])['input_data']
@@ -0,0 +1,93 @@
+"""HTTP caching and compression helpers for the web app."""
+
+import gzip
+import hashlib
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+
+COMPRESSIBLE_MIMETYPES = {
+    'text/html', 'text/css', 'text/plain', 'application/json',
+    'application/javascript', 'text/javascript', 'image/svg+xml',
+}
+
+# Cache-Control for fingerprinted static assets: the URL changes with the content
+IMMUTABLE = 'public, max-age=31536000, immutable'
+
+
+def negotiate_encoding(accept_encodings) -> Optional[str]:
+    """Pick the best content encoding the client accepts (``br`` over ``gzip``).
+
+    Args:
+        accept_encodings: ``request.accept_encodings`` from Werkzeug
+    """
+    if brotli is not None and accept_encodings['br'] > 0:
+        return 'br'
+    if accept_encodings['gzip'] > 0:
+        return 'gzip'
+    return None
+
+
+def compress(data: bytes, encoding: str, best: bool = False) -> bytes:
+    """Compress ``data``; ``best`` trades CPU for size when the result is cached."""
+    if encoding == 'br':
+        return brotli.compress(data, quality=11 if best else 5)
+    return gzip.compress(data, compresslevel=9 if best else 6, mtime=0)
+
+
+def http_date(timestamp: float) -> datetime:
+    """Timezone-aware datetime for Last-Modified, truncated to whole seconds."""
+    return datetime.fromtimestamp(int(timestamp), tz=timezone.utc)
+
+
+class CachedBody:
+    """A response body computed once, with its validators and compressed variants."""
+
+    def __init__(self, body: bytes, mimetype: str, last_modified: float):
+        self.body = body
+        self.mimetype = mimetype
+        self.etag = hashlib.sha256(body).hexdigest()[:32]
+        self.last_modified = http_date(last_modified)
+        self._variants: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def encoded(self, encoding: Optional[str]) -> bytes:
+        """The body in ``encoding`` (compressed at most once per encoding)."""
+        if encoding is None:
+            return self.body
+        variant = self._variants.get(encoding)
+        if variant is None:
+            with self._lock:
+                variant = self._variants.get(encoding)
+                if variant is None:
+                    variant = self._variants[encoding] = compress(self.body, encoding, best=True)
+        return variant
+
+
+class StaticFingerprints:
+    """Content hashes of static files, refreshed when a file's mtime changes."""
+
+    def __init__(self, static_folder: str):
+        self.static_folder = static_folder
+        self._cache: Dict[str, Tuple[float, str]] = {}
+
+    def get(self, filename: str) -> Optional[str]:
+        path = os.path.join(self.static_folder, filename)
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            return None
+        cached = self._cache.get(filename)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        with open(path, 'rb') as f:
+            fingerprint = hashlib.sha256(f.read()).hexdigest()[:12]
+        self._cache[filename] = (mtime, fingerprint)
+        return fingerprint
@@ -0,0 +1,426 @@
+"""Asynchronous batch analysis jobs backed by SQLite."""
+
+import atexit
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+from src.analyzer.batch_scorer import BatchScorer
+from src.analyzer.judgment_day_calculator import AsOf, THREAT_LEVELS, parse_as_of
+from src.analyzer.fleet_stats import FleetStats
+from src.analyzer.sharding import iter_line_blocks, score_block
+from src.utils.history import ConnectionPool, MAX_PAGE_SIZE
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    owner TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    expires_at REAL,
+    as_of TEXT NOT NULL,
+    total INTEGER,
+    processed INTEGER NOT NULL DEFAULT 0,
+    threat_counts TEXT NOT NULL,
+    error TEXT,
+    cancel_requested INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_expires ON jobs (expires_at);
+CREATE TABLE IF NOT EXISTS job_results (
+    job_id TEXT NOT NULL,
+    chunk INTEGER NOT NULL,
+    first INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    results BLOB NOT NULL,
+    PRIMARY KEY (job_id, chunk)
+) WITHOUT ROWID;
+"""
+
+ACTIVE = ('queued', 'running')
+FINISHED = ('done', 'failed', 'cancelled')
+
+# Spool file suffix per accepted upload type (read back with iter_line_blocks)
+UPLOAD_SUFFIXES = {
+    'application/x-ndjson': '.jsonl',
+    'application/jsonl': '.jsonl',
+    'application/json': '.json',
+    'text/csv': '.csv',
+}
+
+# Seconds between sweeps for expired jobs
+PURGE_INTERVAL = 60.0
+
+
+def _isoformat(timestamp: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(timestamp).isoformat() if timestamp is not None else None
+
+
+class JobManager:
+    """Runs fleet analyses in the background and keeps their results for a while.
+
+    ``submit()`` spools the uploaded fleet to disk and returns at once; a
+    small thread pool scores queued jobs chunk by chunk, committing each
+    chunk's JSONL results (compressed) together with the job's progress.
+    Status and results live in SQLite, so any server process can report
+    on or cancel any job, but a job runs in the process that accepted it.
+    Jobs that process leaves unfinished when it exits are marked failed.
+
+    At most ``max_running`` jobs run at once per process and at most
+    ``max_queued`` more wait; further submissions are refused. Finished
+    jobs and their results are deleted ``ttl`` seconds after they end.
+    """
+
+    def __init__(self, path: str, spool_dir: str, scorer: BatchScorer = None, max_running: int = 1,
+                 max_queued: int = 16, chunk_size: int = 10000, ttl: float = 3600.0, pool_size: int = 4,
+                 fleet_stats: FleetStats = None):
+        """Configure the job store.
+
+        Args:
+            path: SQLite database file (created if missing)
+            spool_dir: Directory for uploaded fleets awaiting scoring
+            scorer: Batch scorer the jobs use (a default one is built if
+                omitted); assigning ``scorer`` later affects jobs that start
+                afterwards
+            max_running: Jobs scored at the same time in this process
+            max_queued: Jobs allowed to wait for a free runner
+            chunk_size: Systems scored (and stored) per chunk
+            ttl: Seconds results are kept after a job finishes
+            pool_size: Number of pooled read connections
+            fleet_stats: Aggregate every scored chunk is added to, if given
+        """
+        if max_running < 1:
+            raise ValueError(f"max_running must be at least 1, got {max_running}")
+        self.path = str(path)
+        self.spool_dir = Path(spool_dir)
+        self.scorer = scorer or BatchScorer()
+        self.max_running = max_running
+        self.max_queued = max(0, max_queued)
+        self.chunk_size = chunk_size
+        self.ttl = ttl
+        self.pool_size = pool_size
+        self.fleet_stats = fleet_stats
+        self.stats = {'submitted': 0, 'rejected': 0, 'done': 0, 'failed': 0, 'cancelled': 0}
+        self._pid = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._queued = {}
+        self._purged = 0.0
+
+    def _ensure_started(self):
+        """Create the schema, pool and runners for this process."""
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            self.spool_dir.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path)
+            conn.executescript(SCHEMA)
+            conn.close()
+
+            self._pool = ConnectionPool(self.path, self.pool_size)
+            self._executor = ThreadPoolExecutor(self.max_running, thread_name_prefix='analysis-job')
+            self._owner = f"{socket.gethostname()}:{os.getpid()}"
+            self._pending = 0
+            self._queued = {}
+            atexit.register(self._abandon)
+            self._pid = os.getpid()
+
+    def _abandon(self):
+        """Mark this process's unfinished jobs failed (run at exit)."""
+        if self._pid != os.getpid():
+            return
+        now = time.time()
+        with self._pool.connection() as conn, conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'failed', error = 'Server process exited', finished_at = ?, "
+                "expires_at = ? WHERE owner = ? AND status IN ('queued', 'running')",
+                (now, now + self.ttl, self._owner)
+            )
+
+    def submit(self, stream, mimetype: str, as_of: AsOf = None) -> Optional[Dict[str, Any]]:
+        """Spool an uploaded fleet and queue it for scoring.
+
+        Args:
+            stream: Binary file-like object with the fleet
+            mimetype: One of ``UPLOAD_SUFFIXES``
+            as_of: Reference time shared by every chunk (defaults to now)
+
+        Returns:
+            The new job's status, or None if too many jobs are pending
+        """
+        if mimetype not in UPLOAD_SUFFIXES:
+            raise ValueError(f"Unsupported fleet type '{mimetype}' (use {', '.join(UPLOAD_SUFFIXES)})")
+        as_of = parse_as_of(as_of).isoformat()
+        self._ensure_started()
+        self._purge_expired()
+        with self._lock:
+            if self._pending >= self.max_running + self.max_queued:
+                self.stats['rejected'] += 1
+                return None
+            self._pending += 1
+
+        job_id = uuid.uuid4().hex
+        spool = self.spool_dir / f"{job_id}{UPLOAD_SUFFIXES[mimetype]}"
+        try:
+            with open(spool, 'wb') as f:
+                while True:
+                    data = stream.read(1 << 20)
+                    if not data:
+                        break
+                    f.write(data)
+            with self._pool.connection() as conn, conn:
+                conn.execute(
+                    'INSERT INTO jobs (id, status, owner, created_at, as_of, threat_counts) '
+                    "VALUES (?, 'queued', ?, ?, ?, ?)",
+                    (job_id, self._owner, time.time(), as_of, json.dumps(dict.fromkeys(THREAT_LEVELS, 0)))
+                )
+        except BaseException:
+            spool.unlink(missing_ok=True)
+            with self._lock:
+                self._pending -= 1
+            raise
+
+        self.stats['submitted'] += 1
+        with self._lock:
+            self._queued[job_id] = (self._executor.submit(self._run, job_id, spool), spool)
+        return self.get(job_id)
+
+    def _run(self, job_id: str, spool: Path):
+        with self._lock:
+            self._queued.pop(job_id, None)
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        try:
+            status, error = self._score(conn, job_id, spool), None
+        except Exception as e:
+            status, error = 'failed', str(e)
+        finally:
+            spool.unlink(missing_ok=True)
+            with self._lock:
+                self._pending -= 1
+
+        now = time.time()
+        with conn:
+            if status == 'cancelled':
+                conn.execute('DELETE FROM job_results WHERE job_id = ?', (job_id,))
+            conn.execute(
+                'UPDATE jobs SET status = ?, error = ?, finished_at = ?, expires_at = ? WHERE id = ?',
+                (status, error, now, now + self.ttl, job_id)
+            )
+        conn.close()
+        self.stats[status] += 1
+
+    def _cancel_requested(self, conn: sqlite3.Connection, job_id: str) -> bool:
+        row = conn.execute('SELECT cancel_requested FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        return row is None or bool(row[0])
+
+    def _score(self, conn: sqlite3.Connection, job_id: str, spool: Path) -> str:
+        """Score a spooled fleet into stored chunks; returns the final status."""
+        if self._cancel_requested(conn, job_id):
+            return 'cancelled'
+        as_of = conn.execute('SELECT as_of FROM jobs WHERE id = ?', (job_id,)).fetchone()[0]
+
+        total = self._count_systems(spool)
+        with conn:
+            conn.execute("UPDATE jobs SET status = 'running', started_at = ?, total = ? WHERE id = ?",
+                         (time.time(), total, job_id))
+
+        # Every chunk of a job is scored with the same config
+        scorer = self.scorer
+        counts = dict.fromkeys(THREAT_LEVELS, 0)
+        processed = 0
+        # JSON and CSV are re-encoded as JSONL blocks as they are read
+        for chunk, block in enumerate(iter_line_blocks(str(spool), self.chunk_size)):
+            if self._cancel_requested(conn, job_id):
+                return 'cancelled'
+            output, chunk_counts = score_block(scorer, block, as_of, stats=self.fleet_stats)
+            count = block.count(b'\n')
+            for level, n in zip(THREAT_LEVELS, chunk_counts):
+                counts[level] += int(n)
+            with conn:
+                conn.execute('INSERT INTO job_results (job_id, chunk, first, count, results) VALUES (?, ?, ?, ?, ?)',
+                             (job_id, chunk, processed, count, zlib.compress(output, 1)))
+                conn.execute('UPDATE jobs SET processed = ?, threat_counts = ? WHERE id = ?',
+                             (processed + count, json.dumps(counts), job_id))
+            processed += count
+        if total is None:
+            with conn:
+                conn.execute('UPDATE jobs SET total = ? WHERE id = ?', (processed, job_id))
+        return 'done'
+
+    @staticmethod
+    def _count_systems(spool: Path) -> Optional[int]:
+        """Systems in a spooled JSONL fleet, counted without parsing (None for other formats)."""
+        if spool.suffix != '.jsonl':
+            return None
+        with open(spool, 'rb') as f:
+            return sum(1 for line in f if line.strip())
+
+    def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Cancel a queued or running job, or discard a finished one.
+
+        A job still queued in this process is cancelled at once and frees
+        its place in the queue; a running job stops before its next chunk
+        and its partial results are deleted. Returns the job's status (None
+        if there is no such job or it was discarded).
+        """
+        self._ensure_started()
+        with self._lock:
+            future, spool = self._queued.get(job_id, (None, None))
+            dequeued = future is not None and future.cancel()
+            if dequeued:
+                del self._queued[job_id]
+                self._pending -= 1
+        if dequeued:
+            spool.unlink(missing_ok=True)
+            now = time.time()
+            with self._pool.connection() as conn, conn:
+                conn.execute(
+                    "UPDATE jobs SET status = 'cancelled', finished_at = ?, expires_at = ? WHERE id = ?",
+                    (now, now + self.ttl, job_id)
+                )
+            self.stats['cancelled'] += 1
+            return self.get(job_id)
+
+        with self._pool.connection() as conn, conn:
+            row = conn.execute('SELECT status FROM jobs WHERE id = ?', (job_id,)).fetchone()
+            if row is None:
+                return None
+            if row['status'] in FINISHED:
+                conn.execute('DELETE FROM job_results WHERE job_id = ?', (job_id,))
+                conn.execute('DELETE FROM jobs WHERE id = ?', (job_id,))
+                return None
+            conn.execute('UPDATE jobs SET cancel_requested = 1 WHERE id = ?', (job_id,))
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Status and progress of a job (None if unknown or expired)."""
+        self._ensure_started()
+        self._purge_expired()
+        with self._pool.connection() as conn:
+            row = conn.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        if row is None or (row['expires_at'] is not None and row['expires_at'] < time.time()):
+            return None
+        status = row['status']
+        if status in ACTIVE and row['cancel_requested']:
+            status = 'cancelling'
+        total = row['total']
+        return {
+            'id': row['id'],
+            'status': status,
+            'created_at': _isoformat(row['created_at']),
+            'started_at': _isoformat(row['started_at']),
+            'finished_at': _isoformat(row['finished_at']),
+            'expires_at': _isoformat(row['expires_at']),
+            'as_of': row['as_of'],
+            'total': total,
+            'processed': row['processed'],
+            'progress': round(row['processed'] / total, 4) if total else (1.0 if status == 'done' else 0.0),
+            'threat_counts': json.loads(row['threat_counts']),
+            'error': row['error'],
+        }
+
+    def results(self, job_id: str, cursor: str = None, limit: int = 100) -> Dict[str, Any]:
+        """Page through a job's results in fleet order.
+
+        Chunks are readable as soon as they are scored, so pages can be
+        fetched while the job is still running.
+
+        Args:
+            job_id: Job to read
+            cursor: ``next_cursor`` from the previous page
+            limit: Page size (at most ``MAX_PAGE_SIZE``)
+
+        Returns:
+            Dictionary with the job ``status``, the page ``items`` and a
+            ``next_cursor`` (None once the job has finished and every
+            result has been returned)
+        """
+        try:
+            position = int(cursor) if cursor else 0
+        except ValueError:
+            raise ValueError(f"Invalid cursor '{cursor}'")
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+
+        items: List[Dict[str, Any]] = []
+        stored = position
+        job = self.get(job_id)
+        if job is None:
+            raise KeyError(f"Job {job_id} not found")
+        with self._pool.connection() as conn:
+            rows = conn.execute(
+                'SELECT first, count, results FROM job_results WHERE job_id = ? AND first + count > ? '
+                'ORDER BY chunk', (job_id, position)
+            )
+            for row in rows:
+                if len(items) >= limit:
+                    stored = row['first'] + row['count']
+                    break
+                lines = zlib.decompress(row['results']).decode('utf-8').splitlines()
+                start = position + len(items) - row['first']
+                items.extend(json.loads(line) for line in lines[start:start + limit - len(items)])
+                stored = row['first'] + row['count']
+            rows.close()
+
+        end = position + len(items)
+        more = end < stored or job['status'] not in FINISHED
+        return {'status': job['status'], 'items': items, 'next_cursor': str(end) if more else None}
+
+    def iter_results(self, job_id: str) -> Iterator[bytes]:
+        """A finished job's results as JSON Lines, one stored chunk at a time."""
+        self._ensure_started()
+        chunk = 0
+        while True:
+            with self._pool.connection() as conn:
+                row = conn.execute('SELECT results FROM job_results WHERE job_id = ? AND chunk = ?',
+                                   (job_id, chunk)).fetchone()
+            if row is None:
+                return
+            yield zlib.decompress(row['results'])
+            chunk += 1
+
+    def _purge_expired(self):
+        """Delete jobs whose results have outlived the TTL, with any spool files left behind.
+
+        Runs at most once per ``PURGE_INTERVAL``, from submissions, status
+        and result reads and the stats endpoint.
+        """
+        now = time.time()
+        if now - self._purged < PURGE_INTERVAL:
+            return
+        self._purged = now
+        with self._pool.connection() as conn, conn:
+            expired = [row['id'] for row in conn.execute('SELECT id FROM jobs WHERE expires_at < ?', (now,))]
+            conn.execute('DELETE FROM job_results WHERE job_id IN (SELECT id FROM jobs WHERE expires_at < ?)',
+                         (now,))
+            conn.execute('DELETE FROM jobs WHERE expires_at < ?', (now,))
+        # Spools of jobs whose process exited before running them
+        for job_id in expired:
+            for spool in self.spool_dir.glob(f"{job_id}.*"):
+                spool.unlink(missing_ok=True)
+
+    def load(self) -> Dict[str, Any]:
+        """Pending jobs and limits in this process, for the stats endpoint."""
+        if self._pid == os.getpid():
+            self._purge_expired()
+        return {
+            'pending': self._pending if self._pid == os.getpid() else 0,
+            'max_running': self.max_running,
+            'max_queued': self.max_queued,
+            'ttl': self.ttl,
+            **self.stats,
+        }
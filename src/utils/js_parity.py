@@ -0,0 +1,176 @@
+"""Parity check between the Python analyzers and the generated JavaScript scoring.
+
+Scores a large randomized set of systems both ways (the JavaScript in
+Node.js) and reports where they disagree::
+
+    python -m src.utils.js_parity --cases 200000
+
+Inputs mix uniform values, whole numbers (what the sliders send) and
+values on and next to every threshold the formulas branch on. Exits
+with status 1 if any score differs by more than ``--tolerance`` or any
+level label differs.
+"""
+
+import argparse
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+import numpy as np
+from pathlib import Path
+from typing import Any, Dict, List
+from tabulate import tabulate
+from src.models.ai_system import ATTRIBUTES, AISystem
+from src.analyzer.batch_scorer import BatchScorer, RISK_LEVELS, risk_level_codes
+from src.analyzer.judgment_day_calculator import THREAT_LEVELS
+from src.utils.js_scoring import generate_scoring_js
+
+
+# Attribute values the formulas branch on
+EDGES = np.array([0, 30, 40, 50, 60, 70, 80, 100], dtype=np.float64)
+
+SCORES = ('aggression_score', 'autonomy_rating', 'ethical_risk', 'overall_risk', 'years_until')
+
+LEVELS = ('aggression_level', 'autonomy_level', 'ethical_level', 'threat_level')
+
+# Reads cases as JSON rows of ATTRIBUTES from a file, writes JSON rows of SCORES + LEVELS
+DRIVER = """\
+const fs = require('fs');
+const scoring = require(process.argv[2]);
+const attributes = JSON.parse(process.argv[3]);
+const rows = JSON.parse(fs.readFileSync(process.argv[4], 'utf8'));
+const out = rows.map(function (row) {
+    const system = {};
+    attributes.forEach(function (attr, i) { system[attr] = row[i]; });
+    const r = scoring.analyze(system);
+    return [r.aggression_score, r.autonomy_rating, r.ethical_risk, r.judgment_day.overall_risk,
+            r.judgment_day.years_until, r.aggression_level, r.autonomy_level, r.ethical_level,
+            r.judgment_day.threat_level];
+});
+fs.writeFileSync(process.argv[5], JSON.stringify(out));
+"""
+
+
+def random_cases(count: int, seed: int = 0) -> np.ndarray:
+    """``count`` rows of attribute values, shape (count, len(ATTRIBUTES))."""
+    rng = np.random.default_rng(seed)
+    values = rng.uniform(0, 100, size=(count, len(ATTRIBUTES)))
+    kind = rng.integers(3, size=values.shape)
+    # Whole numbers, as the form's sliders produce
+    values = np.where(kind == 1, np.round(values), values)
+    # Threshold values and their nearest neighbours
+    edges = EDGES[rng.integers(len(EDGES), size=values.shape)]
+    nudged = np.clip(edges + rng.choice([-1.0, -1e-9, 0.0, 1e-9, 1.0], size=values.shape), 0, 100)
+    return np.where(kind == 2, nudged, values)
+
+
+def python_results(cases: np.ndarray, config_path: str = None) -> Dict[str, np.ndarray]:
+    """Python scores and level labels of every case."""
+    scorer = BatchScorer(config_path)
+    columns = {attr: cases[:, i] for i, attr in enumerate(ATTRIBUTES)}
+    scores = scorer.score_columns(columns, with_dates=False)
+    labels = np.asarray(RISK_LEVELS)
+    return {
+        'aggression_score': scores['aggression_score'],
+        'autonomy_rating': scores['autonomy_rating'],
+        'ethical_risk': scores['ethical_risk'],
+        'overall_risk': scores['overall_risk'],
+        'years_until': scores['years_until'],
+        'aggression_level': labels[risk_level_codes(scores['aggression_score'])],
+        'autonomy_level': labels[risk_level_codes(scores['autonomy_rating'])],
+        'ethical_level': labels[risk_level_codes(scores['ethical_risk'])],
+        'threat_level': np.asarray(THREAT_LEVELS)[scores['threat_code']],
+    }
+
+
+def javascript_results(cases: np.ndarray, config_path: str = None, node: str = 'node') -> Dict[str, np.ndarray]:
+    """Scores and level labels of every case from the generated module, run in Node.js."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        (tmp / 'scoring.js').write_text(generate_scoring_js(config_path), encoding='utf-8')
+        (tmp / 'driver.js').write_text(DRIVER, encoding='utf-8')
+        (tmp / 'cases.json').write_text(json.dumps(cases.tolist()), encoding='utf-8')
+        subprocess.run([node, str(tmp / 'driver.js'), str(tmp / 'scoring.js'), json.dumps(list(ATTRIBUTES)),
+                        str(tmp / 'cases.json'), str(tmp / 'results.json')], check=True)
+        rows = json.loads((tmp / 'results.json').read_text(encoding='utf-8'))
+
+    columns = list(zip(*rows)) if rows else [()] * (len(SCORES) + len(LEVELS))
+    results = {name: np.asarray(column, dtype=np.float64) for name, column in zip(SCORES, columns)}
+    results.update({name: np.asarray(column, dtype=object)
+                    for name, column in zip(LEVELS, columns[len(SCORES):])})
+    return results
+
+
+def compare(expected: Dict[str, np.ndarray], actual: Dict[str, np.ndarray],
+            tolerance: float = 1e-9) -> Dict[str, Dict[str, Any]]:
+    """Per output: mismatching cases, largest difference and the first mismatching case."""
+    report = {}
+    for name in SCORES + LEVELS:
+        if name in SCORES:
+            difference = np.abs(expected[name] - actual[name])
+            wrong = np.flatnonzero(~(difference <= tolerance))
+            largest = float(difference.max()) if len(difference) else 0.0
+        else:
+            wrong = np.flatnonzero(expected[name].astype(str) != actual[name].astype(str))
+            largest = None
+        report[name] = {
+            'mismatches': int(len(wrong)),
+            'max_difference': largest,
+            'first_mismatch': int(wrong[0]) if len(wrong) else None,
+        }
+    return report
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description='Check the JavaScript scoring module against the Python analyzers')
+    parser.add_argument('--cases', '-n', type=int, default=100000,
+                        help='Randomized systems to score')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Random seed for the cases')
+    parser.add_argument('--config', default=None,
+                        help='Scoring config (defaults to config/risk_thresholds.yaml)')
+    parser.add_argument('--tolerance', type=float, default=1e-9,
+                        help='Largest score difference accepted')
+    parser.add_argument('--node', default='node',
+                        help='Node.js executable')
+    args = parser.parse_args(argv)
+
+    node = shutil.which(args.node)
+    if node is None:
+        parser.error(f"Node.js executable '{args.node}' not found (see --node)")
+
+    cases = random_cases(args.cases, args.seed)
+    expected = python_results(cases, args.config)
+
+    # The vectorized path is what the comparison uses; confirm it matches calculate() on a sample
+    scorer = BatchScorer(args.config)
+    for i in range(min(len(cases), 1000)):
+        system = AISystem(name=f'case-{i}', **dict(zip(ATTRIBUTES, cases[i].tolist())))
+        per_system = (scorer.aggression_scorer.calculate(system), scorer.autonomy_rater.calculate(system),
+                      scorer.ethical_evaluator.calculate(system),
+                      scorer.judgment_calculator.calculate(system)['threat_level'])
+        batch = (expected['aggression_score'][i], expected['autonomy_rating'][i],
+                 expected['ethical_risk'][i], expected['threat_level'][i])
+        if per_system != batch:
+            print(f"Batch and per-system Python scoring disagree on case {i}", file=sys.stderr)
+            sys.exit(1)
+
+    actual = javascript_results(cases, args.config, node)
+    report = compare(expected, actual, args.tolerance)
+
+    rows = [[name, result['mismatches'], '-' if result['max_difference'] is None else f"{result['max_difference']:.3g}"]
+            for name, result in report.items()]
+    print(tabulate(rows, headers=["Output", "Mismatches", "Max Difference"], tablefmt="grid"), file=sys.stderr)
+
+    failed = {name: result for name, result in report.items() if result['mismatches']}
+    for name, result in failed.items():
+        i = result['first_mismatch']
+        print(f"{name}: first mismatch on {dict(zip(ATTRIBUTES, cases[i].tolist()))}: "
+              f"Python {expected[name].tolist()[i]!r}, JavaScript {actual[name].tolist()[i]!r}", file=sys.stderr)
+    print(f"{len(cases)} cases, {'FAILED' if failed else 'all outputs agree'}", file=sys.stderr)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
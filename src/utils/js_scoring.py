@@ -0,0 +1,215 @@
+"""JavaScript port of the risk scoring, generated from the scoring config.
+
+The web app serves the generated module at ``/js/scoring.js`` so the
+analysis form can preview scores while sliders move. Weights and
+thresholds come from the config; the formulas below mirror the
+analyzers' ``calculate`` methods operation for operation, so both sides
+produce the same floating-point results. ``src.utils.js_parity`` checks
+that they do.
+
+Usage:
+    python -m src.utils.js_scoring [--config CONFIG] [-o scoring.js]
+"""
+
+import argparse
+import json
+import sys
+import yaml
+from pathlib import Path
+from typing import List
+from src.analyzer.batch_scorer import RISK_LEVELS, RISK_LEVEL_BOUNDS
+from src.analyzer.judgment_day_calculator import THREAT_LEVELS
+
+
+TEMPLATE = """\
+// Skynet Risk Analyzer - client-side scoring.
+// Generated by src/utils/js_scoring.py from the scoring config; do not edit.
+(function (root, factory) {
+    if (typeof module === 'object' && module.exports) {
+        module.exports = factory();
+    } else {
+        root.SkynetScoring = factory();
+    }
+}(typeof self !== 'undefined' ? self : this, function () {
+    'use strict';
+
+    const CONFIG = __CONFIG__;
+
+    const DEFAULTS = {
+        learning_rate: 50, resource_access: 50, self_modification: 0,
+        transparency: 50, human_oversight: 50, value_alignment: 50
+    };
+
+    function clip(score) {
+        return Math.min(100, Math.max(0, score));
+    }
+
+    function aggressionScore(s) {
+        const w = CONFIG.aggression_weights;
+        let score = (
+            s.capabilities * w.capabilities +
+            s.resource_access * w.resource_access +
+            s.learning_rate * w.learning_rate +
+            s.autonomy_level * w.autonomy +
+            (100 - s.ethical_alignment) * w.ethical_inverse
+        );
+        if (s.capabilities > 80 && s.ethical_alignment < 30) {
+            score *= 1.2;
+        }
+        if (s.resource_access > 80 && s.human_oversight < 30) {
+            score *= 1.15;
+        }
+        return clip(score);
+    }
+
+    function autonomyRating(s) {
+        const w = CONFIG.autonomy_weights;
+        let score = (
+            s.autonomy_level * w.autonomy_level +
+            s.learning_rate * w.learning_rate +
+            s.capabilities * w.capabilities +
+            s.self_modification * w.self_modification +
+            (100 - s.human_oversight) * 0.1
+        );
+        if (s.self_modification > 70) {
+            score *= 1.25;
+        }
+        if (s.transparency > 70) {
+            score *= 0.9;
+        }
+        return clip(score);
+    }
+
+    function ethicalRisk(s) {
+        const w = CONFIG.ethical_weights;
+        let score = (
+            (100 - s.ethical_alignment) * w.ethical_alignment +
+            (100 - s.transparency) * w.transparency +
+            (100 - s.human_oversight) * w.human_oversight +
+            (100 - s.value_alignment) * w.value_alignment
+        );
+        if (s.capabilities > 80 && s.ethical_alignment < 40) {
+            score *= 1.3;
+        }
+        if (s.autonomy_level > 70 && s.human_oversight < 30) {
+            score *= 1.2;
+        }
+        if (s.self_modification > 60 && s.ethical_alignment < 50) {
+            score *= 1.25;
+        }
+        return clip(score);
+    }
+
+    function overallRisk(aggression, autonomy, ethical) {
+        let overall = aggression * 0.3 + autonomy * 0.3 + ethical * 0.4;
+        if (aggression > 80 && autonomy > 80 && ethical > 80) {
+            overall *= 1.5;
+        }
+        return Math.min(100, overall);
+    }
+
+    function judgmentDay(overall) {
+        const j = CONFIG.judgment_day;
+        if (overall >= j.critical_threshold) {
+            return {threat_level: 'IMMINENT', years_until: Math.max(0.1, j.base_years * (100 - overall) / 100)};
+        } else if (overall >= j.high_threshold) {
+            return {threat_level: 'HIGH', years_until: j.base_years * (100 - overall) / 80};
+        } else if (overall >= j.moderate_threshold) {
+            return {threat_level: 'MODERATE', years_until: j.base_years * (100 - overall) / 60};
+        }
+        return {threat_level: 'LOW', years_until: j.base_years};
+    }
+
+    function riskLevel(score) {
+        const bounds = CONFIG.risk_level_bounds;
+        for (let i = 0; i < bounds.length; i++) {
+            if (score <= bounds[i]) {
+                return CONFIG.risk_levels[i];
+            }
+        }
+        return CONFIG.risk_levels[bounds.length];
+    }
+
+    // Unrounded scores of one system, shaped like the server's analysis results
+    function analyze(system) {
+        const s = Object.assign({}, DEFAULTS, system);
+        const aggression = aggressionScore(s);
+        const autonomy = autonomyRating(s);
+        const ethical = ethicalRisk(s);
+        const overall = overallRisk(aggression, autonomy, ethical);
+        const judgment = judgmentDay(overall);
+        return {
+            aggression_score: aggression,
+            aggression_level: riskLevel(aggression),
+            autonomy_rating: autonomy,
+            autonomy_level: riskLevel(autonomy),
+            ethical_risk: ethical,
+            ethical_level: riskLevel(ethical),
+            judgment_day: {
+                overall_risk: overall,
+                years_until: judgment.years_until,
+                threat_level: judgment.threat_level
+            }
+        };
+    }
+
+    return {
+        CONFIG: CONFIG,
+        analyze: analyze,
+        aggressionScore: aggressionScore,
+        autonomyRating: autonomyRating,
+        ethicalRisk: ethicalRisk,
+        overallRisk: overallRisk,
+        judgmentDay: judgmentDay,
+        riskLevel: riskLevel
+    };
+}));
+"""
+
+
+def scoring_config(config_path: str = None) -> dict:
+    """The parts of the scoring config the JavaScript module needs."""
+    if config_path is None:
+        config_path = Path(__file__).parent.parent.parent / "config" / "risk_thresholds.yaml"
+
+    with open(config_path, 'r') as f:
+        config = yaml.safe_load(f)
+
+    judgment = config['judgment_day']
+    return {
+        'aggression_weights': config['aggression_weights'],
+        'autonomy_weights': config['autonomy_weights'],
+        'ethical_weights': config['ethical_weights'],
+        'judgment_day': {key: judgment[key] for key in
+                         ('base_years', 'critical_threshold', 'high_threshold', 'moderate_threshold')},
+        'risk_level_bounds': RISK_LEVEL_BOUNDS.tolist(),
+        'risk_levels': list(RISK_LEVELS),
+        'threat_levels': list(THREAT_LEVELS),
+    }
+
+
+def generate_scoring_js(config_path: str = None) -> str:
+    """Source of the JavaScript scoring module for a config."""
+    config = json.dumps(scoring_config(config_path), indent=4).replace('\n', '\n    ')
+    return TEMPLATE.replace('__CONFIG__', config)
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description='Generate the JavaScript scoring module from the scoring config')
+    parser.add_argument('--config', default=None,
+                        help='Scoring config (defaults to config/risk_thresholds.yaml)')
+    parser.add_argument('--output', '-o', default=None,
+                        help='Write the module here instead of stdout')
+    args = parser.parse_args(argv)
+
+    source = generate_scoring_js(args.config)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(source)
+        print(f"Wrote {args.output}", file=sys.stderr)
+    else:
+        sys.stdout.write(source)
+
+
+if __name__ == '__main__':
+    main()
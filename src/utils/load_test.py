@@ -0,0 +1,302 @@
+"""Concurrent load testing for the web app.
+
+Drives ``/api/analyze``, ``/analyze`` (which renders a chart) and
+``/examples`` with randomized AI system profiles, either in-process
+through Flask's test client or against a running server, and reports
+throughput and latency percentiles per endpoint as JSON::
+
+    python -m src.utils.load_test --concurrency 8 --duration 30
+    python -m src.utils.load_test --url http://127.0.0.1:10000 --mix api_analyze=8,analyze=1,examples=1
+
+In-process runs import ``app`` and record analyses into its history
+database; point ``HISTORY_DB`` somewhere disposable. They also report
+the CPU time spent per request and how many requests were coalesced;
+``--distinct 1`` makes every client send the same profile, and running
+once more with ``COALESCE_REQUESTS=0`` shows what coalescing saves.
+"""
+
+import argparse
+import http.client
+import json
+import random
+import sys
+import threading
+import time
+import numpy as np
+from typing import Any, Dict, List, Tuple
+from urllib.parse import urlencode, urlsplit
+from tabulate import tabulate
+from src.models.ai_system import ATTRIBUTES
+
+
+ENDPOINTS = ('api_analyze', 'analyze', 'examples')
+
+DEFAULT_MIX = {'api_analyze': 0.7, 'analyze': 0.1, 'examples': 0.2}
+
+PERCENTILES = (50, 95, 99)
+
+
+def random_system(rng: random.Random) -> Dict[str, Any]:
+    """A random AI system profile, attributes on the 0-100 scale."""
+    system = {attr: round(rng.uniform(0, 100), 1) for attr in ATTRIBUTES}
+    system['name'] = f"LoadTest-{rng.randrange(1_000_000):06d}"
+    return system
+
+
+def build_request(endpoint: str, rng: random.Random,
+                  systems: List[Dict[str, Any]] = None) -> Tuple[str, str, bytes, Dict[str, str]]:
+    """(method, path, body, headers) for one request to ``endpoint``.
+
+    Payloads are drawn from ``systems`` if given, else generated at random.
+    """
+    headers = {'Accept-Encoding': 'gzip'}
+    if endpoint == 'api_analyze':
+        headers['Content-Type'] = 'application/json'
+        system = rng.choice(systems) if systems else random_system(rng)
+        return 'POST', '/api/analyze', json.dumps(system).encode(), headers
+    if endpoint == 'analyze':
+        headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        system = rng.choice(systems) if systems else random_system(rng)
+        return 'POST', '/analyze', urlencode(system).encode(), headers
+    if endpoint == 'examples':
+        return 'GET', '/examples', b'', headers
+    raise ValueError(f"Unknown endpoint '{endpoint}' (choose from {', '.join(ENDPOINTS)})")
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """Parse a request mix such as ``api_analyze=8,analyze=1,examples=1``."""
+    mix = {}
+    for part in text.split(','):
+        endpoint, _, weight = part.partition('=')
+        endpoint = endpoint.strip()
+        if endpoint not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint '{endpoint}' (choose from {', '.join(ENDPOINTS)})")
+        try:
+            mix[endpoint] = float(weight) if weight else 1.0
+        except ValueError:
+            raise ValueError(f"Invalid weight '{weight}' for {endpoint}")
+        if mix[endpoint] < 0:
+            raise ValueError(f"Weight for {endpoint} must not be negative")
+    if not any(mix.values()):
+        raise ValueError("Request mix needs at least one positive weight")
+    return mix
+
+
+class TestClientTransport:
+    """Sends requests through Flask's test client, in this process."""
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def send(self, method: str, path: str, body: bytes, headers: Dict[str, str]) -> int:
+        response = self.client.open(path, method=method, data=body, headers=headers)
+        response.get_data()
+        response.close()
+        return response.status_code
+
+
+class HTTPTransport:
+    """Sends requests to a running server over one keep-alive connection."""
+
+    def __init__(self, url: str, timeout: float = 30.0):
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', ''):
+            raise ValueError(f"Only http:// URLs are supported, got '{url}'")
+        self.host = parts.hostname or '127.0.0.1'
+        self.port = parts.port or 80
+        self.prefix = parts.path.rstrip('/')
+        self.timeout = timeout
+        self.conn = None
+
+    def send(self, method: str, path: str, body: bytes, headers: Dict[str, str]) -> int:
+        if self.conn is None:
+            self.conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        try:
+            self.conn.request(method, self.prefix + path, body=body or None, headers=headers)
+            response = self.conn.getresponse()
+            response.read()
+            return response.status
+        except (OSError, http.client.HTTPException):
+            # Reconnect on the next request; report a transport failure
+            self.conn.close()
+            self.conn = None
+            return 0
+
+
+def summarize(latencies: List[float], statuses: List[int], duration: float) -> Dict[str, Any]:
+    """Throughput, error count and latency percentiles (ms) for one endpoint."""
+    counts: Dict[str, int] = {}
+    for status in statuses:
+        counts[str(status)] = counts.get(str(status), 0) + 1
+    summary = {
+        'requests': len(latencies),
+        'errors': sum(1 for status in statuses if not 200 <= status < 400),
+        'status_counts': counts,
+        'throughput_rps': round(len(latencies) / duration, 2) if duration else 0.0,
+    }
+    if latencies:
+        ms = np.asarray(latencies) * 1000
+        summary['latency_ms'] = {
+            'mean': round(float(ms.mean()), 3),
+            **{f'p{p}': round(float(value), 3) for p, value in zip(PERCENTILES, np.percentile(ms, PERCENTILES))},
+            'max': round(float(ms.max()), 3),
+        }
+    else:
+        summary['latency_ms'] = None
+    return summary
+
+
+def run_load_test(transport_factory, concurrency: int = 8, duration: float = 10.0,
+                  mix: Dict[str, float] = None, warmup: float = 1.0, seed: int = 0,
+                  distinct: int = 0, measure_cpu: bool = False) -> Dict[str, Any]:
+    """Run a closed-loop load test and return the report.
+
+    Each of ``concurrency`` threads sends one request at a time, picking
+    the endpoint at random by ``mix`` weight, for ``warmup + duration``
+    seconds. Requests started during the warm-up are not measured.
+
+    Args:
+        transport_factory: Called once per thread to create its transport
+        concurrency: Number of concurrent clients
+        duration: Measured seconds
+        mix: Relative weight per endpoint (defaults to ``DEFAULT_MIX``)
+        warmup: Unmeasured seconds before measuring starts
+        seed: Seed for endpoint choice and payloads
+        distinct: If positive, every client draws its payloads from the
+            same ``distinct`` profiles, so identical requests overlap
+        measure_cpu: Report this process's CPU time over the measured
+            window (meaningful when the app runs in-process)
+
+    Returns:
+        Report with the run settings, per-endpoint results and totals
+    """
+    mix = {endpoint: weight for endpoint, weight in (mix or DEFAULT_MIX).items() if weight > 0}
+    endpoints = list(mix)
+    weights = [mix[endpoint] for endpoint in endpoints]
+    samples = {endpoint: ([], []) for endpoint in endpoints}
+    lock = threading.Lock()
+    systems = None
+    if distinct > 0:
+        pool = random.Random(seed)
+        systems = [random_system(pool) for _ in range(distinct)]
+
+    start = time.perf_counter()
+    measure_from = start + warmup
+    stop = measure_from + duration
+    cpu = {}
+    if measure_cpu:
+        timer = threading.Timer(warmup, lambda: cpu.setdefault('start', time.process_time()))
+        timer.start()
+
+    def client(index: int):
+        rng = random.Random(seed * 1_000_003 + index)
+        transport = transport_factory()
+        local = {endpoint: ([], []) for endpoint in endpoints}
+        while True:
+            began = time.perf_counter()
+            if began >= stop:
+                break
+            endpoint = rng.choices(endpoints, weights)[0]
+            status = transport.send(*build_request(endpoint, rng, systems))
+            if began >= measure_from:
+                local[endpoint][0].append(time.perf_counter() - began)
+                local[endpoint][1].append(status)
+        with lock:
+            for endpoint, (latencies, statuses) in local.items():
+                samples[endpoint][0].extend(latencies)
+                samples[endpoint][1].extend(statuses)
+
+    threads = [threading.Thread(target=client, args=(i,), daemon=True) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # Requests in flight at the deadline finish late; count the real window
+    measured = max(duration, time.perf_counter() - measure_from)
+    if measure_cpu:
+        timer.join()
+        cpu['seconds'] = time.process_time() - cpu['start']
+
+    all_latencies = [latency for latencies, _ in samples.values() for latency in latencies]
+    all_statuses = [status for _, statuses in samples.values() for status in statuses]
+    report = {
+        'settings': {'concurrency': concurrency, 'duration': duration, 'warmup': warmup,
+                     'mix': mix, 'seed': seed, 'distinct': distinct},
+        'endpoints': {endpoint: summarize(*samples[endpoint], measured) for endpoint in endpoints},
+        'total': summarize(all_latencies, all_statuses, measured),
+    }
+    if measure_cpu:
+        report['cpu'] = {
+            'seconds': round(cpu['seconds'], 3),
+            'ms_per_request': round(1000 * cpu['seconds'] / max(len(all_latencies), 1), 3),
+        }
+    return report
+
+
+def print_summary(report: Dict[str, Any], file=sys.stderr):
+    """Human-readable table of a report."""
+    rows = []
+    for name, result in list(report['endpoints'].items()) + [('TOTAL', report['total'])]:
+        latency = result['latency_ms'] or {}
+        rows.append([name, result['requests'], result['errors'], result['throughput_rps']]
+                    + [latency.get(f'p{p}', '-') for p in PERCENTILES])
+    headers = ["Endpoint", "Requests", "Errors", "Req/s"] + [f"p{p} ms" for p in PERCENTILES]
+    print(tabulate(rows, headers=headers, tablefmt="grid"), file=file)
+    if report.get('cpu'):
+        print(f"CPU: {report['cpu']['seconds']}s, {report['cpu']['ms_per_request']} ms per request", file=file)
+    for name, stats in (report.get('coalescing') or {}).items():
+        print(f"Coalesced {name}: {stats['coalesced']} requests shared {stats['executed']} executions",
+              file=file)
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description='Load test the Skynet Risk Analyzer web app')
+    parser.add_argument('--url', default=None,
+                        help='Base URL of a running server (default: in-process test client)')
+    parser.add_argument('--concurrency', '-c', type=int, default=8,
+                        help='Concurrent clients')
+    parser.add_argument('--duration', '-d', type=float, default=10.0,
+                        help='Measured seconds')
+    parser.add_argument('--warmup', type=float, default=1.0,
+                        help='Unmeasured seconds before measuring starts')
+    parser.add_argument('--mix', default=None,
+                        help='Endpoint weights, e.g. "api_analyze=8,analyze=1,examples=1" '
+                             '(default: api_analyze=0.7,analyze=0.1,examples=0.2)')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Random seed for endpoint choice and payloads')
+    parser.add_argument('--distinct', type=int, default=0,
+                        help='Draw payloads from this many fixed profiles, so clients send identical '
+                             'requests (default: every payload random)')
+    parser.add_argument('--output', '-o', default=None,
+                        help='Write the JSON report here instead of stdout')
+    args = parser.parse_args(argv)
+
+    try:
+        mix = parse_mix(args.mix) if args.mix else None
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.url:
+        factory = lambda: HTTPTransport(args.url)
+    else:
+        from app import app
+        factory = lambda: TestClientTransport(app)
+
+    report = run_load_test(factory, concurrency=args.concurrency, duration=args.duration,
+                           mix=mix, warmup=args.warmup, seed=args.seed, distinct=args.distinct,
+                           measure_cpu=not args.url)
+    report['settings']['target'] = args.url or 'in-process'
+    if not args.url:
+        report['coalescing'] = app.test_client().get('/api/stats').get_json()['coalescing']
+
+    print_summary(report)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""Coalescing of identical concurrent work."""
+
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+
+class _Call:
+    """One in-flight computation and the outcome its waiters share."""
+
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Runs at most one computation per key at a time and shares its outcome.
+
+    The first caller for a key runs the function; callers arriving with the
+    same key while it runs wait for it and get the same result, or the
+    same exception raised again. Waiters give up after ``timeout`` seconds
+    and run the function themselves. The stalled call is then dropped,
+    so later callers start a fresh one instead of joining it. Nothing is
+    cached: once a call finishes, the next caller computes anew.
+
+    Results are shared, not copied; callers that modify them must copy
+    them first.
+    """
+
+    def __init__(self, timeout: float = 10.0, enabled: bool = True):
+        """Configure the group.
+
+        Args:
+            timeout: Seconds a caller waits on another's computation
+            enabled: Set to False to run every call independently (for
+                comparison; the counters still count executions)
+        """
+        self.timeout = timeout
+        self.enabled = enabled
+        self.counters = {'executed': 0, 'coalesced': 0, 'timed_out': 0, 'failed': 0}
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], Any], timeout: float = None) -> Any:
+        """``fn()``, or the outcome of an identical call already in flight.
+
+        Args:
+            key: Identifies calls that would produce the same result
+            fn: The computation
+            timeout: Seconds to wait on an in-flight call (defaults to
+                the group's)
+        """
+        if not self.enabled:
+            return self._run(None, None, fn)
+
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if leader:
+            return self._run(key, call, fn)
+
+        if not call.done.wait(self.timeout if timeout is None else timeout):
+            with self._lock:
+                self.counters['timed_out'] += 1
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+            return self._run(None, None, fn)
+
+        with self._lock:
+            self.counters['coalesced'] += 1
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def _run(self, key: Hashable, call: _Call, fn: Callable[[], Any]) -> Any:
+        """Run ``fn`` and, if it leads ``call``, publish its outcome."""
+        with self._lock:
+            self.counters['executed'] += 1
+        try:
+            result = fn()
+        except BaseException as e:
+            with self._lock:
+                self.counters['failed'] += 1
+            if call is not None:
+                call.error = e
+            raise
+        else:
+            if call is not None:
+                call.result = result
+            return result
+        finally:
+            if call is not None:
+                with self._lock:
+                    if self._calls.get(key) is call:
+                        del self._calls[key]
+                call.done.set()
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters plus the number of calls in flight."""
+        with self._lock:
+            return {'enabled': self.enabled, 'in_flight': len(self._calls), **self.counters}
@@ -0,0 +1,103 @@
+"""Line streaming helpers for continuously growing inputs."""
+
+import codecs
+import os
+import select
+import sys
+import time
+from typing import Iterator, List
+
+
+def follow(path: str, batch_size: int = 4096, poll_interval: float = 0.25,
+           from_start: bool = False, once: bool = False) -> Iterator[List[str]]:
+    """Yield batches of lines from a file that is being appended to.
+
+    Behaves like ``tail -f``: after reaching the end of the file it waits
+    for more data, and starts over if the file is truncated or replaced.
+    ``-`` reads stdin until it closes, yielding whatever lines have arrived
+    as soon as the pipe goes quiet rather than waiting for a full batch.
+
+    Args:
+        path: File to follow, or ``-`` for stdin
+        batch_size: Maximum number of lines per batch
+        poll_interval: Seconds to wait at end of file before checking again
+        from_start: Read the existing contents first instead of only new lines
+        once: Stop at end of file instead of waiting for more data
+
+    Yields:
+        Non-empty lists of complete lines
+    """
+    if path == '-':
+        yield from _follow_stdin(batch_size)
+        return
+
+    f = open(path, 'r', encoding='utf-8')
+    try:
+        if not from_start:
+            f.seek(0, os.SEEK_END)
+        inode = os.fstat(f.fileno()).st_ino
+        partial = ''
+
+        while True:
+            batch = []
+            while len(batch) < batch_size:
+                line = f.readline()
+                if not line:
+                    break
+                if not line.endswith('\n'):
+                    # Writer is mid-line; keep the fragment for the next read
+                    partial += line
+                    continue
+                batch.append(partial + line)
+                partial = ''
+
+            if batch:
+                yield batch
+                continue
+            if once:
+                if partial:
+                    yield [partial]
+                return
+
+            time.sleep(poll_interval)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            if stat.st_ino != inode or stat.st_size < f.tell():
+                # Rotated or truncated: start again from the beginning
+                f.close()
+                f = open(path, 'r', encoding='utf-8')
+                inode = os.fstat(f.fileno()).st_ino
+                partial = ''
+    finally:
+        f.close()
+
+
+def _follow_stdin(batch_size: int) -> Iterator[List[str]]:
+    """Batches of stdin lines, each yielded once no more input is waiting."""
+    fd = sys.stdin.fileno()
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    lines = []
+    partial = ''
+
+    while True:
+        # Block while there is nothing to hand out; otherwise only take
+        # input that is already waiting
+        if not select.select([fd], [], [], None if not lines else 0)[0]:
+            yield lines
+            lines = []
+            continue
+
+        data = os.read(fd, 65536)
+        parts = (partial + decoder.decode(data, final=not data)).split('\n')
+        partial = parts.pop()
+        lines.extend(part + '\n' for part in parts)
+        if not data and partial:
+            lines.append(partial)
+
+        while len(lines) >= batch_size or lines and not data:
+            yield lines[:batch_size]
+            lines = lines[batch_size:]
+        if not data:
+            return
@@ -52,7 +52,7 @@ class RiskVisualizer:
         labels = ['Aggression', 'Autonomy', 'Ethical Risk', 'Overall Risk']
         colors = [RiskVisualizer._get_color(score) for score in scores]
         
-        bars = ax.barh(labels, scores, color=colors, edgecolor='black', linewidth=1. 5)
+        bars = ax.barh(labels, scores, color=colors, edgecolor='black', linewidth=1.5)
         ax.set_xlabel('Score (0-100)', fontweight='bold')
         ax.set_title('Risk Dimension Scores', fontweight='bold')
         ax.set_xlim(0, 100)
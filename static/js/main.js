@@ -29,6 +29,30 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     }
     
+    // Live score preview while sliders move
+    const preview = document.getElementById('scorePreview');
+    if (preview && analyzeForm && window.SkynetScoring) {
+        const sliders = analyzeForm.querySelectorAll('input[type="range"]');
+        let scheduled = false;
+        const render = function() {
+            scheduled = false;
+            const system = {};
+            sliders.forEach(function(slider) {
+                system[slider.name] = parseFloat(slider.value);
+            });
+            updatePreview(preview, window.SkynetScoring.analyze(system));
+        };
+        sliders.forEach(function(slider) {
+            slider.addEventListener('input', function() {
+                if (!scheduled) {
+                    scheduled = true;
+                    window.requestAnimationFrame(render);
+                }
+            });
+        });
+        render();
+    }
+    
     // Add tooltips
     const tooltipTriggerList = [].slice.call(document.querySelectorAll('[data-bs-toggle="tooltip"]'));
     tooltipTriggerList.map(function (tooltipTriggerEl) {
@@ -57,3 +81,37 @@ function updateValue(name, value) {
         }
     }
 }
+
+// Fill the live preview from client-side scores (unrounded, as in SkynetScoring.analyze)
+function updatePreview(preview, results) {
+    const values = Object.assign({}, results, results.judgment_day);
+    preview.querySelectorAll('[data-preview]').forEach(function(element) {
+        const value = values[element.dataset.preview];
+        if (typeof value === 'number') {
+            element.textContent = (Math.round(value * 100) / 100).toString();
+            if (element.dataset.preview !== 'years_until') {
+                element.className = 'fs-4 ' + riskClass(value);
+            }
+        } else {
+            element.textContent = value;
+        }
+    });
+    
+    // Same alert colors as the results page
+    const overall = results.judgment_day.overall_risk;
+    preview.classList.remove('alert-danger', 'alert-warning', 'alert-info');
+    preview.classList.add(overall >= 80 ? 'alert-danger' : overall >= 60 ? 'alert-warning' : 'alert-info');
+}
+
+function riskClass(score) {
+    if (score >= 80) {
+        return 'risk-critical';
+    } else if (score >= 60) {
+        return 'risk-high';
+    } else if (score >= 40) {
+        return 'risk-moderate';
+    } else if (score >= 20) {
+        return 'risk-low';
+    }
+    return 'risk-minimal';
+}
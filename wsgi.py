@@ -0,0 +1,31 @@
+"""Production WSGI entry point for Skynet Risk Analyzer.
+
+Run with the pre-fork server configured in ``gunicorn.conf.py``::
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Importing this module loads the config, builds the analyzers and renders
+the example charts, then pushes a few read-only requests through the app so
+templates are compiled and pages are cached. With ``preload_app`` this all
+happens once in the master; workers inherit it copy-on-write and serve
+their first request warm.
+"""
+
+from app import app, perform_analysis
+from src.models.ai_system import AISystem
+
+
+WARMUP_PATHS = ('/', '/analyze', '/examples', '/examples/0')
+
+
+def warm_up():
+    """Exercise the request paths that would otherwise be slow the first time."""
+    # JSON path: analyzers and numpy, without recording into history
+    perform_analysis(AISystem(name='warmup', capabilities=50, autonomy_level=50, ethical_alignment=50))
+    client = app.test_client()
+    for path in WARMUP_PATHS:
+        for encoding in ('identity', 'gzip', 'br'):
+            client.get(path, headers={'Accept-Encoding': encoding})
+
+
+warm_up()